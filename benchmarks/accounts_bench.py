@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Accounts layer microbenchmark
+거래 내역·포트폴리오 가치 시계열이 100 / 10k / 100k 건인 계좌에서
+Account.get, _execute_buy, sell_shares, report, save, calculate_profit_loss의
+지연 시간과 작업당 저장 바이트(계좌 JSON + 로그) 측정
+
+    uv run benchmarks/accounts_bench.py
+    uv run benchmarks/accounts_bench.py --sizes 100,10000 --save-baseline benchmarks/results/accounts.json
+    uv run benchmarks/accounts_bench.py --baseline benchmarks/results/accounts.json
+
+계좌 DB는 임시 파일을 사용하므로 accounts.db는 건드리지 않음
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "AMD", "AVGO", "NFLX"]
+OPERATIONS = ["get", "execute_buy", "sell_shares", "report", "save", "calculate_profit_loss"]
+BENCH_ACCOUNT = "bench_account"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Accounts layer microbenchmark")
+    parser.add_argument("--sizes", default="100,10000,100000", help="comma-separated history sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per operation (fewer for large sizes)")
+    parser.add_argument("--save-baseline", help="write the results JSON here")
+    parser.add_argument("--baseline", help="compare against a saved results JSON")
+    return parser.parse_args()
+
+
+def price(symbol: str) -> float:
+    return 100.0 + SYMBOLS.index(symbol) if symbol in SYMBOLS else 100.0
+
+
+def build_history(size: int) -> dict:
+    """size건의 거래 내역과 가치 시계열을 가진 계좌 필드 (보유 수량이 음수가 되지 않게 매수 2 : 매도 1)"""
+    start = datetime(2020, 1, 1)
+    holdings = {}
+    transactions = []
+    for i in range(size):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        quantity = 2 if i % 3 != 2 else -1
+        holdings[symbol] = holdings.get(symbol, 0) + quantity
+        transactions.append({
+            "symbol": symbol,
+            "quantity": quantity,
+            "price": price(symbol),
+            "timestamp": (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "rationale": f"benchmark trade {i}",
+        })
+    series = [((start + timedelta(hours=i)).strftime("%Y-%m-%d %H:%M:%S"), 10_000.0 + i % 500) for i in range(size)]
+    return {
+        "name": BENCH_ACCOUNT,
+        "balance": 1e12,
+        "strategy": "benchmark",
+        "holdings": holdings,
+        "transactions": transactions,
+        "portfolio_value_time_series": series,
+    }
+
+
+class WriteMeter:
+    """Counts the bytes the accounts module hands to write_account / write_log."""
+
+    def __init__(self, accounts_module):
+        self.bytes = 0
+        write_account, write_log = accounts_module.write_account, accounts_module.write_log
+
+        def measured_write_account(name, account_dict):
+            self.bytes += len(json.dumps(account_dict))
+            return write_account(name, account_dict)
+
+        def measured_write_log(name, type, message):
+            self.bytes += len(name) + len(type) + len(message)
+            return write_log(name, type, message)
+
+        accounts_module.write_account = measured_write_account
+        accounts_module.write_log = measured_write_log
+
+
+def run_operation(operation: str, Account, account):
+    if operation == "get":
+        return Account.get(BENCH_ACCOUNT)
+    if operation == "execute_buy":
+        return account._execute_buy("AAPL", 1, "benchmark buy", price("AAPL"))
+    if operation == "sell_shares":
+        return account.sell_shares("AAPL", 1, "benchmark sell")
+    if operation == "report":
+        return account.report()
+    if operation == "save":
+        return account.save()
+    if operation == "calculate_profit_loss":
+        return account.calculate_profit_loss(account.balance)
+    raise ValueError(operation)
+
+
+def bench_size(size: int, repeat: int, Account, write_account, meter) -> dict:
+    fields = build_history(size)
+    write_account(BENCH_ACCOUNT, fields)
+    account = Account.get(BENCH_ACCOUNT)
+    # 큰 계좌는 한 번이 오래 걸리므로 반복 횟수를 줄임
+    runs = max(3, min(repeat, 500_000 // max(size, 1)))
+    results = {"history": size, "account_json_bytes": len(json.dumps(fields)), "runs": runs, "operations": {}}
+    for operation in OPERATIONS:
+        timings, written = [], 0
+        for _ in range(runs):
+            meter.bytes = 0
+            started = time.perf_counter()
+            run_operation(operation, Account, account)
+            timings.append(time.perf_counter() - started)
+            written += meter.bytes
+        timings.sort()
+        results["operations"][operation] = {
+            "median_ms": round(statistics.median(timings) * 1000, 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+            "bytes_written": written // runs,
+        }
+    return results
+
+
+def print_results(results: list[dict], baseline: dict | None = None) -> None:
+    baseline_by_size = {entry["history"]: entry for entry in (baseline or {}).get("results", [])}
+    for entry in results:
+        print(f"\n📒 history={entry['history']:,} (계좌 JSON {entry['account_json_bytes']:,} bytes, {entry['runs']}회 반복)")
+        print(f"   {'operation':<24}{'median ms':>12}{'p95 ms':>12}{'bytes/op':>14}" + ("   vs baseline" if baseline else ""))
+        for operation, stats in entry["operations"].items():
+            line = f"   {operation:<24}{stats['median_ms']:>12.3f}{stats['p95_ms']:>12.3f}{stats['bytes_written']:>14,}"
+            reference = baseline_by_size.get(entry["history"], {}).get("operations", {}).get(operation)
+            if reference and reference["median_ms"]:
+                line += f"   x{stats['median_ms'] / reference['median_ms']:.2f} time, " \
+                        f"x{stats['bytes_written'] / max(1, reference['bytes_written']):.2f} bytes"
+            print(line)
+
+
+def main() -> int:
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="ant_accounts_bench_")
+    os.environ["ACCOUNTS_DB"] = os.path.join(workdir, "accounts.db")
+
+    import src.accounts.accounts as accounts_module
+    from src.accounts.accounts import Account, set_price_fn
+    from src.accounts.database import write_account
+
+    set_price_fn(price)
+    meter = WriteMeter(accounts_module)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    try:
+        results = [bench_size(size, args.repeat, Account, write_account, meter) for size in sizes]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump({
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+        print(f"\n💾 기준 결과 저장: {args.save_baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
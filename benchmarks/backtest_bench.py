@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Offline backtest benchmark
+OpenAI·Smithery YouTube·Polygon 없이 scheduler.run_backtest를 처음부터 끝까지 실행하고
+(스크립트 모델, 가짜 YouTube MCP 서버, 가짜 Polygon 서버 사용) 스케줄러·MCP·계좌·가격·로그 쪽
+비용만 측정: 일자별/단계별 소요 시간, DB 작업 수, 프로세스 실행 횟수
+
+    uv run benchmarks/backtest_bench.py --days 5 --traders-per-youtuber 2
+    uv run benchmarks/backtest_bench.py --output bench.json
+    uv run benchmarks/backtest_bench.py --baseline bench.json --max-regression 0.25   # CI: 느려지면 종료 코드 1
+
+주의: 각 모듈이 load_dotenv(override=True)를 호출하므로 .env에 같은 키가 있으면 그 값이 우선함
+(CI처럼 .env 없이 실행하는 것을 전제로 함)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline backtest benchmark with stubbed LLM, YouTube and Polygon")
+    parser.add_argument("--start", default="2024-09-12", help="first simulated trading date")
+    parser.add_argument("--days", type=int, default=3, help="number of simulated days")
+    parser.add_argument("--traders-per-youtuber", type=int, default=1, help="traders (models) per YouTuber")
+    parser.add_argument("--videos-per-day", type=int, default=2, help="fake uploads per day")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="simulated seconds per model call")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="fail when seconds per trader-day exceed the baseline by this fraction")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary working directory")
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"fake server on port {port} did not start")
+
+
+def table_row_counts(db_path: str) -> dict[str, int]:
+    if not os.path.exists(db_path):
+        return {}
+    with sqlite3.connect(db_path) as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+                  if "_fts_" not in row[0] and not row[0].startswith("sqlite_")]
+        return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+
+
+class Instruments:
+    """In-process counters patched around the scheduler: per-day timing, sqlite statements, MCP process launches."""
+
+    def __init__(self):
+        self.days = []
+        self.sql_statements = Counter()
+        self.sql_connections = 0
+        self.process_launches = Counter()
+
+    def count_statement(self, sql: str) -> None:
+        # "-- ..."는 트리거/FTS5 내부에서 실행된 하위 문장이므로 제외
+        if not sql.startswith("--"):
+            self.sql_statements[sql.split(None, 1)[0].upper()] += 1
+
+    def install(self, scheduler):
+        from agents.mcp import MCPServerStdio
+
+        instruments = self
+        run_parallel_trading = scheduler.run_parallel_trading
+
+        async def timed_run_parallel_trading(ref_date=None, current_date=None):
+            started = time.monotonic()
+            try:
+                return await run_parallel_trading(ref_date, current_date)
+            finally:
+                instruments.days.append({"date": current_date, "seconds": round(time.monotonic() - started, 3)})
+
+        scheduler.run_parallel_trading = timed_run_parallel_trading
+
+        connect = sqlite3.connect
+
+        def counting_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            instruments.sql_connections += 1
+            conn.set_trace_callback(instruments.count_statement)
+            return conn
+
+        sqlite3.connect = counting_connect
+
+        stdio_connect = MCPServerStdio.connect
+
+        async def counting_stdio_connect(server):
+            params = server.params
+            instruments.process_launches[" ".join([params.command, *params.args])] += 1
+            return await stdio_connect(server)
+
+        MCPServerStdio.connect = counting_stdio_connect
+
+        # 계좌 리소스 조회는 호출마다 accounts_server 프로세스를 따로 띄움
+        from src.accounts import accounts_client
+        stdio_client = accounts_client.stdio_client
+
+        def counting_stdio_client(params, *args, **kwargs):
+            instruments.process_launches[" ".join([params.command, *params.args]) + " (accounts_client)"] += 1
+            return stdio_client(params, *args, **kwargs)
+
+        accounts_client.stdio_client = counting_stdio_client
+
+
+def configure_env(args, workdir: str, polygon_port: int, youtube_port: int) -> None:
+    start = datetime.strptime(args.start, "%Y-%m-%d")
+    models = [f"bench-{i + 1}" for i in range(args.traders_per_youtuber)]
+    os.environ.update({
+        "ACCOUNTS_DB": os.path.join(workdir, "accounts.db"),
+        "YOUTUBE_STORE_DB": os.path.join(workdir, "youtube.db"),
+        "YOUTUBE_LOCAL_STORE": "true",
+        "YOUTUBE_MCP_URL": f"http://127.0.0.1:{youtube_port}/mcp",
+        "RESEARCHER_MCP_SERVERS": "youtube",
+        "POLYGON_API_KEY": "offline-benchmark",
+        "POLYGON_BASE_URL": f"http://127.0.0.1:{polygon_port}",
+        "POLYGON_PLAN": "",
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "offline-benchmark",
+        "AGENT_REPLAY_MODE": "off",
+        "TRACE_METRICS_FILE": os.path.join(workdir, "trace_metrics.prom"),
+        "TRADER_MODELS": ",".join(models),
+        "BACKTEST_REFERENCE_DATE": (start - timedelta(days=1)).strftime("%Y-%m-%d"),
+        "BACKTEST_CURRENT_DATE": start.strftime("%Y-%m-%d"),
+        "BACKTEST_END_DATE": (start + timedelta(days=args.days - 1)).strftime("%Y-%m-%d"),
+    })
+
+
+def build_report(args, instruments, models, polygon, wall_seconds: float) -> dict:
+    from config.strategies import get_all_youtubers
+    from src.trading.database import get_stage_metrics_summary
+
+    traders = len(get_all_youtubers()) * args.traders_per_youtuber
+    end = (datetime.strptime(args.start, "%Y-%m-%d") + timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+    stages = {
+        entry["stage"]: {
+            "runs": entry["runs"],
+            "avg_wall_seconds": round(entry["wall_seconds"] / entry["runs"], 3),
+            "turns": entry["turns"],
+            "tool_calls": {tool: stats["count"] for tool, stats in entry["tool_calls"].items()},
+        }
+        for entry in get_stage_metrics_summary(args.start, end)
+    }
+    return {
+        "config": {
+            "start": args.start, "days": args.days, "traders": traders,
+            "videos_per_day": args.videos_per_day, "model_latency": args.model_latency,
+        },
+        "wall_seconds": round(wall_seconds, 3),
+        "seconds_per_trader_day": round(wall_seconds / max(1, traders * args.days), 3),
+        "days": instruments.days,
+        "stages": stages,
+        "model_calls": sum(model.calls for model in models),
+        "process_launches": dict(instruments.process_launches),
+        "sqlite": {"connections": instruments.sql_connections, "statements": dict(instruments.sql_statements)},
+        "db_rows": {
+            "accounts": table_row_counts(os.environ["ACCOUNTS_DB"]),
+            "youtube": table_row_counts(os.environ["YOUTUBE_STORE_DB"]),
+        },
+        "polygon_requests": dict(polygon.requests),
+    }
+
+
+def print_report(report: dict) -> None:
+    config = report["config"]
+    print(f"\n🏁 오프라인 벤치마크: 트레이더 {config['traders']}명 × {config['days']}일, "
+          f"총 {report['wall_seconds']:.2f}초 (트레이더·일당 {report['seconds_per_trader_day']:.3f}초)")
+    for day in report["days"]:
+        print(f"   - {day['date']}: {day['seconds']:.2f}초")
+    print("⏱️ 단계별:")
+    for stage, stats in report["stages"].items():
+        print(f"   - {stage}: {stats['runs']}회, 평균 {stats['avg_wall_seconds']:.3f}초, 도구 {stats['tool_calls']}")
+    launches = report["process_launches"]
+    print(f"🚀 MCP 프로세스 실행: {sum(launches.values())}회")
+    for command, count in sorted(launches.items(), key=lambda item: -item[1]):
+        print(f"   - {command}: {count}회")
+    sqlite_stats = report["sqlite"]
+    print(f"🗄️ 스케줄러 프로세스 SQLite: 연결 {sqlite_stats['connections']}회, 문장 {sqlite_stats['statements']}")
+    print(f"   (MCP 서버 프로세스의 쓰기는 행 수로 확인) 계좌 DB 행: {report['db_rows']['accounts']}")
+    print(f"🌐 Polygon 요청: {report['polygon_requests']}, 모델 호출: {report['model_calls']}회")
+
+
+def compare_to_baseline(report: dict, baseline_path: str, max_regression: float) -> bool:
+    """기준 리포트 대비 트레이더·일당 시간과 프로세스 실행 횟수 비교; 회귀면 False"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    ok = True
+    limit = baseline["seconds_per_trader_day"] * (1 + max_regression)
+    if report["seconds_per_trader_day"] > limit:
+        print(f"❌ 회귀: 트레이더·일당 {report['seconds_per_trader_day']:.3f}초 > 기준 {baseline['seconds_per_trader_day']:.3f}초 "
+              f"(+{max_regression:.0%} 허용)")
+        ok = False
+    launches, baseline_launches = sum(report["process_launches"].values()), sum(baseline["process_launches"].values())
+    same_shape = report["config"]["traders"] == baseline["config"]["traders"] and report["config"]["days"] == baseline["config"]["days"]
+    if same_shape and launches > baseline_launches:
+        print(f"❌ 회귀: MCP 프로세스 실행 {launches}회 > 기준 {baseline_launches}회")
+        ok = False
+    if ok:
+        print(f"✅ 기준 대비 회귀 없음 ({report['seconds_per_trader_day']:.3f}초 ≤ {limit:.3f}초)")
+    return ok
+
+
+def main() -> int:
+    args = parse_args()
+    args.output = os.path.abspath(args.output) if args.output else None
+    args.baseline = os.path.abspath(args.baseline) if args.baseline else None
+    workdir = tempfile.mkdtemp(prefix="ant_bench_")
+
+    from fake_polygon import start_fake_polygon
+    polygon = start_fake_polygon()
+    youtube_port = free_port()
+    youtube = subprocess.Popen(
+        [sys.executable, str(project_root / "benchmarks" / "fake_youtube.py"),
+         "--port", str(youtube_port), "--videos-per-day", str(args.videos_per_day)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(youtube_port)
+        configure_env(args, workdir, polygon.server_address[1], youtube_port)
+        # MCP 서버는 상대 경로(src/...)로 실행되므로 프로젝트 루트에서 실행
+        os.chdir(project_root)
+
+        from agents import set_trace_processors
+        from fake_model import ScriptedModel
+        from src.trading.models import set_model_fn
+        import scheduler
+
+        # 트레이스를 OpenAI로 내보내지 않고 로컬 프로세서(LogTracer, 단계 지표)만 사용
+        set_trace_processors([])
+        models = []
+        set_model_fn(lambda name: models.append(ScriptedModel(name, args.model_latency)) or models[-1])
+        instruments = Instruments()
+        instruments.install(scheduler)
+        scheduler.setup_tracing()
+
+        started = time.monotonic()
+        asyncio.run(scheduler.run_backtest())
+        report = build_report(args, instruments, models, polygon, time.monotonic() - started)
+        # 종료 시 트레이스 프로세서가 이미 지운 작업 디렉터리에 쓰지 않도록 해제
+        set_trace_processors([])
+    finally:
+        youtube.terminate()
+        youtube.wait()
+        polygon.shutdown()
+        if args.keep:
+            print(f"📁 작업 디렉터리 유지: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 리포트 저장: {args.output}")
+    if args.baseline and not compare_to_baseline(report, args.baseline, args.max_regression):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Fake Polygon REST server for offline benchmarks
+결정적인 가상 시세(티커·날짜 해시 기반 랜덤 워크)를 Polygon 응답 형식으로 제공
+
+    POLYGON_BASE_URL=http://127.0.0.1:<port> 로 지정하면 market.py가 이 서버를 사용
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+UNIVERSE = [
+    "AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "AMD", "AVGO", "NFLX",
+    "INTC", "QCOM", "ORCL", "CRM", "ADBE", "PLTR", "COIN", "SPY", "QQQ", "TQQQ",
+]
+
+
+def _unit(*parts) -> float:
+    """[0, 1) 범위의 결정적 난수"""
+    digest = hashlib.sha256("|".join(parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+def synthetic_close(ticker: str, day: str) -> float:
+    """티커별 기준가에서 시작해 하루 ±2% 이내로 움직이는 종가 (같은 입력이면 항상 같은 값)"""
+    base = 20 + 480 * _unit(ticker, "base")
+    start = datetime(2024, 1, 1)
+    days = max(0, (datetime.strptime(day, "%Y-%m-%d") - start).days)
+    # 긴 기간도 O(1)로 계산하도록 주 단위 추세 + 일 단위 잡음
+    weekly_drift = (_unit(ticker, "drift") - 0.5) * 0.01
+    noise = (_unit(ticker, day) - 0.5) * 0.04
+    return round(base * (1 + weekly_drift) ** (days / 7) * (1 + noise), 2)
+
+
+def _bar(ticker: str, day: str) -> dict:
+    close = synthetic_close(ticker, day)
+    timestamp = int(datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return {"T": ticker, "o": round(close * 0.995, 2), "h": round(close * 1.01, 2), "l": round(close * 0.99, 2),
+            "c": close, "v": 1_000_000, "vw": close, "t": timestamp, "n": 1000}
+
+
+class FakePolygonHandler(BaseHTTPRequestHandler):
+    routes = [
+        (re.compile(r"^/v1/open-close/([^/]+)/(\d{4}-\d{2}-\d{2})$"), "open_close"),
+        (re.compile(r"^/v2/aggs/ticker/([^/]+)/prev$"), "prev"),
+        (re.compile(r"^/v2/aggs/grouped/locale/us/market/stocks/(\d{4}-\d{2}-\d{2})$"), "grouped"),
+        (re.compile(r"^/v2/aggs/ticker/([^/]+)/range/1/day/(\d{4}-\d{2}-\d{2})/(\d{4}-\d{2}-\d{2})$"), "range"),
+        (re.compile(r"^/v1/marketstatus/now$"), "status"),
+    ]
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        for pattern, name in self.routes:
+            match = pattern.match(path)
+            if match:
+                self.server.requests[name] = self.server.requests.get(name, 0) + 1
+                if self.server.latency:
+                    time.sleep(self.server.latency)
+                return self._send(200, getattr(self, f"_{name}")(*match.groups()))
+        self._send(404, {"status": "NOT_FOUND", "message": path})
+
+    def _open_close(self, ticker, day):
+        bar = _bar(ticker, day)
+        return {"status": "OK", "symbol": ticker, "from": day, "open": bar["o"], "high": bar["h"],
+                "low": bar["l"], "close": bar["c"], "volume": bar["v"]}
+
+    def _prev(self, ticker):
+        day = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d")
+        return {"status": "OK", "ticker": ticker, "resultsCount": 1, "results": [_bar(ticker, day)]}
+
+    def _grouped(self, day):
+        return {"status": "OK", "resultsCount": len(UNIVERSE), "results": [_bar(t, day) for t in UNIVERSE]}
+
+    def _range(self, ticker, start, end):
+        first = datetime.strptime(start, "%Y-%m-%d")
+        days = (datetime.strptime(end, "%Y-%m-%d") - first).days + 1
+        bars = [_bar(ticker, (first + timedelta(days=i)).strftime("%Y-%m-%d")) for i in range(days)
+                if (first + timedelta(days=i)).weekday() < 5]
+        return {"status": "OK", "ticker": ticker, "resultsCount": len(bars), "results": bars}
+
+    def _status(self):
+        return {"market": "open", "serverTime": datetime.now(timezone.utc).isoformat()}
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fake_polygon(port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """백그라운드 스레드로 서버 시작; server.server_address[1]이 실제 포트, server.requests가 경로별 요청 수
+    latency를 주면 요청마다 그만큼 지연 (실제 API 왕복 시간 흉내)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakePolygonHandler)
+    server.requests = {}
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, name="fake-polygon", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Fake Polygon REST server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    server = start_fake_polygon(args.port, args.latency)
+    print(f"fake polygon: http://127.0.0.1:{server.server_address[1]}")
+    threading.Event().wait()
@@ -0,0 +1,114 @@
+"""
+Fake YouTube MCP server for offline benchmarks (streamable HTTP)
+Smithery YouTube 툴박스와 같은 도구 이름으로 가상 업로드·메타데이터·타임스탬프 자막 제공
+
+    uv run benchmarks/fake_youtube.py --port 8766 --videos-per-day 2
+    YOUTUBE_MCP_URL=http://127.0.0.1:8766/mcp 로 지정하면 youtube_server.py가 이 서버를 상류로 사용
+"""
+
+import argparse
+import hashlib
+import json
+from datetime import datetime, timedelta
+from mcp.server.fastmcp import FastMCP
+
+CHANNEL_TITLE = "슈카월드"
+TOPICS = [
+    ("엔비디아 실적 발표 총정리", ["NVDA", "AMD"]),
+    ("애플과 마이크로소프트의 AI 전쟁", ["AAPL", "MSFT"]),
+    ("테슬라 로보택시, 기대해도 될까", ["TSLA"]),
+    ("금리 인하와 미국 증시", ["SPY", "QQQ"]),
+    ("반도체 사이클은 끝났나", ["AVGO", "INTC", "QCOM"]),
+    ("부동산 PF 위기 정리", []),
+]
+
+parser = argparse.ArgumentParser(description="Fake YouTube MCP server")
+parser.add_argument("--port", type=int, default=8766)
+parser.add_argument("--videos-per-day", type=int, default=2)
+parser.add_argument("--transcript-lines", type=int, default=120)
+args, _ = parser.parse_known_args()
+
+mcp = FastMCP("fake_youtube", host="127.0.0.1", port=args.port, log_level="WARNING")
+
+
+def _video_id(day: str, index: int) -> str:
+    return "bv" + hashlib.sha1(f"{day}|{index}".encode()).hexdigest()[:9]
+
+
+def _videos_for_day(day: str) -> list[dict]:
+    offset = datetime.strptime(day, "%Y-%m-%d").toordinal()
+    videos = []
+    for index in range(args.videos_per_day):
+        title, tickers = TOPICS[(offset + index) % len(TOPICS)]
+        videos.append({
+            "video_id": _video_id(day, index),
+            "title": f"{title} ({day})",
+            "tickers": tickers,
+            "published_at": f"{day}T{9 + index % 12:02d}:00:00Z",
+        })
+    return videos
+
+
+# 영상 ID → 영상 (search_videos가 만든 것만 조회 가능, 실제 API처럼 검색 후 상세 조회)
+_videos = {}
+
+
+def _days(published_after: str, published_before: str) -> list[str]:
+    start = datetime.strptime(published_after[:10], "%Y-%m-%d")
+    end = datetime.strptime(published_before[:10], "%Y-%m-%d") if published_before else start + timedelta(days=1)
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(max(1, (end - start).days))]
+
+
+@mcp.tool()
+async def search_videos(query: str, max_results: int = 10, published_after: str = "",
+                        published_before: str = "", order: str = "relevance") -> str:
+    """Search videos in a date range."""
+    items = []
+    for day in _days(published_after or datetime.now().strftime("%Y-%m-%d"), published_before):
+        for video in _videos_for_day(day):
+            _videos[video["video_id"]] = video
+            items.append({
+                "id": {"kind": "youtube#video", "videoId": video["video_id"]},
+                "snippet": {"title": video["title"], "channelTitle": CHANNEL_TITLE, "publishedAt": video["published_at"]},
+            })
+    return json.dumps({"items": items[:max_results]}, ensure_ascii=False)
+
+
+@mcp.tool()
+async def get_video_details(video_id: str) -> str:
+    """Video metadata."""
+    video = _videos.get(video_id, {"title": video_id, "published_at": None})
+    return json.dumps({"id": video_id, "snippet": {
+        "title": video["title"], "channelId": "UCfake", "channelTitle": CHANNEL_TITLE,
+        "publishedAt": video["published_at"], "description": "offline benchmark video",
+    }}, ensure_ascii=False)
+
+
+def _transcript(video_id: str) -> str:
+    video = _videos.get(video_id, {"title": video_id, "tickers": []})
+    lines = []
+    for i in range(args.transcript_lines):
+        minutes, seconds = divmod(i * 15, 60)
+        ticker = video["tickers"][i % len(video["tickers"])] if video["tickers"] and i % 7 == 0 else None
+        text = (f"{ticker} 얘기를 안 할 수가 없는데요, 이번 분기 실적이 시장 기대를 넘었습니다" if ticker
+                else f"{video['title']} 관련해서 여러분께 설명드릴 내용이 {i}번째로 이어집니다")
+        lines.append(f"[{minutes:02d}:{seconds:02d}] {text}")
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def get_video_transcript(video_id: str, language: str = "ko") -> str:
+    """Plain transcript."""
+    return _transcript(video_id)
+
+
+@mcp.tool()
+async def get_video_enhanced_transcript(video_ids: list[str], language: str = "ko", format: str = "timestamped") -> str:
+    """Timestamped transcripts for one or more videos."""
+    if len(video_ids) == 1:
+        return _transcript(video_ids[0])
+    return json.dumps({video_id: _transcript(video_id) for video_id in video_ids}, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    mcp.run(transport="streamable-http")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test for accounts_server / market_server
+N개의 MCP 클라이언트가 동시에 get_balance·get_holdings·buy_shares·sell_shares·계좌 리소스 조회·
+과거 주가 조회를 섞어 호출하고, 처리량·지연 백분위·오류/DB 잠금 비율·DB 쓰기량을 측정
+(Polygon은 benchmarks/fake_polygon.py, 계좌 DB는 임시 파일 사용)
+
+    uv run benchmarks/mcp_load.py --clients 1,4,16 --duration 20
+    uv run benchmarks/mcp_load.py --clients 8 --mode shared --polygon-latency 0.2   # 서버 하나에 동시 요청
+
+--mode per-client: 클라이언트마다 서버 프로세스를 따로 띄움 (트레이더마다 서버를 띄우는 실제 구조, SQLite 경합 측정)
+--mode shared:     서버 프로세스 하나에 모든 클라이언트가 동시에 요청 (이벤트 루프 블로킹 측정)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+# 실제 트레이더 호출 비율에 가깝게 (조회가 대부분, 매매는 일부)
+OPERATION_MIX = {
+    "get_balance": 25,
+    "get_holdings": 15,
+    "read_account_resource": 15,
+    "lookup_historical_share_price": 20,
+    "buy_shares": 15,
+    "sell_shares": 10,
+}
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "AMD", "AVGO", "NFLX"]
+PRICE_DAYS = 60
+LOCK_MARKERS = ("database is locked", "database table is locked", "busy")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent MCP load test for accounts_server and market_server")
+    parser.add_argument("--clients", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per level")
+    parser.add_argument("--mode", choices=["per-client", "shared"], default="per-client")
+    parser.add_argument("--polygon-latency", type=float, default=0.0, help="simulated Polygon round trip (seconds)")
+    parser.add_argument("--backtest-date", default="2024-09-12")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--server-logs", action="store_true", help="show MCP server stderr")
+    parser.add_argument("--output", help="write the JSON results here")
+    return parser.parse_args()
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def db_stats(db_path: str) -> dict:
+    if not os.path.exists(db_path):
+        return {"bytes": 0, "rows": {}}
+    size = sum(os.path.getsize(p) for p in (db_path, f"{db_path}-wal") if os.path.exists(p))
+    with sqlite3.connect(db_path) as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+                  if not row[0].startswith("sqlite_")]
+        rows = {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+    return {"bytes": size, "rows": rows}
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock_errors = defaultdict(int)
+        self.rejected = defaultdict(int)
+
+    def record(self, operation: str, seconds: float, error: str | None) -> None:
+        self.latencies[operation].append(seconds)
+        if error is None:
+            return
+        lowered = error.lower()
+        if any(marker in lowered for marker in LOCK_MARKERS):
+            self.lock_errors[operation] += 1
+        elif "insufficient" in lowered or "not enough shares" in lowered or "cannot sell" in lowered:
+            # 잔고/보유 부족은 정상적인 거절
+            self.rejected[operation] += 1
+        else:
+            self.errors[operation] += 1
+
+
+def tool_error(result) -> str | None:
+    if not getattr(result, "isError", False):
+        return None
+    return " ".join(getattr(item, "text", "") for item in result.content) or "tool error"
+
+
+async def run_client(index: int, sessions: dict, stats: LoadStats, deadline: float, rng: random.Random, day0: datetime):
+    """한 클라이언트(트레이더): 마감 시각까지 정해진 비율로 도구 호출"""
+    name = f"load_trader_{index}"
+    operations, weights = zip(*OPERATION_MIX.items())
+    held = defaultdict(int)
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        symbol = rng.choice(SYMBOLS)
+        if operation == "sell_shares" and not held:
+            operation = "buy_shares"
+        started = time.monotonic()
+        error = None
+        try:
+            if operation == "read_account_resource":
+                await sessions["accounts"].read_resource(f"accounts://accounts_server/{name}")
+            elif operation == "lookup_historical_share_price":
+                day = (day0 - timedelta(days=rng.randrange(PRICE_DAYS))).strftime("%Y-%m-%d")
+                error = tool_error(await sessions["market"].call_tool(operation, {"symbol": symbol, "date": day}))
+            elif operation == "buy_shares":
+                error = tool_error(await sessions["accounts"].call_tool(operation, {
+                    "name": name, "symbol": symbol, "quantity": 1, "rationale": "load test"}))
+                if error is None:
+                    held[symbol] += 1
+            elif operation == "sell_shares":
+                symbol = rng.choice(list(held))
+                error = tool_error(await sessions["accounts"].call_tool(operation, {
+                    "name": name, "symbol": symbol, "quantity": 1, "rationale": "load test"}))
+                if error is None:
+                    held[symbol] -= 1
+                    if not held[symbol]:
+                        del held[symbol]
+            else:
+                error = tool_error(await sessions["accounts"].call_tool(operation, {"name": name}))
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        stats.record(operation, time.monotonic() - started, error)
+
+
+async def open_sessions(stack: AsyncExitStack, errlog) -> dict:
+    import mcp
+    from mcp import StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    from config.mcp_params import trader_mcp_server_params, with_passthrough_env
+
+    # 유료 Polygon 설정과 무관하게 로컬 market_server를 측정
+    market_params = {"command": "uv", "args": ["run", "src/market/market_server.py"]}
+    sessions = {}
+    for key, params in (("accounts", trader_mcp_server_params[0]), ("market", market_params)):
+        streams = await stack.enter_async_context(stdio_client(StdioServerParameters(**with_passthrough_env(params)), errlog))
+        session = await stack.enter_async_context(mcp.ClientSession(*streams))
+        await session.initialize()
+        sessions[key] = session
+    return sessions
+
+
+async def run_level(clients: int, args, db_path: str, errlog) -> dict:
+    stats = LoadStats()
+    rng = random.Random(args.seed + clients)
+    day0 = datetime.strptime(args.backtest_date, "%Y-%m-%d")
+    before = db_stats(db_path)
+    ready = asyncio.Event()
+    opened = []
+    timing = {}
+
+    async def client_task(index: int, client_rng: random.Random, shared: dict | None):
+        # stdio 클라이언트는 연 태스크에서 닫아야 하므로 클라이언트마다 자기 태스크에서 서버를 띄움
+        async with AsyncExitStack() as stack:
+            sessions = shared or await open_sessions(stack, errlog)
+            opened.append(index)
+            if len(opened) == clients:
+                timing["started"] = time.monotonic()
+                ready.set()
+            await ready.wait()
+            await run_client(index, sessions, stats, timing["started"] + args.duration, client_rng, day0)
+
+    async with AsyncExitStack() as stack:
+        launched = time.monotonic()
+        shared = await open_sessions(stack, errlog) if args.mode == "shared" else None
+        await asyncio.gather(*[client_task(i, random.Random(rng.random()), shared) for i in range(clients)])
+        startup_seconds = timing["started"] - launched
+        elapsed = time.monotonic() - timing["started"]
+    after = db_stats(db_path)
+
+    all_latencies = sorted(latency for values in stats.latencies.values() for latency in values)
+    total = len(all_latencies)
+    return {
+        "clients": clients,
+        "mode": args.mode,
+        "startup_seconds": round(startup_seconds, 3),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(all_latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(all_latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(all_latencies, 0.99) * 1000, 2),
+        "error_rate": round(sum(stats.errors.values()) / total, 4) if total else 0.0,
+        "lock_timeout_rate": round(sum(stats.lock_errors.values()) / total, 4) if total else 0.0,
+        "rejected": sum(stats.rejected.values()),
+        "operations": {
+            operation: {
+                "count": len(values),
+                "p50_ms": round(percentile(sorted(values), 0.50) * 1000, 2),
+                "p95_ms": round(percentile(sorted(values), 0.95) * 1000, 2),
+                "errors": stats.errors[operation],
+                "lock_errors": stats.lock_errors[operation],
+            }
+            for operation, values in stats.latencies.items()
+        },
+        "db_bytes_written": after["bytes"] - before["bytes"],
+        "db_rows_added": {table: after["rows"].get(table, 0) - before["rows"].get(table, 0)
+                          for table in after["rows"] if after["rows"].get(table, 0) != before["rows"].get(table, 0)},
+    }
+
+
+def print_level(result: dict) -> None:
+    print(f"\n👥 클라이언트 {result['clients']}개 ({result['mode']}, 서버 기동 {result['startup_seconds']:.1f}초): "
+          f"{result['requests']}건, {result['throughput_rps']:.1f} req/s, "
+          f"p50 {result['p50_ms']:.1f}ms / p95 {result['p95_ms']:.1f}ms / p99 {result['p99_ms']:.1f}ms")
+    print(f"   오류 {result['error_rate']:.2%}, DB 잠금 {result['lock_timeout_rate']:.2%}, 거절(잔고/보유 부족) {result['rejected']}건, "
+          f"DB 증가 {result['db_bytes_written']:,} bytes, 행 {result['db_rows_added']}")
+    for operation, stats in sorted(result["operations"].items()):
+        print(f"   - {operation:<30} {stats['count']:>6}건  p50 {stats['p50_ms']:>8.1f}ms  p95 {stats['p95_ms']:>8.1f}ms"
+              f"  오류 {stats['errors']}  잠금 {stats['lock_errors']}")
+
+
+async def main_async(args, db_path: str) -> list[dict]:
+    results = []
+    # 서버 로그(요청마다 한 줄)는 기본적으로 숨김
+    with open(os.devnull, "w") as devnull:
+        errlog = sys.stderr if args.server_logs else devnull
+        for clients in [int(c) for c in args.clients.split(",") if c.strip()]:
+            result = await run_level(clients, args, db_path, errlog)
+            print_level(result)
+            results.append(result)
+    return results
+
+
+def main() -> int:
+    args = parse_args()
+    args.output = os.path.abspath(args.output) if args.output else None
+    workdir = tempfile.mkdtemp(prefix="ant_mcp_load_")
+    db_path = os.path.join(workdir, "accounts.db")
+
+    from fake_polygon import start_fake_polygon
+    polygon = start_fake_polygon(latency=args.polygon_latency)
+    os.environ.update({
+        "ACCOUNTS_DB": db_path,
+        "POLYGON_API_KEY": "load-test",
+        "POLYGON_BASE_URL": f"http://127.0.0.1:{polygon.server_address[1]}",
+        "POLYGON_PLAN": "",
+        "BACKTEST_DATE": args.backtest_date,
+    })
+    # MCP 서버는 상대 경로(src/...)로 실행되므로 프로젝트 루트에서 실행
+    os.chdir(project_root)
+    try:
+        results = asyncio.run(main_async(args, db_path))
+    finally:
+        polygon.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n🌐 Polygon 요청: {polygon.requests}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"polygon_latency": args.polygon_latency, "results": results}, f, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
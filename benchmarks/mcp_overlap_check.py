@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Overlap check for MCP tool handlers
+가짜 Polygon에 지연을 주고 서버 하나에 도구 호출을 동시에 보내, 호출들이 겹쳐 실행되는지
+(이벤트 루프를 막지 않는지)와 같은 계좌 동시 매수가 유실 없이 반영되는지 확인 - 실패하면 종료 코드 1
+
+    uv run benchmarks/mcp_overlap_check.py
+    uv run benchmarks/mcp_overlap_check.py --calls 16 --polygon-latency 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check that concurrent MCP tool calls overlap")
+    parser.add_argument("--calls", type=int, default=8, help="concurrent calls per check")
+    parser.add_argument("--polygon-latency", type=float, default=0.5, help="simulated Polygon round trip (seconds)")
+    parser.add_argument("--backtest-date", default="2024-09-12")
+    return parser.parse_args()
+
+
+def tool_text(result) -> str:
+    return " ".join(getattr(item, "text", "") for item in result.content)
+
+
+async def timed_gather(calls) -> tuple[float, list]:
+    started = time.monotonic()
+    results = await asyncio.gather(*calls)
+    return time.monotonic() - started, results
+
+
+async def run_checks(args) -> list[tuple[str, bool, str]]:
+    from mcp_load import open_sessions
+
+    day0 = datetime.strptime(args.backtest_date, "%Y-%m-%d")
+    # 호출이 모두 직렬로 실행되면 calls × latency, 겹치면 latency 근처 → 절반을 기준으로 판정
+    serial_seconds = args.calls * args.polygon_latency
+    limit = serial_seconds / 2
+    checks = []
+    with open(os.devnull, "w") as devnull:
+        async with AsyncExitStack() as stack:
+            sessions = await open_sessions(stack, devnull)
+            market, accounts = sessions["market"], sessions["accounts"]
+
+            # 1) 과거 가격 조회: 날짜를 달리해 캐시를 피하고 모두 Polygon 왕복
+            elapsed, _ = await timed_gather([
+                market.call_tool("lookup_historical_share_price", {
+                    "symbol": "AAPL", "date": (day0 - timedelta(days=i)).strftime("%Y-%m-%d")})
+                for i in range(args.calls)
+            ])
+            checks.append(("market_server lookup_historical_share_price", elapsed < limit,
+                           f"{elapsed:.2f}s (직렬이면 {serial_seconds:.2f}s)"))
+
+            # 2) 가격 미지정 매수: 계좌마다 다른 종목이라 모두 Polygon 왕복
+            symbols = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "AMD", "AVGO", "NFLX"]
+            elapsed, results = await timed_gather([
+                accounts.call_tool("buy_shares", {"name": f"overlap_{i}", "symbol": symbols[i % len(symbols)],
+                                                  "quantity": 1, "rationale": "overlap check"})
+                for i in range(args.calls)
+            ])
+            failed = [tool_text(r) for r in results if r.isError]
+            checks.append(("accounts_server buy_shares (price lookup)", elapsed < limit and not failed,
+                           f"{elapsed:.2f}s (직렬이면 {serial_seconds:.2f}s)" + (f", 오류 {failed[0]}" if failed else "")))
+
+            # 3) 같은 계좌 동시 매수: 계좌별 잠금으로 한 건도 유실되지 않아야 함
+            await asyncio.gather(*[
+                accounts.call_tool("buy_shares", {"name": "overlap_same", "symbol": "AAPL", "quantity": 1,
+                                                  "rationale": "overlap check", "price": 100.0})
+                for _ in range(args.calls)
+            ])
+            holdings = json.loads(tool_text(await accounts.call_tool("get_holdings", {"name": "overlap_same"})))
+            checks.append(("accounts_server same-account buys", holdings.get("AAPL") == args.calls,
+                           f"보유 {holdings.get('AAPL', 0)}주 / 기대 {args.calls}주"))
+    return checks
+
+
+def main() -> int:
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix="ant_mcp_overlap_")
+
+    from fake_polygon import start_fake_polygon
+    polygon = start_fake_polygon(latency=args.polygon_latency)
+    os.environ.update({
+        "ACCOUNTS_DB": os.path.join(workdir, "accounts.db"),
+        "POLYGON_API_KEY": "overlap-check",
+        "POLYGON_BASE_URL": f"http://127.0.0.1:{polygon.server_address[1]}",
+        "POLYGON_PLAN": "",
+        "BACKTEST_DATE": args.backtest_date,
+    })
+    os.chdir(project_root)
+    try:
+        checks = asyncio.run(run_checks(args))
+    finally:
+        polygon.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, passed, detail in checks:
+        print(f"{'✅' if passed else '❌'} {name}: {detail}")
+    return 0 if checks and all(passed for _, passed, _ in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
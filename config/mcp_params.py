@@ -9,6 +9,8 @@ polygon_api_key = os.getenv("POLYGON_API_KEY")
 youtube_api_key = os.getenv("YOUTUBE_API_KEY")  # YouTube API 키 추가
 youtube_mcp_api_key = os.getenv("YOUTUBE_MCP_API_KEY")
 youtube_mcp_profile = os.getenv("YOUTUBE_MCP_PROFILE")
+# 설정하면 Smithery 대신 이 URL의 YouTube MCP 서버 사용 (벤치마크용 가짜 서버 등)
+youtube_mcp_url = os.getenv("YOUTUBE_MCP_URL")
 
 # The MCP server for the Trader to read Market Data
 if is_paid_polygon or is_realtime_polygon:
@@ -27,9 +29,28 @@ trader_mcp_server_params = [
     market_mcp,
 ]
 
+# stdio MCP 서버는 기본 환경변수만 물려받으므로 백테스트 날짜·프로파일링 설정은 명시적으로 전달
+MCP_PASSTHROUGH_ENV = [
+    "BACKTEST_DATE", "PROFILE_STAGES", "PROFILE_DIR", "PROFILE_TOP_N", "MCP_BLOCKING_WORKERS",
+    "SPREAD", "TRADING_FEE_RATE", "INITIAL_BALANCE",
+    "ACCOUNTS_DB", "YOUTUBE_STORE_DB", "YOUTUBE_MCP_URL", "POLYGON_API_KEY", "POLYGON_BASE_URL",
+]
+
+
+def with_passthrough_env(params: dict) -> dict:
+    """stdio 서버 파라미터에 현재 프로세스의 전달 대상 환경변수를 합쳐 반환 (HTTP 서버는 그대로)"""
+    if params.get("type") == "http":
+        return params
+    passthrough = {key: os.environ[key] for key in MCP_PASSTHROUGH_ENV if key in os.environ}
+    if not passthrough:
+        return params
+    return {**params, "env": {**passthrough, **params.get("env", {})}}
+
 # YouTube MCP 서버 설정 (리서쳐용)
 def get_youtube_mcp_url():
     """YouTube MCP 서버 URL 반환 (직접 연결용)"""
+    if youtube_mcp_url:
+        return youtube_mcp_url
     from urllib.parse import urlencode
     base_url = "https://server.smithery.ai/@jikime/py-mcp-youtube-toolbox/mcp"
     params = {
@@ -44,14 +65,24 @@ youtube_mcp_http = {
     "url": get_youtube_mcp_url()
 }
 
+# 로컬 캐싱 프록시: 영상 메타데이터/자막을 youtube.db에 저장해 한 번만 내려받음
+use_youtube_local_store = os.getenv("YOUTUBE_LOCAL_STORE", "true").strip().lower() == "true"
+youtube_mcp_local = {"command": "uv", "args": ["run", "src/youtube/youtube_server.py"]}
+
+# 리서쳐가 띄울 MCP 서버 (쉼표 구분: fetch, youtube, memory) - 오프라인 벤치마크는 youtube만 사용
+researcher_mcp_servers_enabled = [
+    s.strip() for s in os.getenv("RESEARCHER_MCP_SERVERS", "fetch,youtube,memory").split(",") if s.strip()
+]
+
 # The full set of MCP servers for the researcher: Fetch, YouTube and Memory
 def researcher_mcp_server_params(name: str):
-    return [
-        {"command": "uvx", "args": ["mcp-server-fetch"]},
-        youtube_mcp_http,  # HTTP 방식 YouTube MCP
-        {
+    servers = {
+        "fetch": {"command": "uvx", "args": ["mcp-server-fetch"]},
+        "youtube": youtube_mcp_local if use_youtube_local_store else youtube_mcp_http,
+        "memory": {
             "command": "npx",
             "args": ["-y", "mcp-memory-libsql"],
             "env": {"LIBSQL_URL": f"file:./memory/{name}.db"},
         },
-    ]
\ No newline at end of file
+    }
+    return [servers[key] for key in servers if key in researcher_mcp_servers_enabled]
\ No newline at end of file
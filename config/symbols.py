@@ -0,0 +1,95 @@
+"""
+Symbol Aliases Configuration
+자막에서 종목을 찾기 위한 회사명(한글/영문) → 미국 티커 매핑
+"""
+
+import re
+
+# 유튜버가 자주 언급하는 미국 상장 종목/ETF 별칭 (소문자 비교, 한글은 그대로)
+COMPANY_ALIASES = {
+    "AAPL": ["애플", "apple"],
+    "MSFT": ["마이크로소프트", "마소", "microsoft"],
+    "NVDA": ["엔비디아", "nvidia"],
+    "GOOGL": ["구글", "알파벳", "google", "alphabet"],
+    "AMZN": ["아마존", "amazon"],
+    "META": ["메타", "페이스북", "facebook"],
+    "TSLA": ["테슬라", "tesla"],
+    "AMD": ["에이엠디"],
+    "INTC": ["인텔", "intel"],
+    "TSM": ["tsmc", "티에스엠씨", "대만반도체"],
+    "AVGO": ["브로드컴", "broadcom"],
+    "ASML": ["asml"],
+    "MU": ["마이크론", "micron"],
+    "QCOM": ["퀄컴", "qualcomm"],
+    "ARM": ["arm홀딩스"],
+    "NFLX": ["넷플릭스", "netflix"],
+    "DIS": ["디즈니", "disney"],
+    "KO": ["코카콜라", "coca-cola"],
+    "PEP": ["펩시", "pepsi"],
+    "MCD": ["맥도날드", "mcdonald"],
+    "SBUX": ["스타벅스", "starbucks"],
+    "NKE": ["나이키", "nike"],
+    "WMT": ["월마트", "walmart"],
+    "COST": ["코스트코", "costco"],
+    "BRK.B": ["버크셔", "berkshire"],
+    "JPM": ["jp모건", "제이피모건", "jpmorgan"],
+    "GS": ["골드만삭스", "goldman"],
+    "BA": ["보잉", "boeing"],
+    "LMT": ["록히드마틴", "lockheed"],
+    "XOM": ["엑슨모빌", "exxon"],
+    "CVX": ["셰브론", "chevron"],
+    "PFE": ["화이자", "pfizer"],
+    "LLY": ["일라이릴리", "eli lilly"],
+    "NVO": ["노보노디스크", "novo nordisk"],
+    "PLTR": ["팔란티어", "palantir"],
+    "COIN": ["코인베이스", "coinbase"],
+    "MSTR": ["마이크로스트래티지", "microstrategy"],
+    "BABA": ["알리바바", "alibaba"],
+    "PDD": ["테무", "핀둬둬", "temu"],
+    "UBER": ["우버", "uber"],
+    "ABNB": ["에어비앤비", "airbnb"],
+    "ORCL": ["오라클", "oracle"],
+    "CRM": ["세일즈포스", "salesforce"],
+    "ADBE": ["어도비", "adobe"],
+    "SPY": ["s&p500", "s&p 500", "에스앤피"],
+    "QQQ": ["나스닥100", "나스닥 100"],
+    "DIA": ["다우존스"],
+    "GLD": ["금 etf"],
+    "TLT": ["미국채", "장기채"],
+}
+
+
+# 한글 별칭 바로 뒤에 붙어도 같은 회사로 보는 조사·접미사 - 그 밖의 한글이 이어지면 다른 단어 (메타버스, 애플리케이션)
+HANGUL_SUFFIXES = ["으로", "에서", "에게", "까지", "보다", "처럼", "이나", "이랑", "하고",
+                   "은", "는", "이", "가", "을", "를", "의", "에", "도", "와", "과", "로", "만", "랑", "주"]
+
+
+def _alias_pattern(alias: str) -> str:
+    """별칭이 단어 중간(pineapple, 파인애플, 메타버스)에서 잡히지 않도록 양 끝에 경계 조건을 붙임"""
+    def is_hangul(char):
+        return "가" <= char <= "힣"
+
+    left = "(?<![가-힣])" if is_hangul(alias[0]) else "(?<![a-z0-9])"
+    if is_hangul(alias[-1]):
+        right = f"(?:(?![가-힣])|(?=(?:{'|'.join(HANGUL_SUFFIXES)})))"
+    else:
+        right = "(?![a-z0-9])"
+    return left + re.escape(alias) + right
+
+
+# 티커별 별칭 정규식 (소문자로 바꾼 텍스트에 적용)
+ALIAS_PATTERNS = {ticker: re.compile("|".join(_alias_pattern(alias) for alias in aliases))
+                  for ticker, aliases in COMPANY_ALIASES.items()}
+
+
+def find_alias_matches(text: str) -> list[tuple[str, int]]:
+    """텍스트에 등장하는 회사명 별칭의 (티커, 문자 위치) 목록"""
+    lowered = text.lower()
+    return [(ticker, match.start()) for ticker, pattern in ALIAS_PATTERNS.items()
+            for match in pattern.finditer(lowered)]
+
+
+def find_alias_tickers(text: str) -> set[str]:
+    """텍스트에 등장하는 회사명 별칭으로 티커 집합 반환"""
+    lowered = text.lower()
+    return {ticker for ticker, pattern in ALIAS_PATTERNS.items() if pattern.search(lowered)}
@@ -14,7 +14,7 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
 from src.accounts.accounts import Account
-from src.trading.database import clear_analyzed_videos
+from src.trading.database import clear_analyzed_videos, clear_research_cache
 
 
 def reset_trader_account(trader_name: str, strategy: str = None):
@@ -60,6 +60,20 @@ def reset_analyzed_videos(trader_name: str = None):
         return False
 
 
+def reset_research_cache(youtuber: str = None, prompt_version: str = None):
+    """Invalidate cached Researcher outputs"""
+    try:
+        deleted = clear_research_cache(youtuber, prompt_version)
+        target = youtuber or "all YouTubers"
+        if prompt_version:
+            target += f" (prompt {prompt_version})"
+        print(f"✅ Research cache cleared for {target}: {deleted} entries")
+        return True
+    except Exception as e:
+        print(f"❌ Research cache reset failed: {e}")
+        return False
+
+
 def reset_memory_db(trader_name: str = None):
     """Reset memory DB (Researcher's knowledge graph)"""
     try:
@@ -118,18 +132,16 @@ def list_memory_dbs():
 def list_traders():
     """List current registered traders"""
     try:
-        import sqlite3
-        conn = sqlite3.connect("accounts.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM accounts")
-        traders = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        from src.accounts.accounts import INITIAL_BALANCE
+        from src.accounts.database import read_leaderboard
+        traders = read_leaderboard(INITIAL_BALANCE)
         
         if traders:
-            print("📋 Current registered traders:")
+            print("📋 Current registered traders (by equity):")
             for trader in traders:
-                account = Account.get(trader)
-                print(f"   - {trader}: ${account.balance:.2f}, {len(account.holdings)} stocks")
+                equity = (f"equity ${trader['equity']:,.2f} ({trader['return']:+.2%})"
+                          if trader['equity'] is not None else "equity n/a")
+                print(f"   - {trader['name']}: ${trader['balance']:.2f} cash, {trader['positions']} stocks, {equity}")
         else:
             print("📋 No traders registered")
             
@@ -148,6 +160,9 @@ def main():
     parser.add_argument("--all-memory", action="store_true", help="Reset all memory DBs")
     parser.add_argument("--list", "-l", action="store_true", help="List current traders")
     parser.add_argument("--list-memory", action="store_true", help="List memory DB files")
+    parser.add_argument("--research-cache", nargs="?", const="", metavar="YOUTUBER",
+                        help="Clear cached Researcher outputs (optionally for one YouTuber)")
+    parser.add_argument("--prompt-version", type=str, help="Limit --research-cache to one researcher prompt version")
     
     args = parser.parse_args()
     
@@ -164,6 +179,10 @@ def main():
         return
     
     # Global reset operations
+    if args.research_cache is not None:
+        reset_research_cache(args.research_cache or None, args.prompt_version)
+        return
+
     if args.all_videos:
         if input("⚠️  Delete all traders' video analysis records? (y/N): ").lower() == 'y':
             reset_analyzed_videos()
@@ -209,6 +228,7 @@ def main():
         print("  python reset_accounts.py -t trader_name -a         # Reset account + videos + memory")
         print("  python reset_accounts.py --all-videos              # Reset all video records")
         print("  python reset_accounts.py --all-memory              # Reset all memory DBs")
+        print("  python reset_accounts.py --research-cache [name]   # Clear cached Researcher outputs")
 
 
 if __name__ == "__main__":
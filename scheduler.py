@@ -5,10 +5,11 @@
 """
 
 import asyncio
+import re
 import sys
 from pathlib import Path
 from typing import List
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 
@@ -31,6 +32,41 @@ BACKTEST_CURRENT_DATE = os.getenv("BACKTEST_CURRENT_DATE")      # 예: "2024-03-
 BACKTEST_END_DATE = os.getenv("BACKTEST_END_DATE")              # 예: "2024-12-31"
 IS_BACKTEST_MODE = BACKTEST_REFERENCE_DATE is not None
 
+# 스팬 소요 시간 지표를 HTTP로도 노출할 포트 (빈 값이면 파일로만 저장)
+TRACE_METRICS_PORT = os.getenv("TRACE_METRICS_PORT")
+
+# 유튜버마다 실행할 트레이더 모델 (쉼표로 여러 개 지정 시 모델별 트레이더 생성)
+TRADER_MODELS = [m.strip() for m in os.getenv("TRADER_MODELS", "gpt-4.1-mini").split(",") if m.strip()]
+
+# 같은 유튜버를 따르는 트레이더끼리 Researcher 단계를 한 번만 실행해 공유
+SHARED_RESEARCH = os.getenv("SHARED_RESEARCH", "true").strip().lower() == "true"
+
+LOG_TRACER = None
+
+async def gather_traders(coroutines) -> list:
+    """트레이더 실행 묶기: 평소엔 병렬, 프로파일링(PROFILE_STAGES) 중엔 측정이 섞이지 않게 순차 실행"""
+    from src.profiling import PROFILE_STAGES
+    if not PROFILE_STAGES:
+        return await asyncio.gather(*coroutines, return_exceptions=True)
+    results = []
+    for coroutine in coroutines:
+        try:
+            results.append(await coroutine)
+        except Exception as e:
+            results.append(e)
+    return results
+
+def setup_tracing():
+    """LogTracer 등록: 스팬 로그, trace_spans 테이블, 소요 시간 히스토그램"""
+    global LOG_TRACER
+    from agents import add_trace_processor
+    from src.tracers import LogTracer
+    LOG_TRACER = LogTracer()
+    add_trace_processor(LOG_TRACER)
+    if TRACE_METRICS_PORT:
+        LOG_TRACER.serve_metrics(int(TRACE_METRICS_PORT))
+        print(f"📈 스팬 지표: http://127.0.0.1:{TRACE_METRICS_PORT}/metrics")
+
 def create_youtuber_traders() -> List:
     """유튜버별 트레이더 생성"""
     try:
@@ -42,19 +78,23 @@ def create_youtuber_traders() -> List:
         traders = []
         
         for setup in setups:
-            trader_name = setup["trader_name"].replace("_Trader", "_backtest")
-            trader = Trader(name=trader_name, model_name="gpt-4.1-mini")
-            
-            # 트레이더에 유튜버 이름 직접 설정
-            trader.target_youtuber = setup["youtuber"]
-            
-            # 계좌에 전략 설정
-            from src.accounts.accounts import Account
-            account = Account.get(trader_name)
-            account.change_strategy(setup["strategy"])
-            
-            traders.append(trader)
-            print(f"✅ {setup['youtuber']} 트레이더 생성: {trader_name} (타겟: {setup['youtuber']})")
+            for i, model_name in enumerate(TRADER_MODELS):
+                trader_name = setup["trader_name"].replace("_Trader", "_backtest")
+                # 첫 모델은 기존 계좌 이름 유지, 추가 모델은 모델명을 붙여 별도 계좌
+                if i > 0:
+                    trader_name = f"{trader_name}_{re.sub(r'[^0-9A-Za-z]+', '_', model_name)}"
+                trader = Trader(name=trader_name, model_name=model_name)
+                
+                # 트레이더에 유튜버 이름 직접 설정
+                trader.target_youtuber = setup["youtuber"]
+                
+                # 계좌에 전략 설정
+                from src.accounts.accounts import Account
+                account = Account.get(trader_name)
+                account.change_strategy(setup["strategy"])
+                
+                traders.append(trader)
+                print(f"✅ {setup['youtuber']} 트레이더 생성: {trader_name} (타겟: {setup['youtuber']}, 모델: {model_name})")
         
         return traders
         
@@ -83,11 +123,15 @@ async def run_parallel_trading(ref_date=None, current_date=None):
         if ref_str:
             print(f"백테스팅 모드: 분석기준={ref_str}, 거래일={current_str}")
         
-        # 🔥 핵심: 모든 트레이더를 병렬로 동시 실행 (백테스팅 날짜 포함)
-        results = await asyncio.gather(
-            *[trader.run(reference_date=ref_str, current_date=current_str) for trader in traders],
-            return_exceptions=True
+        # 🔥 핵심: 유튜버별 그룹을 병렬로 동시 실행 (백테스팅 날짜 포함)
+        groups = group_traders_by_youtuber(traders)
+        group_results = await gather_traders(
+            [run_trader_group(group, ref_str, current_str) for group in groups.values()]
         )
+        traders = [trader for group in groups.values() for trader in group]
+        results = []
+        for group, group_result in zip(groups.values(), group_results):
+            results.extend(group_result if isinstance(group_result, list) else [group_result] * len(group))
         
         # 결과 출력
         print(f"\n📊 실행 결과:")
@@ -102,6 +146,26 @@ async def run_parallel_trading(ref_date=None, current_date=None):
     except Exception as e:
         print(f"❌ 병렬 트레이딩 실행 실패: {e}")
 
+def group_traders_by_youtuber(traders: List) -> dict:
+    """트레이더를 추적 유튜버별로 묶기 (기준일은 한 번의 실행에서 모두 같음)"""
+    groups = {}
+    for trader in traders:
+        groups.setdefault(getattr(trader, "target_youtuber", None) or trader.name, []).append(trader)
+    return groups
+
+async def run_trader_group(group: List, ref_str=None, current_str=None) -> list:
+    """같은 유튜버 그룹: Researcher는 첫 트레이더로 한 번만 실행하고 결과를 나머지와 공유"""
+    research_insights = None
+    if SHARED_RESEARCH and len(group) > 1:
+        lead = group[0]
+        print(f"📰 {getattr(lead, 'target_youtuber', lead.name)} 공유 리서치 실행 ({lead.name} 외 {len(group) - 1}명)")
+        research_insights = await lead.run_research_only(reference_date=ref_str, current_date=current_str)
+
+    return await gather_traders(
+        [trader.run(reference_date=ref_str, current_date=current_str, research_insights=research_insights)
+         for trader in group]
+    )
+
 async def run_backtest():
     """백테스팅 모드 실행 (날짜를 하루씩 증가시키며 연속 실행)"""
     from datetime import datetime, timedelta
@@ -120,7 +184,12 @@ async def run_backtest():
     print(f"총 {(end_date - current_date).days + 1}일 시뮬레이션")
     print("-" * 50)
     
+    start_str = current_date.strftime("%Y-%m-%d")
     day_count = 0
+    from src.memory_monitor import MEMORY_MONITOR, MemoryMonitor
+    memory_monitor = MemoryMonitor() if MEMORY_MONITOR else None
+    if memory_monitor:
+        memory_monitor.start()
     while current_date <= end_date:
         day_count += 1
         print(f"\n📅 Day {day_count}: {current_date.strftime('%Y-%m-%d')} (분석 기준: {ref_date.strftime('%Y-%m-%d')})")
@@ -137,6 +206,10 @@ async def run_backtest():
             import traceback
             traceback.print_exc()
         
+        refresh_performance_metrics(current_str)
+        if memory_monitor:
+            memory_monitor.sample(current_str)
+        
         # 다음 날로 이동
         ref_date += timedelta(days=1)
         current_date += timedelta(days=1)
@@ -144,6 +217,36 @@ async def run_backtest():
         print(f"✅ Day {day_count} 완료, 다음 날로 이동...")
     
     print(f"\n🎉 백테스팅 완료! 총 {day_count}일 시뮬레이션 종료")
+    print_stage_summary(start_str, end_date.strftime("%Y-%m-%d"))
+    from src.trading.metrics import print_stage_metrics_summary
+    print_stage_metrics_summary(start_str, end_date.strftime("%Y-%m-%d"))
+    from src.analytics.performance import print_leaderboard
+    print()
+    print_leaderboard()
+    if LOG_TRACER:
+        LOG_TRACER.force_flush()
+        LOG_TRACER.print_summary()
+    if memory_monitor:
+        memory_monitor.write_report()
+
+def refresh_performance_metrics(end_date: str = None):
+    """그날 거래가 끝난 뒤 계좌별 성과 지표를 증분 갱신 (리더보드용)"""
+    try:
+        from src.analytics.performance import refresh_performance
+        refresh_performance(end_date)
+    except Exception as e:
+        print(f"⚠️ 성과 지표 갱신 실패: {e}")
+
+def print_stage_summary(start_date: str, end_date: str):
+    """백테스팅 기간 동안 단계별 실행/생략 횟수 출력"""
+    from src.trading.database import get_stage_status_counts
+
+    counts = get_stage_status_counts(start_date=start_date, end_date=end_date)
+    if not counts:
+        return
+    print(f"\n📊 단계별 실행 현황 ({start_date} ~ {end_date}):")
+    for (stage, status), count in counts.items():
+        print(f"   - {stage}: {status} {count}회")
 
 async def run_scheduler():
     """스케줄러 실행 (실시간 모드 - 주기적 반복)"""
@@ -161,6 +264,8 @@ async def run_scheduler():
         # 실제로는 시장 시간 체크를 해야 하지만 일단 생략
         if RUN_EVEN_WHEN_MARKET_IS_CLOSED:  # or is_market_open():
             await run_parallel_trading()
+            # 실시간 모드에서는 하루가 끝난 날까지만 반영 (같은 날은 다시 반영되지 않음)
+            refresh_performance_metrics((datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"))
         else:
             print("📈 시장이 닫혀있어서 건너뜀")
         
@@ -178,6 +283,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="유튜버 기반 멀티 에이전트 트레이딩")
     parser.add_argument("--once", action="store_true", help="한 번만 실행 (스케줄러 없이)")
     args = parser.parse_args()
+    setup_tracing()
     
     try:
         if args.once:
@@ -9,8 +9,9 @@ from .database import write_account, read_account, write_log
 load_dotenv(override=True)
 
 INITIAL_BALANCE = float(os.getenv("INITIAL_BALANCE", "10000.0"))
-SPREAD = 0.002
-TRADING_FEE_RATE = 0.0015  # 0.15% 수수료
+# 거래 비용 - 비용 가정을 바꿔 돌릴 때는 환경변수로 (지난 실행은 src/analytics/costs.py로 재계산)
+SPREAD = float(os.getenv("SPREAD", "0.002"))
+TRADING_FEE_RATE = float(os.getenv("TRADING_FEE_RATE", "0.0015"))  # 0.15% 수수료
 
 # 백테스팅용 글로벌 변수
 _backtest_date = None
@@ -27,6 +28,15 @@ def get_backtest_date() -> Optional[str]:
     return os.getenv("BACKTEST_DATE") or _backtest_date
 
 
+def current_timestamp() -> str:
+    """거래·가치 기록 시각 - 백테스팅 중이면 백테스팅 날짜 + 실제 시각(같은 날 안의 순서 유지)"""
+    now = datetime.now()
+    backtest_date = get_backtest_date()
+    if backtest_date:
+        return f"{backtest_date.split(' ')[0]} {now.strftime('%H:%M:%S')}"
+    return now.strftime("%Y-%m-%d %H:%M:%S")
+
+
 # -----------------------------
 # Price function injection (DI)
 PriceFunction = Callable[[str], float]
@@ -167,7 +177,7 @@ class Account(BaseModel):
         
         # Update holdings
         self.holdings[symbol] = self.holdings.get(symbol, 0) + quantity
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = current_timestamp()
         # Record transaction
         transaction = Transaction(symbol=symbol, quantity=quantity, price=buy_price, timestamp=timestamp, rationale=rationale)
         self.transactions.append(transaction)
@@ -195,7 +205,7 @@ class Account(BaseModel):
         # If shares are completely sold, remove from holdings
         if self.holdings[symbol] == 0:
             del self.holdings[symbol]
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = current_timestamp()
         # Record transaction
         transaction = Transaction(symbol=symbol, quantity=-quantity, price=sell_price, timestamp=timestamp, rationale=rationale)  # negative quantity for sell
         self.transactions.append(transaction)
@@ -233,7 +243,7 @@ class Account(BaseModel):
     def report(self) -> str:
         """ Return a json string representing the account.  """
         portfolio_value = self.calculate_portfolio_value()
-        self.portfolio_value_time_series.append((datetime.now().strftime("%Y-%m-%d %H:%M:%S"), portfolio_value))
+        self.portfolio_value_time_series.append((current_timestamp(), portfolio_value))
         self.save()
         pnl = self.calculate_profit_loss(portfolio_value)
         data = self.model_dump()
@@ -3,33 +3,37 @@ from mcp.client.stdio import stdio_client
 from mcp import StdioServerParameters
 from agents import FunctionTool
 import json
+from config.mcp_params import with_passthrough_env
 
-params = StdioServerParameters(command="uv", args=["run", "src/accounts/accounts_server.py"], env=None)
+
+def server_params() -> StdioServerParameters:
+    # 호출 시점의 BACKTEST_DATE·ACCOUNTS_DB 등을 서버 프로세스에 전달
+    return StdioServerParameters(**with_passthrough_env({"command": "uv", "args": ["run", "src/accounts/accounts_server.py"]}))
 
 
 async def list_accounts_tools():
-    async with stdio_client(params) as streams:
+    async with stdio_client(server_params()) as streams:
         async with mcp.ClientSession(*streams) as session:
             await session.initialize()
             tools_result = await session.list_tools()
             return tools_result.tools
         
 async def call_accounts_tool(tool_name, tool_args):
-    async with stdio_client(params) as streams:
+    async with stdio_client(server_params()) as streams:
         async with mcp.ClientSession(*streams) as session:
             await session.initialize()
             result = await session.call_tool(tool_name, tool_args)
             return result
             
 async def read_accounts_resource(name):
-    async with stdio_client(params) as streams:
+    async with stdio_client(server_params()) as streams:
         async with mcp.ClientSession(*streams) as session:
             await session.initialize()
             result = await session.read_resource(f"accounts://accounts_server/{name}")
             return result.contents[0].text
         
 async def read_strategy_resource(name):
-    async with stdio_client(params) as streams:
+    async with stdio_client(server_params()) as streams:
         async with mcp.ClientSession(*streams) as session:
             await session.initialize()
             result = await session.read_resource(f"accounts://strategy/{name}")
@@ -8,8 +8,10 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
 from src.accounts.accounts import Account, set_price_fn
+from src.profiling import profiled_tool
+from src.blocking import run_blocking, run_stdio, account_lock
 from src.market.market import get_share_price, get_share_price_polygon_eod
-from src.accounts.database import read_market, is_video_analyzed, record_analyzed_video
+from src.accounts.database import read_market, is_video_analyzed, record_analyzed_video, filter_unanalyzed_videos
 from datetime import datetime
 import os
 
@@ -80,25 +82,37 @@ def backtest_aware_price(symbol: str) -> float:
 
 set_price_fn(backtest_aware_price)
 
+
+async def update_account(name: str, method: str, *args):
+    """Load the account and call a method that saves it, off the event loop and one call per account at a time."""
+    async with account_lock(name):
+        account = await run_blocking(Account.get, name)
+        return await run_blocking(getattr(account, method), *args)
+
 @mcp.tool()
+@profiled_tool("accounts_server")
 async def get_balance(name: str) -> float:
     """Get the cash balance of the given account name.
 
     Args:
         name: The name of the account holder
     """
-    return Account.get(name).balance
+    account = await run_blocking(Account.get, name)
+    return account.balance
 
 @mcp.tool()
+@profiled_tool("accounts_server")
 async def get_holdings(name: str) -> dict[str, int]:
     """Get the holdings of the given account name.
 
     Args:
         name: The name of the account holder
     """
-    return Account.get(name).holdings
+    account = await run_blocking(Account.get, name)
+    return account.holdings
 
 @mcp.tool()
+@profiled_tool("accounts_server")
 async def buy_shares(name: str, symbol: str, quantity: int, rationale: str, price: float = None) -> float:
     """Buy shares of a stock.
 
@@ -111,13 +125,14 @@ async def buy_shares(name: str, symbol: str, quantity: int, rationale: str, pric
     """
     if price is not None:
         # Use provided price to avoid redundant API calls
-        return Account.get(name).buy_shares_at_price(symbol, quantity, rationale, price)
+        return await update_account(name, "buy_shares_at_price", symbol, quantity, rationale, price)
     else:
         # Use default method (will call price function)
-        return Account.get(name).buy_shares(symbol, quantity, rationale)
+        return await update_account(name, "buy_shares", symbol, quantity, rationale)
 
 
 @mcp.tool()
+@profiled_tool("accounts_server")
 async def sell_shares(name: str, symbol: str, quantity: int, rationale: str) -> float:
     """Sell shares of a stock.
 
@@ -127,9 +142,10 @@ async def sell_shares(name: str, symbol: str, quantity: int, rationale: str) ->
         quantity: The quantity of shares to sell
         rationale: The rationale for the sale and fit with the account's strategy
     """
-    return Account.get(name).sell_shares(symbol, quantity, rationale)
+    return await update_account(name, "sell_shares", symbol, quantity, rationale)
 
 @mcp.tool()
+@profiled_tool("accounts_server")
 async def change_strategy(name: str, strategy: str) -> str:
     """At your discretion, if you choose to, call this to change your investment strategy for the future.
 
@@ -137,14 +153,14 @@ async def change_strategy(name: str, strategy: str) -> str:
         name: The name of the account holder
         strategy: The new strategy for the account
     """
-    return Account.get(name).change_strategy(strategy)
+    return await update_account(name, "change_strategy", strategy)
 
 @mcp.resource("accounts://accounts_server/{name}")
 async def read_account_resource(name: str) -> str:
-    account = Account.get(name.lower())
-    return account.report()
+    return await update_account(name.lower(), "report")
 
 @mcp.tool()
+@profiled_tool("accounts_server")
 async def check_video_analyzed(video_id: str, trader_name: str) -> bool:
     """Check if a video has already been analyzed by a specific trader to prevent duplicate analysis.
 
@@ -152,9 +168,22 @@ async def check_video_analyzed(video_id: str, trader_name: str) -> bool:
         video_id: The unique ID of the video to check
         trader_name: The name of the trader/account
     """
-    return is_video_analyzed(video_id, trader_name)
+    return await run_blocking(is_video_analyzed, video_id, trader_name)
+
+@mcp.tool(name="filter_unanalyzed_videos")
+@profiled_tool("accounts_server")
+async def filter_unanalyzed(video_ids: list[str], trader_name: str) -> list[str]:
+    """Filter a batch of candidate video IDs down to the ones a trader has NOT analyzed yet.
+    Prefer this over calling check_video_analyzed once per video.
+
+    Args:
+        video_ids: Candidate video IDs (e.g. every ID from a search result)
+        trader_name: The name of the trader/account
+    """
+    return await run_blocking(filter_unanalyzed_videos, video_ids, trader_name)
 
 @mcp.tool()
+@profiled_tool("accounts_server")
 async def mark_video_analyzed(video_id: str, trader_name: str, title: str, channel_name: str,
                              publication_date: str, analysis_date: str, us_market_relevant: bool = False,
                              transcript_analyzed: bool = False) -> bool:
@@ -170,18 +199,17 @@ async def mark_video_analyzed(video_id: str, trader_name: str, title: str, chann
         us_market_relevant: Whether the video contained US market relevant content
         transcript_analyzed: Whether the transcript was actually read
     """
-    return record_analyzed_video(video_id, trader_name, title, channel_name,
-                                publication_date, analysis_date, us_market_relevant, transcript_analyzed)
+    return await run_blocking(record_analyzed_video, video_id, trader_name, title, channel_name,
+                              publication_date, analysis_date, us_market_relevant, transcript_analyzed)
 
 @mcp.resource("accounts://accounts_server/{name}")
 async def read_account_resource(name: str) -> str:
-    account = Account.get(name.lower())
-    return account.report()
+    return await update_account(name.lower(), "report")
 
 @mcp.resource("accounts://strategy/{name}")
 async def read_strategy_resource(name: str) -> str:
-    account = Account.get(name.lower())
-    return account.get_strategy()
+    account = await run_blocking(Account.get, name.lower())
+    return await run_blocking(account.get_strategy)
 
 if __name__ == "__main__":
-    mcp.run(transport='stdio')
\ No newline at end of file
+    run_stdio(mcp)
\ No newline at end of file
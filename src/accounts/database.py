@@ -1,3 +1,4 @@
+import os
 import sqlite3
 import json
 from datetime import datetime
@@ -5,10 +6,46 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
-DB = "accounts.db"
+DB = os.getenv("ACCOUNTS_DB", "accounts.db")
+
+LEADERBOARD_UPSERT = '''
+    INSERT INTO leaderboard (name, balance, holdings_value, equity, positions, trades, valued_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(name) DO UPDATE SET
+        balance=excluded.balance,
+        holdings_value=excluded.holdings_value,
+        equity=excluded.equity,
+        positions=excluded.positions,
+        trades=excluded.trades,
+        valued_at=excluded.valued_at,
+        updated_at=excluded.updated_at
+'''
+
+
+def _leaderboard_row(name: str, account: dict) -> tuple:
+    """계좌 JSON에서 리더보드 행 계산 (가격 조회 없음)
+
+    거래 이후 report()로 평가한 값이 있으면 그 평가액, 없으면 보유 종목을 종목별 마지막 체결가로 평가.
+    """
+    balance = account.get("balance", 0.0)
+    holdings = account.get("holdings", {})
+    transactions = account.get("transactions", [])
+    series = account.get("portfolio_value_time_series", [])
+    last_trade = transactions[-1]["timestamp"] if transactions else ""
+    if series and series[-1][0] >= last_trade:
+        valued_at, equity = series[-1]
+        holdings_value = equity - balance
+    else:
+        marks = {tx["symbol"]: tx["price"] for tx in transactions}
+        holdings_value = sum(quantity * marks.get(symbol, 0.0) for symbol, quantity in holdings.items())
+        valued_at, equity = last_trade or None, balance + holdings_value
+    positions = sum(1 for quantity in holdings.values() if quantity)
+    return (name.lower(), balance, holdings_value, equity, positions, len(transactions), valued_at)
 
 
 with sqlite3.connect(DB) as conn:
+    # WAL: MCP 서버 스레드·트레이더별 서버 프로세스가 동시에 읽고 쓸 때 읽기가 쓰기를 기다리지 않음 (DB 파일에 유지됨)
+    conn.execute('PRAGMA journal_mode=WAL')
     cursor = conn.cursor()
     cursor.execute('CREATE TABLE IF NOT EXISTS accounts (name TEXT PRIMARY KEY, account TEXT)')
     cursor.execute('''
@@ -29,9 +66,18 @@ with sqlite3.connect(DB) as conn:
             PRIMARY KEY (symbol, date)
         )
     ''')
+    # 일봉 range 조회로 확인된 거래 없는 평일 (휴장일 등) - 다시 조회하지 않도록
     cursor.execute('''
+        CREATE TABLE IF NOT EXISTS price_gaps (
+            symbol TEXT,
+            date TEXT,
+            PRIMARY KEY (symbol, date)
+        )
+    ''')
+    # 같은 유튜버를 여러 트레이더가 따르므로 분석 기록은 (영상, 트레이더)별
+    analyzed_videos_schema = '''
         CREATE TABLE IF NOT EXISTS analyzed_videos (
-            video_id TEXT PRIMARY KEY,
+            video_id TEXT,
             trader_name TEXT,
             title TEXT,
             channel_name TEXT,
@@ -39,9 +85,151 @@ with sqlite3.connect(DB) as conn:
             analysis_date TEXT,
             us_market_relevant BOOLEAN,
             transcript_analyzed BOOLEAN,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (video_id, trader_name)
+        )
+    '''
+    cursor.execute("SELECT name FROM pragma_table_info('analyzed_videos') WHERE pk > 0")
+    if [row[0] for row in cursor.fetchall()] == ["video_id"]:
+        # 기존 DB (video_id 단독 키) → 새 키로 옮김; 덮어써져 사라진 다른 트레이더의 기록은 복구할 수 없음
+        cursor.execute('ALTER TABLE analyzed_videos RENAME TO analyzed_videos_old')
+        cursor.execute('DROP INDEX IF EXISTS idx_analyzed_videos_trader_video')
+        cursor.execute('DROP INDEX IF EXISTS idx_analyzed_videos_trader_created')
+        cursor.execute(analyzed_videos_schema)
+        cursor.execute('INSERT OR IGNORE INTO analyzed_videos SELECT * FROM analyzed_videos_old')
+        cursor.execute('DROP TABLE analyzed_videos_old')
+        print("🔧 analyzed_videos 키를 (video_id, trader_name)으로 변경")
+    cursor.execute(analyzed_videos_schema)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analyzed_videos_trader_video ON analyzed_videos (trader_name, video_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analyzed_videos_trader_created ON analyzed_videos (trader_name, created_at)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS research_cache (
+            youtuber TEXT,
+            window_start TEXT,
+            window_end TEXT,
+            prompt_version TEXT,
+            insights TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (youtuber, window_start, window_end, prompt_version)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_stage_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trader_name TEXT,
+            run_date TEXT,
+            stage TEXT,
+            status TEXT,
+            reason TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stage_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trader_name TEXT,
+            run_date TEXT,
+            stage TEXT,
+            wall_seconds REAL,
+            model_seconds REAL,
+            turns INTEGER,
+            input_tokens INTEGER,
+            output_tokens INTEGER,
+            cached_tokens INTEGER,
+            tool_calls TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stage_metrics_run ON stage_metrics (run_date, stage)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS trace_spans (
+            span_id TEXT PRIMARY KEY,
+            trace_id TEXT,
+            parent_id TEXT,
+            name TEXT,
+            type TEXT,
+            trader_name TEXT,
+            started_at TEXT,
+            ended_at TEXT,
+            duration_seconds REAL,
+            error TEXT
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_trace_spans_trace ON trace_spans (trace_id, started_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_trace_spans_parent ON trace_spans (parent_id)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS signals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trader_name TEXT,
+            youtuber TEXT,
+            run_date TEXT,
+            reference_date TEXT,
+            ticker TEXT,
+            direction TEXT,
+            conviction TEXT,
+            video_id TEXT,
+            video_published TEXT,
+            price REAL,
+            position_pct REAL,
+            source TEXT,
+            prompt_version TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (trader_name, run_date, ticker, direction)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_signals_youtuber_date ON signals (youtuber, run_date)')
+    # 벤치마크 매수 후 보유 평가액 (src/analytics/baseline.py) - 같은 시작일·비용이면 모든 트레이더가 공유
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS baselines (
+            symbol TEXT,
+            start_date TEXT,
+            spread REAL,
+            fee_rate REAL,
+            initial_balance REAL,
+            date TEXT,
+            equity REAL,
+            PRIMARY KEY (symbol, start_date, spread, fee_rate, initial_balance, date)
+        )
+    ''')
+    # 계좌 저장과 같은 트랜잭션에서 갱신되는 현재 순위표 (평가액·포지션 수) - 조회는 쿼리 한 번
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS leaderboard (
+            name TEXT PRIMARY KEY,
+            balance REAL,
+            holdings_value REAL,
+            equity REAL,
+            positions INTEGER,
+            trades INTEGER,
+            valued_at TEXT,
+            updated_at DATETIME
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_leaderboard_equity ON leaderboard (equity DESC)')
+    # 순위표가 생기기 전에 저장된 계좌는 한 번 채워 넣음
+    # 순위표에 없거나 평가액이 비어 있는 계좌는 계좌 JSON에서 다시 계산
+    cursor.execute('''
+        SELECT name, account FROM accounts
+        WHERE name NOT IN (SELECT name FROM leaderboard WHERE equity IS NOT NULL)
+    ''')
+    missing = cursor.fetchall()
+    if missing:
+        cursor.executemany(LEADERBOARD_UPSERT, [_leaderboard_row(name, json.loads(account)) for name, account in missing])
+    # 계좌별 성과 지표 + 증분 계산 상태 (src/analytics/performance.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS performance (
+            name TEXT PRIMARY KEY,
+            last_date TEXT,
+            equity REAL,
+            total_return REAL,
+            volatility REAL,
+            sharpe REAL,
+            max_drawdown REAL,
+            hit_rate REAL,
+            excess_return REAL,
+            state TEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
     conn.commit()
 
 def write_account(name, account_dict):
@@ -53,6 +241,8 @@ def write_account(name, account_dict):
             VALUES (?, ?)
             ON CONFLICT(name) DO UPDATE SET account=excluded.account
         ''', (name.lower(), json_data))
+        # 같은 트랜잭션에서 순위표 갱신 (계좌와 순위표가 어긋나지 않도록)
+        cursor.execute(LEADERBOARD_UPSERT, _leaderboard_row(name, account_dict))
         conn.commit()
 
 def read_account(name):
@@ -62,6 +252,86 @@ def read_account(name):
         row = cursor.fetchone()
         return json.loads(row[0]) if row else None
     
+def read_all_accounts() -> dict[str, dict]:
+    """모든 계좌를 한 번의 쿼리로 조회 (이름 → 계좌 필드)"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT name, account FROM accounts ORDER BY name')
+        return {name: json.loads(account) for name, account in cursor.fetchall()}
+
+PERFORMANCE_COLUMNS = ("equity", "total_return", "volatility", "sharpe", "max_drawdown", "hit_rate", "excess_return")
+
+def read_leaderboard(initial_balance: float, limit: int = None) -> list[dict]:
+    """
+    Current standings of every trader in one indexed query, highest equity first.
+
+    Args:
+        initial_balance (float): starting balance used for P&L and return
+        limit (int): number of rows (all when None)
+    """
+    with sqlite3.connect(DB) as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT name, equity, equity - ? AS pnl, equity / ? - 1 AS return,
+                   balance, holdings_value, positions, trades, valued_at, updated_at
+            FROM leaderboard
+            ORDER BY equity DESC
+            LIMIT ?
+        ''', (initial_balance, initial_balance, limit if limit else -1))
+        return [dict(row) for row in cursor.fetchall()]
+
+def read_performance_states() -> dict[str, dict]:
+    """계좌별 증분 계산 상태 (이름 → 상태)"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT name, state FROM performance')
+        return {name: json.loads(state) for name, state in cursor.fetchall()}
+
+def write_performance(rows: list[dict]) -> None:
+    """
+    Upsert performance metrics and their incremental state in one transaction.
+
+    Args:
+        rows (list): dicts with name, last_date, state and the PERFORMANCE_COLUMNS metrics
+    """
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.executemany(f'''
+            INSERT INTO performance (name, last_date, {", ".join(PERFORMANCE_COLUMNS)}, state, updated_at)
+            VALUES (?, ?, {", ".join("?" * len(PERFORMANCE_COLUMNS))}, ?, datetime('now'))
+            ON CONFLICT(name) DO UPDATE SET
+                last_date=excluded.last_date,
+                {", ".join(f"{column}=excluded.{column}" for column in PERFORMANCE_COLUMNS)},
+                state=excluded.state,
+                updated_at=excluded.updated_at
+        ''', [(row["name"].lower(), row["last_date"], *(row[column] for column in PERFORMANCE_COLUMNS),
+               json.dumps(row["state"])) for row in rows])
+        # 종가 기준 일별 평가를 순위표에도 반영 (그날 이후 거래로 갱신된 행은 그대로, NaN은 NULL로 바인딩되므로 평가액이 없으면 건너뜀)
+        cursor.executemany('''
+            UPDATE leaderboard
+            SET equity = ?, holdings_value = ? - balance, valued_at = ?, updated_at = datetime('now')
+            WHERE name = ? AND ? IS NOT NULL AND (valued_at IS NULL OR substr(valued_at, 1, 10) <= ?)
+        ''', [(row["equity"], row["equity"], row["last_date"], row["name"].lower(), row["equity"], row["last_date"])
+              for row in rows])
+        conn.commit()
+
+def read_performance(order_by: str = "total_return", limit: int = None) -> list[dict]:
+    """저장된 성과 지표를 한 번의 쿼리로 정렬 조회 (값이 없는 계좌는 뒤로)"""
+    if order_by not in PERFORMANCE_COLUMNS:
+        raise ValueError(f"Unknown metric: {order_by} (choose from {', '.join(PERFORMANCE_COLUMNS)})")
+    # 낙폭은 작을수록 좋음
+    direction = "ASC" if order_by == "max_drawdown" else "DESC"
+    with sqlite3.connect(DB) as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT name, last_date, {", ".join(PERFORMANCE_COLUMNS)}, updated_at FROM performance
+            ORDER BY {order_by} IS NULL, {order_by} {direction}, name
+            LIMIT ?
+        ''', (limit if limit else -1,))
+        return [dict(row) for row in cursor.fetchall()]
+
 def write_log(name: str, type: str, message: str):
     """
     Write a log entry to the logs table.
@@ -81,6 +351,23 @@ def write_log(name: str, type: str, message: str):
         ''', (name.lower(), type, message))
         conn.commit()
 
+def write_trace_spans(rows: list[tuple]) -> None:
+    """
+    Bulk-insert finished spans into the trace_spans table.
+
+    Args:
+        rows (list): (span_id, trace_id, parent_id, name, type, trader_name,
+                      started_at, ended_at, duration_seconds, error) tuples
+    """
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO trace_spans
+            (span_id, trace_id, parent_id, name, type, trader_name, started_at, ended_at, duration_seconds, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+
 def read_log(name: str, last_n=10):
     """
     Read the most recent log entries for a given name.
@@ -121,6 +408,14 @@ def read_market(date: str) -> dict | None:
         row = cursor.fetchone()
         return json.loads(row[0]) if row else None
 
+def read_latest_market() -> dict | None:
+    """가장 최근 날짜의 시장 데이터 (티커 → 종가)"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT data FROM market ORDER BY date DESC LIMIT 1')
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
 def write_stock_price(symbol: str, date: str, price: float) -> None:
     """개별 종목의 특정 날짜 가격을 저장"""
     with sqlite3.connect(DB) as conn:
@@ -141,6 +436,68 @@ def read_stock_price(symbol: str, date: str) -> float | None:
         row = cursor.fetchone()
         return row[0] if row else None
 
+def write_stock_prices(rows: list[tuple[str, str, float]]) -> None:
+    """(symbol, date, price) 여러 건을 한 번에 저장"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO stock_prices (symbol, date, price)
+            VALUES (?, ?, ?)
+            ON CONFLICT(symbol, date) DO UPDATE SET price=excluded.price
+        ''', [(symbol.upper(), date, price) for symbol, date, price in rows])
+        conn.commit()
+
+def read_stock_prices(symbols: list[str], start: str, end: str) -> list[tuple[str, str, float]]:
+    """여러 종목의 기간 가격을 한 번에 조회 → (symbol, date, price) 목록 (날짜순)"""
+    if not symbols:
+        return []
+    placeholders = ",".join("?" * len(symbols))
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT symbol, date, price FROM stock_prices
+            WHERE symbol IN ({placeholders}) AND date BETWEEN ? AND ?
+            ORDER BY date
+        ''', [symbol.upper() for symbol in symbols] + [start, end])
+        return cursor.fetchall()
+
+def read_price_gaps(symbol: str, start: str, end: str) -> set[str]:
+    """가격이 없다고 확인된 날짜 집합"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT date FROM price_gaps WHERE symbol = ? AND date BETWEEN ? AND ?',
+                       (symbol.upper(), start, end))
+        return {row[0] for row in cursor.fetchall()}
+
+def write_price_gaps(symbol: str, dates: list[str]) -> None:
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.executemany('INSERT OR IGNORE INTO price_gaps (symbol, date) VALUES (?, ?)',
+                           [(symbol.upper(), date) for date in dates])
+        conn.commit()
+
+def read_baseline(symbol: str, start_date: str, spread: float, fee_rate: float,
+                  initial_balance: float, end: str) -> list[tuple[str, float]]:
+    """저장된 벤치마크 평가액 (date, equity) 목록 (end까지, 날짜순)"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT date, equity FROM baselines
+            WHERE symbol = ? AND start_date = ? AND spread = ? AND fee_rate = ? AND initial_balance = ? AND date <= ?
+            ORDER BY date
+        ''', (symbol.upper(), start_date, spread, fee_rate, initial_balance, end))
+        return cursor.fetchall()
+
+def write_baseline(symbol: str, start_date: str, spread: float, fee_rate: float,
+                   initial_balance: float, rows: list[tuple[str, float]]) -> None:
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO baselines (symbol, start_date, spread, fee_rate, initial_balance, date, equity)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(symbol.upper(), start_date, spread, fee_rate, initial_balance, date, equity) for date, equity in rows])
+        conn.commit()
+
 def is_video_analyzed(video_id: str, trader_name: str) -> bool:
     """Check if a video has already been analyzed by a specific trader"""
     with sqlite3.connect(DB) as conn:
@@ -151,6 +508,30 @@ def is_video_analyzed(video_id: str, trader_name: str) -> bool:
         ''', (video_id, trader_name))
         return cursor.fetchone() is not None
 
+def filter_unanalyzed_videos(video_ids: list[str], trader_name: str, analyzed_before: str = None) -> list[str]:
+    """Return the given video IDs that a trader has NOT analyzed yet (input order preserved)
+
+    With analyzed_before (YYYY-MM-DD), only analyses recorded before that date count, so a rerun of
+    the same run date (after a crash or with changed settings) still sees that day's videos as new.
+    """
+    unique_ids = list(dict.fromkeys(vid.strip() for vid in video_ids if vid and vid.strip()))
+    analyzed = set()
+    # 날짜 없는 기존 기록은 이전 실행에서 분석된 것으로 간주
+    date_filter = "AND (analysis_date IS NULL OR substr(analysis_date, 1, 10) < ?)" if analyzed_before else ""
+    date_args = (analyzed_before[:10],) if analyzed_before else ()
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+        for i in range(0, len(unique_ids), 500):
+            chunk = unique_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f'''
+                SELECT video_id FROM analyzed_videos
+                WHERE trader_name = ? AND video_id IN ({placeholders}) {date_filter}
+            ''', (trader_name, *chunk, *date_args))
+            analyzed.update(row[0] for row in cursor.fetchall())
+    return [vid for vid in unique_ids if vid not in analyzed]
+
 def record_analyzed_video(video_id: str, trader_name: str, title: str, channel_name: str,
                          publication_date: str, analysis_date: str, us_market_relevant: bool = False,
                          transcript_analyzed: bool = False) -> bool:
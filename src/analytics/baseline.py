@@ -0,0 +1,96 @@
+"""
+Buy-and-hold benchmark baselines
+시작일 종가에 초기 자금 전부로 SPY(QQQ 등)를 사서 보유했을 때의 일별 평가액 - 트레이더와 같은 SPREAD·TRADING_FEE_RATE 적용
+가격은 stock_prices에서 읽고 빠진 날짜만 일봉 range 요청 한 번으로 채움, 결과는 baselines 테이블에 저장해 모든 트레이더가 재사용
+
+    uv run -m src.analytics.baseline --start 2024-09-12 --end 2024-10-12 --symbols SPY,QQQ
+"""
+
+import math
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.accounts.accounts import INITIAL_BALANCE, SPREAD, TRADING_FEE_RATE, get_backtest_date
+from src.accounts.database import read_baseline, read_price_gaps, read_stock_prices, write_baseline
+from src.analytics.equity import load_price_matrix, trading_days
+from src.market.market import fetch_price_history
+
+BASELINE_SYMBOLS = [s.strip().upper() for s in os.getenv("BASELINE_SYMBOLS", "SPY,QQQ").split(",") if s.strip()]
+
+
+def compute_baseline(close: np.ndarray, initial_balance: float = INITIAL_BALANCE,
+                     spread: float = SPREAD, fee_rate: float = TRADING_FEE_RATE) -> np.ndarray:
+    """Equity of buying close[0] (spread and fee included, fractional shares) and holding."""
+    shares = initial_balance / (close[0] * (1 + spread) * (1 + fee_rate))
+    return shares * close
+
+
+def get_baseline(symbol: str, start: str, end: str, spread: float = SPREAD, fee_rate: float = TRADING_FEE_RATE,
+                 initial_balance: float = INITIAL_BALANCE) -> list[tuple[str, float]]:
+    """(date, equity) per trading day from start to end, extending the stored series when needed.
+
+    The series only depends on the entry day, so later calls with a larger end reuse the stored
+    rows and only price the new days. Only the leading run of days before today that have a real
+    stock_prices row (or are known market holidays) is stored; later days are forward-filled
+    in the returned series but recomputed on the next call, so a close published late replaces
+    the stale value. Returns [] if no price is available.
+    """
+    symbol = symbol.upper()
+    days = [str(day) for day in trading_days(start, end)]
+    if not days:
+        return []
+    stored = read_baseline(symbol, days[0], spread, fee_rate, initial_balance, end)
+    if stored and stored[-1][0] >= days[-1]:
+        return stored
+
+    fetch_from = str(np.datetime64(stored[-1][0], "D") + np.timedelta64(1, "D")) if stored else days[0]
+    fetch_price_history(symbol, fetch_from, end)
+    close = load_price_matrix([symbol], days[0], end).close[:, 0]
+    if math.isnan(close[0]):
+        print(f"⚠️ {symbol} 가격이 없어 벤치마크를 계산할 수 없습니다 ({days[0]}~{end})")
+        return stored
+
+    equity = compute_baseline(close, initial_balance, spread, fee_rate)
+    series = [(day, round(float(value), 4)) for day, value in zip(days, equity)]
+    today = datetime.now().strftime("%Y-%m-%d")
+    last_stored = stored[-1][0] if stored else ""
+    settled = {day for _, day, _ in read_stock_prices([symbol], fetch_from, end)} | read_price_gaps(symbol, fetch_from, end)
+    persist = []
+    for day, value in series:
+        if day <= last_stored:
+            continue
+        if day >= today or day not in settled:
+            break
+        persist.append((day, value))
+    write_baseline(symbol, days[0], spread, fee_rate, initial_balance, persist)
+    return series
+
+
+def baseline_return(symbol: str, start: str, end: str, **costs) -> float | None:
+    """시작일 매수 후 end까지 보유한 수익률 (초기 자금 대비, 매수 비용 포함)"""
+    series = get_baseline(symbol, start, end, **costs)
+    initial_balance = costs.get("initial_balance", INITIAL_BALANCE)
+    return series[-1][1] / initial_balance - 1 if series else None
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Buy-and-hold benchmark equity from the local price store")
+    parser.add_argument("--start", help="entry day (default: 30 days before --end)")
+    parser.add_argument("--end", help="default: backtest date or today")
+    parser.add_argument("--symbols", default=",".join(BASELINE_SYMBOLS))
+    args = parser.parse_args()
+
+    end = args.end or (get_backtest_date() or datetime.now().strftime("%Y-%m-%d")).split(" ")[0]
+    start = args.start or (datetime.strptime(end, "%Y-%m-%d") - timedelta(days=30)).strftime("%Y-%m-%d")
+    print(f"📏 매수 후 보유 벤치마크 ({start} ~ {end}, 스프레드 {SPREAD:.2%}, 수수료 {TRADING_FEE_RATE:.2%})")
+    for symbol in [s.strip().upper() for s in args.symbols.split(",") if s.strip()]:
+        series = get_baseline(symbol, start, end)
+        if not series:
+            continue
+        equity = np.array([value for _, value in series])
+        peaks = np.maximum.accumulate(equity)
+        print(f"   {symbol:<6} 평가액 ${equity[-1]:>12,.2f}  수익률 {equity[-1] / INITIAL_BALANCE - 1:>+8.2%}  "
+              f"MDD {((peaks - equity) / peaks).max():>7.2%}  ({len(series)}거래일)")
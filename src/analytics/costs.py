@@ -0,0 +1,141 @@
+"""
+Cost-model what-if replay
+끝난 실행의 매매 결정(종목·수량·날짜)을 그대로 두고 스프레드·수수료·체결가 모델만 바꿔 재계산
+에이전트를 다시 돌리지 않고 여러 비용 가정을 한 번에 비교
+
+    uv run -m src.analytics.costs --spreads 0,0.001,0.002,0.005 --fees 0,0.0015,0.003 --fills recorded,close,next_close
+"""
+
+import csv
+import itertools
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.accounts.accounts import INITIAL_BALANCE, SPREAD
+from src.analytics.equity import PriceMatrix, build_equity_curves, flatten_transactions, load_accounts_and_prices
+
+# recorded: 실행 당시 조회한 가격 / close: 거래일 종가 / next_close: 다음 거래일 종가 (하루 늦은 체결)
+FILL_MODELS = ("recorded", "close", "next_close")
+
+
+@dataclass
+class CostScenario:
+    spread: float
+    fee_rate: float
+    fill: str = "recorded"
+
+
+def cost_grid(spreads: list[float], fee_rates: list[float], fills: list[str] = ("recorded",)) -> list[CostScenario]:
+    """Every spread × fee × fill combination."""
+    unknown = set(fills) - set(FILL_MODELS)
+    if unknown:
+        raise ValueError(f"Unknown fill model(s): {', '.join(sorted(unknown))} (choose from {', '.join(FILL_MODELS)})")
+    return [CostScenario(spread, fee, fill) for fill, spread, fee in itertools.product(fills, spreads, fee_rates)]
+
+
+def _base_prices(fill: str, trades, prices: PriceMatrix, recorded_spread: float) -> np.ndarray:
+    """스프레드를 붙이기 전 체결 기준가"""
+    if fill == "recorded":
+        # 기록된 체결가는 당시 스프레드가 붙은 값이므로 걷어냄
+        return trades.price / (1 + recorded_spread * np.sign(trades.quantity))
+    rows = trades.row if fill == "close" else np.minimum(trades.row + 1, len(prices.dates) - 1)
+    return prices.close[rows, trades.column]
+
+
+def replay_costs(accounts: dict[str, dict], prices: PriceMatrix, scenarios: list[CostScenario],
+                 initial_balance: float = INITIAL_BALANCE, recorded_spread: float = SPREAD) -> list[dict]:
+    """Re-execute the recorded trades under each scenario; one result row per (scenario, account).
+
+    Holdings do not depend on costs, so the market value of positions is computed once and each
+    scenario only rebuilds the cash path, vectorized across all scenarios that share a fill model.
+    Trades are never rejected: min_cash < 0 means the run could not have afforded them.
+    """
+    names = list(accounts)
+    if not len(prices.dates) or not names:
+        return []
+    trades = flatten_transactions(accounts, prices)
+    curves = build_equity_curves(accounts, prices, initial_balance)
+    market_value = curves.equity - curves.cash                       # (accounts, dates)
+    side = np.sign(trades.quantity)
+
+    results = []
+    for fill in dict.fromkeys(scenario.fill for scenario in scenarios):
+        group = [scenario for scenario in scenarios if scenario.fill == fill]
+        spread = np.array([scenario.spread for scenario in group])[:, None]      # (k, 1)
+        fee_rate = np.array([scenario.fee_rate for scenario in group])[:, None]
+        base = _base_prices(fill, trades, prices, recorded_spread)[None, :]    # (1, trades)
+
+        base_notional = trades.quantity * base
+        notional = trades.quantity * base * (1 + spread * side)                # 매수는 비싸게, 매도는 싸게
+        fees = np.abs(notional) * fee_rate
+        cash_delta = -notional - fees                                           # (k, trades)
+
+        cash = np.zeros((len(group), len(names), len(prices.dates)))
+        scenario_index = np.arange(len(group))[:, None]
+        np.add.at(cash, (scenario_index, trades.account[None, :], trades.row[None, :]), cash_delta)
+        np.cumsum(cash, axis=2, out=cash)
+        cash += initial_balance
+        equity = cash + market_value[None]
+
+        peaks = np.maximum.accumulate(equity, axis=2)
+        drawdown = ((peaks - equity) / peaks).max(axis=2)
+        fees_by_account = np.zeros((len(group), len(names)))
+        spread_by_account = np.zeros((len(group), len(names)))
+        np.add.at(fees_by_account, (scenario_index, trades.account[None, :]), fees)
+        np.add.at(spread_by_account, (scenario_index, trades.account[None, :]), notional - base_notional)
+
+        for k, scenario in enumerate(group):
+            for a, name in enumerate(names):
+                final = float(equity[k, a, -1])
+                results.append({
+                    "fill": scenario.fill,
+                    "spread": scenario.spread,
+                    "fee_rate": scenario.fee_rate,
+                    "account": name,
+                    "final_equity": round(final, 2),
+                    "return": round(final / initial_balance - 1, 6),
+                    "fees": round(float(fees_by_account[k, a]), 2),
+                    "spread_cost": round(float(spread_by_account[k, a]), 2),
+                    "max_drawdown": round(float(drawdown[k, a]), 6),
+                    "min_cash": round(float(cash[k, a].min()), 2),
+                })
+    return results
+
+
+def _floats(value: str) -> list[float]:
+    return [float(part) for part in value.split(",") if part.strip()]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay recorded trades under alternative spread / fee / fill models")
+    parser.add_argument("--spreads", default=f"0,{SPREAD}")
+    parser.add_argument("--fees", default="0,0.0015")
+    parser.add_argument("--fills", default="recorded,close,next_close")
+    parser.add_argument("--recorded-spread", type=float, default=SPREAD, help="spread used by the recorded run")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--trader", action="append", help="limit to these accounts (repeatable)")
+    parser.add_argument("--output", help="write the results table as CSV")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    accounts, prices = load_accounts_and_prices(args.start, args.end, args.trader)
+    scenarios = cost_grid(_floats(args.spreads), _floats(args.fees), [f.strip() for f in args.fills.split(",") if f.strip()])
+    rows = replay_costs(accounts, prices, scenarios, recorded_spread=args.recorded_spread)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"💸 {len(scenarios)}개 비용 시나리오 × {len(accounts)}개 계좌, {elapsed_ms:.1f}ms")
+    print(f"   {'fill':<11}{'spread':>8}{'fee':>8}  {'account':<24}{'equity':>12}{'return':>9}{'fees':>10}{'spread':>10}{'MDD':>8}")
+    for row in rows:
+        print(f"   {row['fill']:<11}{row['spread']:>8.4f}{row['fee_rate']:>8.4f}  {row['account']:<24}"
+              f"{row['final_equity']:>12,.2f}{row['return']:>+9.2%}{row['fees']:>10,.2f}{row['spread_cost']:>10,.2f}"
+              f"{row['max_drawdown']:>8.2%}" + ("  ⚠️ 현금 부족" if row["min_cash"] < 0 else ""))
+    if args.output and rows:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"💾 결과 저장: {args.output}")
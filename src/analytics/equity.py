@@ -0,0 +1,232 @@
+"""
+Vectorized equity curves
+계좌별 거래 내역과 (날짜 × 종목) 종가 행렬로 모든 계좌의 일별 보유 수량·현금·평가액을 한 번에 재구성
+(portfolio_value_time_series는 도구 호출 시점마다 찍힌 점이라 일별 곡선 비교에 쓰기 어려움)
+
+    uv run -m src.analytics.equity --start 2024-09-01 --end 2024-09-30
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from src.accounts.accounts import INITIAL_BALANCE, SPREAD, TRADING_FEE_RATE, get_backtest_date
+from src.accounts.database import read_all_accounts, read_stock_prices
+
+# 시작일 직전 종가로 첫 행을 채우기 위해 더 읽어오는 기간 (연휴 포함)
+PRICE_LOOKBACK_DAYS = 14
+
+
+@dataclass
+class PriceMatrix:
+    """Dense close prices: rows are trading days, columns are symbols (gaps forward-filled)."""
+    dates: np.ndarray      # datetime64[D]
+    symbols: list[str]
+    close: np.ndarray      # (dates, symbols)
+
+    def column(self, symbol: str) -> int:
+        return self.symbols.index(symbol.upper())
+
+
+@dataclass
+class EquityCurves:
+    """Daily state per account: holdings (accounts × dates × symbols), cash and equity (accounts × dates)."""
+    names: list[str]
+    dates: np.ndarray
+    symbols: list[str]
+    holdings: np.ndarray
+    cash: np.ndarray
+    equity: np.ndarray
+
+    def series(self, name: str) -> list[tuple[str, float]]:
+        """(YYYY-MM-DD, equity) points for one account."""
+        row = self.equity[self.names.index(name.lower())]
+        return [(str(day), float(value)) for day, value in zip(self.dates, row)]
+
+    def final_equity(self) -> dict[str, float]:
+        return {name: float(self.equity[i, -1]) for i, name in enumerate(self.names)} if len(self.dates) else {}
+
+
+def trading_days(start: str, end: str) -> np.ndarray:
+    """start~end 사이의 평일 (미국 휴장일은 직전 종가로 채워짐)"""
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    return days[np.is_busday(days)]
+
+
+def _day_index(dates: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """각 날짜가 속한 거래일 행 (주말·휴일은 직전 거래일, 시작 전은 첫 행)"""
+    return np.clip(np.searchsorted(dates, days, side="right") - 1, 0, None)
+
+
+def _fill_gaps(close: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column, then back-fill the leading ones."""
+    rows = np.arange(close.shape[0])[:, None]
+    columns = np.arange(close.shape[1])
+    for values in (close, close[::-1]):
+        source = np.where(np.isnan(values), 0, rows)
+        np.maximum.accumulate(source, axis=0, out=source)
+        values[...] = values[source, columns]
+    return close
+
+
+def load_price_matrix(symbols: list[str], start: str, end: str,
+                      fallback: list[tuple[str, str, float]] = ()) -> PriceMatrix:
+    """Build the close matrix from stock_prices in one query.
+
+    fallback: (symbol, date, price) used only where stock_prices has no row for that day
+    (e.g. fills recorded in transactions).
+    """
+    symbols = sorted({symbol.upper() for symbol in symbols})
+    dates = trading_days(start, end)
+    close = np.full((len(dates), len(symbols)), np.nan)
+    if not len(dates) or not symbols:
+        return PriceMatrix(dates, symbols, close)
+
+    lookback = str(np.datetime64(start, "D") - np.timedelta64(PRICE_LOOKBACK_DAYS, "D"))
+    columns = {symbol: i for i, symbol in enumerate(symbols)}
+    history = read_stock_prices(symbols, lookback, end)
+    fallback = sorted(((symbol.upper(), day[:10], price) for symbol, day, price in fallback
+                       if symbol.upper() in columns and price and day[:10] <= end), key=lambda row: row[1])
+    # stock_prices가 fallback을 덮어씀 (같은 행에 여러 값이면 날짜순으로 마지막 값)
+    for source in (fallback, history):
+        rows = [(symbol, day, price) for symbol, day, price in source if day >= start]
+        if not rows:
+            continue
+        symbol_list, days, prices = zip(*rows)
+        close[_day_index(dates, np.array(days, dtype="datetime64[D]")),
+              [columns[symbol] for symbol in symbol_list]] = prices
+    # 시작일 값이 없으면 직전 종가로
+    previous = {symbol: price for symbol, day, price in fallback + list(history) if day < start}
+    for symbol, price in previous.items():
+        if np.isnan(close[0, columns[symbol]]):
+            close[0, columns[symbol]] = price
+    return PriceMatrix(dates, symbols, _fill_gaps(close))
+
+
+@dataclass
+class TradeArrays:
+    """Every account's transactions as parallel arrays, positioned on a PriceMatrix."""
+    account: np.ndarray    # accounts 순서의 인덱스
+    row: np.ndarray        # 거래일 행
+    column: np.ndarray     # 종목 열
+    quantity: np.ndarray   # 매수 +, 매도 -
+    price: np.ndarray      # 체결가 (스프레드 포함)
+
+
+def flatten_transactions(accounts: dict[str, dict], prices: PriceMatrix) -> TradeArrays:
+    """Transactions dated after the last matrix day are dropped; earlier ones land on the first day.
+
+    Dropped transactions may be in symbols the matrix does not have.
+    """
+    columns = {symbol: i for i, symbol in enumerate(prices.symbols)}
+    last_day = str(prices.dates[-1]) if len(prices.dates) else ""
+    flat = [(i, tx["timestamp"][:10], columns[tx["symbol"].upper()], tx["quantity"], tx["price"])
+            for i, name in enumerate(accounts) for tx in accounts[name].get("transactions", [])
+            if tx["timestamp"][:10] <= last_day]
+    if not flat:
+        empty = np.zeros(0, dtype=int)
+        return TradeArrays(empty, empty, empty, empty, np.zeros(0))
+    account, days, column, quantity, price = (np.array(values) for values in zip(*flat))
+    return TradeArrays(account, _day_index(prices.dates, days.astype("datetime64[D]")), column,
+                       quantity, price.astype(float))
+
+
+def build_equity_curves(accounts: dict[str, dict], prices: PriceMatrix,
+                        initial_balance: float = INITIAL_BALANCE,
+                        fee_rate: float = TRADING_FEE_RATE,
+                        opening: dict[str, tuple[float, dict]] = None) -> EquityCurves:
+    """Replay every account's transactions on the price matrix at once.
+
+    Transactions store the fill price (spread included) and a signed quantity; the fee is
+    fee_rate of the notional, as in Account._execute_buy / sell_shares. Transactions before the
+    first date count on the first day, later ones are ignored. Deposits/withdrawals are not in
+    the transaction log and therefore not reflected. Only held positions are valued, so a symbol
+    without any price (NaN column, e.g. first bought after the last date) does not turn the
+    equity into NaN.
+
+    opening: name → (cash, {symbol: quantity}) held before the first date, replacing
+    initial_balance and empty holdings, so a caller can replay only the transactions after a
+    known position.
+    """
+    names = list(accounts)
+    shape = (len(names), len(prices.dates), len(prices.symbols))
+    holdings = np.zeros(shape)
+    cash = np.zeros(shape[:2])
+    if not len(prices.dates):
+        return EquityCurves(names, prices.dates, prices.symbols, holdings, cash, cash.copy())
+
+    trades = flatten_transactions(accounts, prices)
+    if len(trades.quantity):
+        notional = trades.quantity * trades.price
+        cash_delta = -notional - np.abs(notional) * fee_rate
+        np.add.at(holdings, (trades.account, trades.row, trades.column), trades.quantity)
+        np.add.at(cash, (trades.account, trades.row), cash_delta)
+    cash[:, 0] += initial_balance
+    if opening:
+        columns = {symbol: i for i, symbol in enumerate(prices.symbols)}
+        for i, name in enumerate(names):
+            if name in opening:
+                opening_cash, opening_holdings = opening[name]
+                cash[i, 0] += opening_cash - initial_balance
+                for symbol, quantity in opening_holdings.items():
+                    holdings[i, 0, columns[symbol.upper()]] += quantity
+
+    np.cumsum(holdings, axis=1, out=holdings)
+    np.cumsum(cash, axis=1, out=cash)
+    # 0 × NaN = NaN이므로 보유하지 않은 종목은 가격과 무관하게 0으로
+    equity = cash + np.where(holdings != 0, holdings * prices.close[None], 0.0).sum(axis=2)
+    return EquityCurves(names, prices.dates, prices.symbols, holdings, cash, equity)
+
+
+def transaction_fallback_prices(accounts: dict[str, dict]) -> list[tuple[str, str, float]]:
+    """거래 체결가에서 스프레드를 걷어낸 가격 - stock_prices에 없는 날짜를 메우는 용도"""
+    return [(tx["symbol"], tx["timestamp"][:10],
+             tx["price"] / (1 + SPREAD) if tx["quantity"] > 0 else tx["price"] / (1 - SPREAD))
+            for fields in accounts.values() for tx in fields.get("transactions", [])]
+
+
+def load_accounts_and_prices(start: str = None, end: str = None,
+                             names: list[str] = None) -> tuple[dict[str, dict], PriceMatrix]:
+    """accounts 테이블의 모든(또는 지정한) 계좌와 그 거래 종목의 가격 행렬
+
+    start 기본값은 가장 이른 거래일, end 기본값은 백테스팅 날짜(없으면 오늘).
+    """
+    accounts = read_all_accounts()
+    if names:
+        wanted = {name.lower() for name in names}
+        accounts = {name: fields for name, fields in accounts.items() if name in wanted}
+    end = end or (get_backtest_date() or datetime.now().strftime("%Y-%m-%d")).split(" ")[0]
+    transactions = [tx for fields in accounts.values() for tx in fields.get("transactions", [])
+                    if tx["timestamp"][:10] <= end]
+    start = start or min((tx["timestamp"][:10] for tx in transactions), default=end)
+    symbols = {tx["symbol"] for tx in transactions}
+    return accounts, load_price_matrix(list(symbols), start, end, fallback=transaction_fallback_prices(accounts))
+
+
+def equity_curves_from_db(start: str = None, end: str = None, names: list[str] = None) -> EquityCurves:
+    """accounts 테이블의 계좌를 stock_prices 기준 일별 곡선으로 재구성"""
+    return build_equity_curves(*load_accounts_and_prices(start, end, names))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Rebuild daily equity curves from transactions and stock_prices")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--trader", action="append", help="limit to these accounts (repeatable)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    curves = equity_curves_from_db(args.start, args.end, args.trader)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not len(curves.dates):
+        print("ℹ️  기간 내 거래일이 없습니다")
+    else:
+        print(f"📈 {len(curves.names)}개 계좌 × {len(curves.dates)}거래일 × {len(curves.symbols)}종목 "
+              f"({curves.dates[0]} ~ {curves.dates[-1]}), {elapsed_ms:.1f}ms")
+        for i, name in enumerate(curves.names):
+            final = curves.equity[i, -1]
+            print(f"   {name:<30} 평가액 ${final:>12,.2f}  수익률 {final / INITIAL_BALANCE - 1:>+8.2%}  "
+                  f"현금 ${curves.cash[i, -1]:>12,.2f}")
@@ -0,0 +1,220 @@
+"""
+Human-indicator performance analytics
+계좌별 수익률·변동성·샤프·최대 낙폭·적중률·SPY 대비 초과수익을 일별 평가액과 거래 내역으로 계산해 performance 테이블에 저장
+지표는 증분 갱신 (Welford 평균/분산, 누적 최고점) - 마지막 처리일의 현금·보유 수량을 상태에 저장해 두고
+그 이후의 거래와 가격만 반영하므로 이력이 길어도 리더보드 갱신이 빠름
+
+    uv run -m src.analytics.performance --sort sharpe
+"""
+
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import numpy as np
+
+from src.accounts.accounts import INITIAL_BALANCE, get_backtest_date
+from src.accounts.database import read_all_accounts, read_performance, read_performance_states, write_performance
+from src.analytics.baseline import baseline_return
+from src.analytics.equity import build_equity_curves, load_price_matrix, transaction_fallback_prices
+
+TRADING_DAYS_PER_YEAR = 252
+BENCHMARK_SYMBOL = os.getenv("BENCHMARK_SYMBOL", "SPY").upper()
+
+
+@dataclass
+class PerformanceState:
+    """Running statistics for one account; each new trading day or transaction is O(1)."""
+    last_date: str | None = None
+    days: int = 0
+    last_equity: float = INITIAL_BALANCE
+    peak: float = INITIAL_BALANCE
+    max_drawdown: float = 0.0
+    mean: float = 0.0                   # 일별 수익률 평균 (Welford)
+    m2: float = 0.0                     # 편차 제곱합 (Welford)
+    first_date: str | None = None
+    benchmark_return: float | None = None   # 첫 거래일에 벤치마크를 사서 보유했을 때 (baselines 테이블)
+    tx_count: int = 0                   # 반영한 거래 수 (계좌 거래 내역 앞부분)
+    closed_trades: int = 0
+    winning_trades: int = 0
+    lots: dict = field(default_factory=dict)   # 종목 → [수량, 평균 단가]
+    cash: float | None = None           # last_date 종가 기준 현금 (None: 이전 형식 상태 → 처음부터 다시)
+    holdings: dict = field(default_factory=dict)   # last_date 기준 종목 → 수량
+    marks: dict = field(default_factory=dict)      # last_date 평가에 쓴 종목별 가격 (이후 가격이 없을 때 사용)
+
+    def add_day(self, day: str, equity: float) -> None:
+        daily_return = equity / self.last_equity - 1 if self.last_equity else 0.0
+        self.days += 1
+        delta = daily_return - self.mean
+        self.mean += delta / self.days
+        self.m2 += delta * (daily_return - self.mean)
+        self.peak = max(self.peak, equity)
+        if self.peak > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak - equity) / self.peak)
+        self.last_equity = equity
+        self.last_date = day
+        self.first_date = self.first_date or day
+
+    def add_transactions(self, transactions: list[dict]) -> None:
+        """매도마다 평균 단가 대비 이익이면 적중 (체결가 기준, 수수료 제외)"""
+        for tx in transactions:
+            symbol, quantity, price = tx["symbol"].upper(), tx["quantity"], tx["price"]
+            held, cost = self.lots.get(symbol, (0, 0.0))
+            if quantity > 0:
+                self.lots[symbol] = [held + quantity, (held * cost + quantity * price) / (held + quantity)]
+            elif held > 0:
+                self.closed_trades += 1
+                self.winning_trades += price > cost
+                remaining = held + quantity
+                if remaining > 0:
+                    self.lots[symbol] = [remaining, cost]
+                else:
+                    self.lots.pop(symbol, None)
+        self.tx_count += len(transactions)
+
+    def metrics(self, initial_balance: float = INITIAL_BALANCE) -> dict:
+        std = math.sqrt(self.m2 / (self.days - 1)) if self.days > 1 else 0.0
+        total_return = self.last_equity / initial_balance - 1
+        return {
+            "equity": round(self.last_equity, 2),
+            "total_return": round(total_return, 6),
+            "volatility": round(std * math.sqrt(TRADING_DAYS_PER_YEAR), 6),
+            "sharpe": round(self.mean / std * math.sqrt(TRADING_DAYS_PER_YEAR), 4) if std > 0 else None,
+            "max_drawdown": round(self.max_drawdown, 6),
+            "hit_rate": round(self.winning_trades / self.closed_trades, 4) if self.closed_trades else None,
+            "excess_return": (round(total_return - self.benchmark_return, 6)
+                              if self.benchmark_return is not None else None),
+        }
+
+
+def _new_state(initial_balance: float) -> PerformanceState:
+    return PerformanceState(last_equity=initial_balance, peak=initial_balance, cash=initial_balance)
+
+
+def refresh_performance(end: str = None, names: list[str] = None,
+                        initial_balance: float = INITIAL_BALANCE) -> list[dict]:
+    """Fold the trading days after each account's last_date into its stored metrics.
+
+    The state keeps cash and holdings as of last_date, so only the transactions recorded since
+    then and the price rows after last_date are replayed (one price matrix shared by all
+    accounts). The excess return is measured against a buy-and-hold of BENCHMARK_SYMBOL from the
+    account's first day, shared by every account with that first day. A day already folded in
+    is not revisited, so run it once the day's trading is done; a day whose equity is not finite
+    (missing price) is not folded in, and neither are the days after it, so a later refresh
+    retries them. An account whose transaction log shrank (reset) starts over.
+    """
+    end = end or (get_backtest_date() or datetime.now().strftime("%Y-%m-%d")).split(" ")[0]
+    accounts = read_all_accounts()
+    if names:
+        wanted = {name.lower() for name in names}
+        accounts = {name: fields for name, fields in accounts.items() if name in wanted}
+    stored = read_performance_states()
+
+    states, first_day, new_transactions = {}, {}, {}
+    for name, fields in accounts.items():
+        transactions = fields.get("transactions", [])
+        state = PerformanceState(**stored[name]) if name in stored else None
+        if state is None or state.cash is None or len(transactions) < state.tx_count:
+            state = _new_state(initial_balance)
+        states[name] = state
+        # 거래 내역은 시간순 - 아직 반영하지 않은 것 중 end까지
+        new_transactions[name] = [tx for tx in transactions[state.tx_count:] if tx["timestamp"][:10] <= end]
+        if state.last_date:
+            first_day[name] = str(np.datetime64(state.last_date, "D") + np.timedelta64(1, "D"))
+        else:
+            first_day[name] = min((tx["timestamp"][:10] for tx in new_transactions[name]), default=end)
+    pending = [name for name in accounts if first_day[name] <= end]
+    if not pending:
+        return []
+
+    # 마지막 처리일의 보유 종목 + 새 거래 종목만 (end 이후 거래 종목은 기간 내 가격이 없어 넣지 않음)
+    pending_accounts = {name: {"transactions": new_transactions[name]} for name in pending}
+    opening = {name: (states[name].cash, states[name].holdings) for name in pending}
+    symbols = {symbol for name in pending for symbol in states[name].holdings}
+    symbols |= {tx["symbol"] for name in pending for tx in new_transactions[name]}
+    fallback = transaction_fallback_prices(pending_accounts)
+    fallback += [(symbol, states[name].last_date, price) for name in pending if states[name].last_date
+                 for symbol, price in states[name].marks.items()]
+    start = min(first_day[name] for name in pending)
+    prices = load_price_matrix(list(symbols), start, end, fallback=fallback)
+    curves = build_equity_curves(pending_accounts, prices, initial_balance, opening=opening)
+    days = [str(day) for day in prices.dates]
+    benchmark_returns = {}
+
+    rows = []
+    for i, name in enumerate(pending):
+        state = states[name]
+        start_row = int(np.searchsorted(prices.dates, np.datetime64(first_day[name], "D")))
+        last_row = None
+        for row in range(start_row, len(days)):
+            equity = float(curves.equity[i, row])
+            if not math.isfinite(equity):
+                # NaN이 한 번 들어가면 Welford 상태가 영구히 망가짐 → 이 날부터는 다음 갱신 때 다시 시도
+                print(f"⚠️ {name} {days[row]} 평가액을 계산할 수 없어 지표 갱신을 멈춤 (가격 누락)")
+                break
+            state.add_day(days[row], equity)
+            last_row = row
+        if last_row is None:
+            continue
+
+        # 처리한 마지막 거래일 행에 들어간 거래까지만 반영한 것으로 기록 (현금·보유 수량과 tx_count가 어긋나지 않도록)
+        cutoff = days[last_row + 1] if last_row + 1 < len(days) else None
+        applied = [tx for tx in new_transactions[name] if cutoff is None or tx["timestamp"][:10] < cutoff]
+        state.add_transactions(applied)
+        state.cash = float(curves.cash[i, last_row])
+        state.holdings = {symbol: float(curves.holdings[i, last_row, column])
+                          for column, symbol in enumerate(prices.symbols) if curves.holdings[i, last_row, column]}
+        state.marks = {symbol: float(prices.close[last_row, prices.column(symbol)]) for symbol in state.holdings}
+
+        window = (state.first_date, state.last_date)
+        if window not in benchmark_returns:
+            benchmark_returns[window] = baseline_return(BENCHMARK_SYMBOL, *window, initial_balance=initial_balance)
+        state.benchmark_return = benchmark_returns[window]
+        rows.append({"name": name, "last_date": state.last_date, "state": asdict(state),
+                     **state.metrics(initial_balance)})
+    if rows:
+        write_performance(rows)
+    return rows
+
+
+def leaderboard(order_by: str = "total_return", limit: int = None) -> list[dict]:
+    """저장된 지표 기준 전체 트레이더 순위 (단일 쿼리)"""
+    return read_performance(order_by, limit)
+
+
+def print_leaderboard(order_by: str = "total_return", limit: int = None) -> None:
+    rows = leaderboard(order_by, limit)
+    if not rows:
+        print("ℹ️  성과 지표가 없습니다 (refresh_performance를 먼저 실행하세요)")
+        return
+
+    def percent(value):
+        return f"{value:>+8.2%}" if value is not None else f"{'-':>8}"
+
+    print(f"🏆 리더보드 ({order_by} 기준, 벤치마크 {BENCHMARK_SYMBOL})")
+    for rank, row in enumerate(rows, 1):
+        sharpe = f"{row['sharpe']:>6.2f}" if row["sharpe"] is not None else f"{'-':>6}"
+        hit_rate = f"{row['hit_rate']:>6.1%}" if row["hit_rate"] is not None else f"{'-':>6}"
+        print(f"   {rank:>3}. {row['name']:<30} 평가액 ${row['equity']:>12,.2f}  수익률 {percent(row['total_return'])}  "
+              f"초과 {percent(row['excess_return'])}  변동성 {row['volatility']:>7.2%}  샤프 {sharpe}  "
+              f"MDD {row['max_drawdown']:>7.2%}  적중률 {hit_rate}  ({row['last_date']})")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Refresh per-account performance metrics and print the leaderboard")
+    parser.add_argument("--end", help="last trading day to fold in (default: backtest date or today)")
+    parser.add_argument("--trader", action="append", help="limit the refresh to these accounts (repeatable)")
+    parser.add_argument("--sort", default="total_return",
+                        help="total_return | excess_return | sharpe | volatility | max_drawdown | hit_rate | equity")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--no-refresh", action="store_true", help="only print the stored leaderboard")
+    args = parser.parse_args()
+
+    if not args.no_refresh:
+        started = time.perf_counter()
+        updated = refresh_performance(args.end, args.trader)
+        print(f"📊 {len(updated)}개 계좌 지표 갱신, {(time.perf_counter() - started) * 1000:.1f}ms")
+    print_leaderboard(args.sort, args.limit)
@@ -0,0 +1,184 @@
+"""
+Signal-to-portfolio replay
+signals 테이블의 유튜버 신호를 정해진 규칙(가중 방식·진입 지연·보유 기간)으로 포트폴리오로 바꿔
+LLM 없이 "이 유튜버를 따라 했다면"의 여러 변형을 한 번에 평가
+
+    uv run -m src.analytics.signals --weights equal,conviction --delays 0,1,3 --holds 0,5,20
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from src.accounts.accounts import INITIAL_BALANCE, SPREAD, TRADING_FEE_RATE, get_backtest_date
+from src.analytics.equity import PriceMatrix, _day_index, load_price_matrix
+from src.trading.database import get_signals
+
+CONVICTION_WEIGHTS = {"high": 3.0, "medium": 2.0, "low": 1.0}
+WEIGHTINGS = ("equal", "conviction")
+
+
+@dataclass
+class SignalRules:
+    """How a stream of BUY/SELL signals becomes positions.
+
+    Each BUY opens a position at the close entry_delay trading days after the signal date. It is
+    held for holding_days trading days (None: until the end), or until the first later SELL for
+    that ticker (also delayed) when exit_on_sell is set. Every day the portfolio is fully invested
+    across the open positions (equal or conviction weights) and in cash when there are none.
+    Rebalancing costs (spread + fee) are charged on turnover.
+    """
+    weighting: str = "equal"
+    entry_delay: int = 0
+    holding_days: int | None = None
+    exit_on_sell: bool = True
+    spread: float = SPREAD
+    fee_rate: float = TRADING_FEE_RATE
+
+    def label(self) -> str:
+        hold = f"hold{self.holding_days}" if self.holding_days else "hold-open"
+        return f"{self.weighting}/delay{self.entry_delay}/{hold}" + ("" if self.exit_on_sell else "/ignore-sells")
+
+
+def rule_grid(weightings: list[str], delays: list[int], holds: list[int | None], exit_on_sell: bool = True) -> list[SignalRules]:
+    """Every weighting × delay × holding-period combination."""
+    unknown = set(weightings) - set(WEIGHTINGS)
+    if unknown:
+        raise ValueError(f"Unknown weighting(s): {', '.join(sorted(unknown))} (choose from {', '.join(WEIGHTINGS)})")
+    return [SignalRules(weighting, delay, hold or None, exit_on_sell)
+            for weighting, delay, hold in itertools.product(weightings, delays, holds)]
+
+
+def dedupe_signals(signals: list[dict]) -> list[dict]:
+    """같은 유튜버를 따르는 트레이더가 여럿이면 같은 신호가 중복 저장됨 → (날짜, 종목, 방향)당 확신도가 가장 높은 것만"""
+    best = {}
+    for signal in signals:
+        key = (signal.get("youtuber"), signal["run_date"][:10], signal["ticker"], signal["direction"])
+        weight = CONVICTION_WEIGHTS.get(signal.get("conviction") or "medium", 2.0)
+        if key not in best or weight > best[key][0]:
+            best[key] = (weight, signal)
+    return [signal for _, signal in best.values()]
+
+
+def signal_weights(signals: list[dict], prices: PriceMatrix, rules: SignalRules) -> np.ndarray:
+    """Target weights (dates × symbols) held from each day's close."""
+    days_count, columns = len(prices.dates), {symbol: i for i, symbol in enumerate(prices.symbols)}
+    active = np.zeros((days_count + 1, len(prices.symbols)))
+    buys = [s for s in signals if s["direction"] == "BUY" and s["ticker"] in columns]
+    if not buys or not days_count:
+        return active[:days_count]
+
+    def positions(items):
+        rows = _day_index(prices.dates, np.array([s["run_date"][:10] for s in items], dtype="datetime64[D]"))
+        return rows, np.array([columns[s["ticker"]] for s in items])
+
+    signal_row, column = positions(buys)
+    entry = signal_row + rules.entry_delay
+    exit_row = np.minimum(entry + rules.holding_days, days_count) if rules.holding_days else np.full(len(buys), days_count)
+
+    sells = [s for s in signals if s["direction"] == "SELL" and s["ticker"] in columns]
+    if rules.exit_on_sell and sells:
+        # 종목별로 신호일 이후 첫 SELL을 찾기 위해 (종목, 날짜)를 하나의 정렬 키로
+        sell_row, sell_column = positions(sells)
+        stride = days_count + 1
+        sell_keys = np.sort(sell_column * stride + sell_row)
+        next_sell = np.searchsorted(sell_keys, column * stride + signal_row, side="right")
+        found = next_sell < len(sell_keys)
+        candidate = sell_keys[np.minimum(next_sell, len(sell_keys) - 1)]
+        same_ticker = found & (candidate // stride == column)
+        exit_row = np.where(same_ticker, np.minimum(exit_row, candidate % stride + rules.entry_delay), exit_row)
+
+    if rules.weighting == "conviction":
+        weight = np.array([CONVICTION_WEIGHTS.get(s.get("conviction") or "medium", 2.0) for s in buys])
+    else:
+        weight = np.ones(len(buys))
+    valid = (entry < days_count) & (exit_row > entry)
+    np.add.at(active, (entry[valid], column[valid]), weight[valid])
+    np.add.at(active, (np.minimum(exit_row[valid], days_count), column[valid]), -weight[valid])
+    active = np.cumsum(active, axis=0)[:days_count]
+    total = active.sum(axis=1, keepdims=True)
+    return np.divide(active, total, out=np.zeros_like(active), where=total > 1e-12)
+
+
+def replay_signals(signals: list[dict], prices: PriceMatrix, rules: SignalRules,
+                   initial_balance: float = INITIAL_BALANCE) -> dict:
+    """Equity curve and summary for one rule set."""
+    weights = signal_weights(signals, prices, rules)
+    days_count = len(prices.dates)
+    if not days_count:
+        return {"rules": rules.label(), "equity": np.zeros(0), "final_equity": initial_balance, "return": 0.0,
+                "max_drawdown": 0.0, "positions": 0, "exposure": 0.0, "turnover": 0.0}
+
+    close = np.nan_to_num(prices.close)
+    daily_return = np.zeros_like(close)
+    daily_return[1:] = np.divide(close[1:], close[:-1], out=np.ones_like(close[1:]), where=close[:-1] > 0) - 1
+
+    held = np.vstack([np.zeros((1, weights.shape[1])), weights[:-1]])
+    turnover = np.abs(np.diff(weights, axis=0, prepend=0)).sum(axis=1)
+    portfolio_return = (held * daily_return).sum(axis=1) - turnover * (rules.spread + rules.fee_rate)
+    equity = initial_balance * np.cumprod(1 + portfolio_return)
+    peaks = np.maximum.accumulate(equity)
+    return {
+        "rules": rules.label(),
+        "equity": equity,
+        "final_equity": round(float(equity[-1]), 2),
+        "return": round(float(equity[-1] / initial_balance - 1), 6),
+        "max_drawdown": round(float(((peaks - equity) / peaks).max()), 6),
+        "positions": int(np.count_nonzero(np.diff(weights > 0, axis=0, prepend=False) & (weights > 0))),
+        "exposure": round(float((weights.sum(axis=1) > 0).mean()), 4),
+        "turnover": round(float(turnover.sum()), 4),
+    }
+
+
+def score_youtubers(signals: list[dict], variants: list[SignalRules], start: str = None, end: str = None,
+                    initial_balance: float = INITIAL_BALANCE) -> list[dict]:
+    """유튜버 × 규칙 조합별 결과 (가격 행렬은 모든 신호 종목으로 한 번만 만듦)"""
+    signals = dedupe_signals(signals)
+    if not signals:
+        return []
+    start = start or min(s["run_date"][:10] for s in signals)
+    end = end or (get_backtest_date() or datetime.now().strftime("%Y-%m-%d")).split(" ")[0]
+    fallback = [(s["ticker"], s["run_date"][:10], s["price"]) for s in signals if s.get("price")]
+    prices = load_price_matrix([s["ticker"] for s in signals], start, end, fallback=fallback)
+
+    rows = []
+    for youtuber in sorted({s.get("youtuber") or "" for s in signals}):
+        subset = [s for s in signals if (s.get("youtuber") or "") == youtuber]
+        for rules in variants:
+            result = replay_signals(subset, prices, rules, initial_balance)
+            result.pop("equity")
+            rows.append({"youtuber": youtuber, "signals": len(subset), **result})
+    return rows
+
+
+def _ints(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay stored YouTuber signals under rule variants")
+    parser.add_argument("--youtuber")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--weights", default="equal,conviction")
+    parser.add_argument("--delays", default="0,1")
+    parser.add_argument("--holds", default="0,5,20", help="holding periods in trading days (0: until SELL / end)")
+    parser.add_argument("--ignore-sells", action="store_true", help="do not exit on SELL signals")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    variants = rule_grid([w.strip() for w in args.weights.split(",") if w.strip()], _ints(args.delays),
+                         _ints(args.holds), exit_on_sell=not args.ignore_sells)
+    rows = score_youtubers(get_signals(args.youtuber, args.start, args.end), variants, args.start, args.end)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not rows:
+        print("ℹ️  저장된 신호가 없습니다")
+    else:
+        print(f"📡 {len({row['youtuber'] for row in rows})}명 유튜버 × {len(variants)}개 규칙, {elapsed_ms:.1f}ms")
+        for row in sorted(rows, key=lambda row: (row["youtuber"], -row["return"])):
+            print(f"   {row['youtuber']:<16} {row['rules']:<32} 수익률 {row['return']:>+8.2%}  MDD {row['max_drawdown']:>7.2%}  "
+                  f"포지션 {row['positions']:>4}  투자 비중 {row['exposure']:>6.1%}  신호 {row['signals']}")
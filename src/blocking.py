@@ -0,0 +1,63 @@
+"""
+Blocking work for async MCP tool handlers
+도구 핸들러는 async지만 SQLite·Polygon RESTClient 호출은 동기 방식이라 그대로 부르면
+느린 가격 조회 하나가 서버의 이벤트 루프 전체를 막음 → 제한된 스레드 풀에서 실행
+"""
+
+import asyncio
+import functools
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from src.profiling import PROFILE_STAGES
+
+load_dotenv(override=True)
+
+MCP_BLOCKING_WORKERS = int(os.getenv("MCP_BLOCKING_WORKERS", "8"))
+
+_executor = ThreadPoolExecutor(max_workers=MCP_BLOCKING_WORKERS, thread_name_prefix="mcp-blocking")
+_account_locks: dict[str, asyncio.Lock] = {}
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run a synchronous call in the bounded thread pool and await its result.
+
+    With PROFILE_STAGES on, the call runs inline instead: cProfile only sees the thread that
+    enabled it, and profiling already runs traders one at a time.
+    """
+    if PROFILE_STAGES:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+def account_lock(name: str) -> asyncio.Lock:
+    """Per-account lock: Account.get → 수정 → save가 스레드에서 겹치면 나중 저장이 앞의 변경을 덮어씀"""
+    return _account_locks.setdefault(name.lower(), asyncio.Lock())
+
+
+class _StderrWithProtocolBuffer:
+    """sys.stdout 대신 쓰는 객체: 텍스트 출력(print 등)은 stderr로, .buffer는 원래 stdout
+
+    mcp의 stdio_server는 sys.stdout.buffer를 JSON-RPC 출력으로 감싸므로 프로토콜은 그대로 stdout으로 나감
+    """
+
+    def __init__(self, protocol_buffer):
+        self.buffer = protocol_buffer
+
+    def __getattr__(self, name):
+        return getattr(sys.stderr, name)
+
+
+def run_stdio(server) -> None:
+    """Serve a FastMCP server over stdio with print() redirected to stderr.
+
+    stdout은 JSON-RPC 전용 채널 - 스레드에서 실행되는 도구 코드의 print가 메시지 중간에 끼면
+    클라이언트가 깨진 메시지(잘린 UTF-8 등)를 받음. 서버 실행은 공개 API인 FastMCP.run 사용.
+    """
+    sys.stdout.flush()
+    sys.stdout = _StderrWithProtocolBuffer(sys.stdout.buffer)
+    server.run(transport="stdio")
@@ -2,12 +2,13 @@ from polygon import RESTClient
 from dotenv import load_dotenv
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 # Add parent directory to path for sibling module imports
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
-from accounts.database import write_market, read_market, write_stock_price, read_stock_price
+from accounts.database import write_market, read_market, write_stock_price, read_stock_price, read_stock_prices, write_stock_prices
+from accounts.database import read_price_gaps, write_price_gaps
 from functools import lru_cache
 from datetime import timezone
 
@@ -15,20 +16,29 @@ load_dotenv(override=True)
 
 polygon_api_key = os.getenv("POLYGON_API_KEY")
 polygon_plan = os.getenv("POLYGON_PLAN")
+# 벤치마크 등에서 로컬 가짜 Polygon 서버를 쓰도록 바꿀 수 있음
+polygon_base_url = os.getenv("POLYGON_BASE_URL", "https://api.polygon.io")
+
+# 이 일수보다 오래된 날짜에 일봉이 없으면 휴장일로 봄 (최근 날짜는 아직 게시 전일 수 있음)
+PRICE_SETTLE_DAYS = 3
 
 is_paid_polygon = polygon_plan == "paid"
 is_realtime_polygon = polygon_plan == "realtime"
 
 
+def polygon_client() -> RESTClient:
+    return RESTClient(polygon_api_key, base=polygon_base_url)
+
+
 def is_market_open() -> bool:
-    client = RESTClient(polygon_api_key)
+    client = polygon_client()
     market_status = client.get_market_status()
     return market_status.market == "open"
 
 
 def get_all_share_prices_polygon_eod() -> dict[str, float]:
     """With much thanks to student Reema R. for fixing the timezone issue with this!"""
-    client = RESTClient(polygon_api_key)
+    client = polygon_client()
 
     probe = client.get_previous_close_agg("SPY")[0]
     last_close = datetime.fromtimestamp(probe.timestamp / 1000, tz=timezone.utc).date()
@@ -55,7 +65,7 @@ def get_share_price_polygon_eod(symbol) -> float:
         return cached_price
     
     # 캐시에 없으면 API 호출
-    client = RESTClient(polygon_api_key)
+    client = polygon_client()
     result = client.get_previous_close_agg(symbol)[0]
     price = result.close
     
@@ -66,7 +76,7 @@ def get_share_price_polygon_eod(symbol) -> float:
 
 
 def get_share_price_polygon_min(symbol) -> float:
-    client = RESTClient(polygon_api_key)
+    client = polygon_client()
     result = client.get_snapshot_ticker("stocks", symbol)
     return result.min.close or result.prev_day.close
 
@@ -88,7 +98,7 @@ def get_share_price_for_date(symbol: str, date: str) -> float:
                 return cached_price
                 
             # Polygon API로 특정 날짜 주가 조회
-            client = RESTClient(polygon_api_key)
+            client = polygon_client()
             result = client.get_daily_open_close_agg(symbol, date)
             price = result.close
             
@@ -101,6 +111,43 @@ def get_share_price_for_date(symbol: str, date: str) -> float:
             return 0.0
     return 0.0
 
+def fetch_price_history(symbol: str, start: str, end: str) -> int:
+    """start~end 중 stock_prices에 없는 날짜를 일봉 range 요청 한 번으로 채움 → 새로 저장한 건수
+
+    응답에 일봉이 없는 평일(휴장일 등)은 price_gaps에 기록해 다음 호출에서 다시 조회하지 않음.
+    단, 마지막 일봉 이후이면서 최근 PRICE_SETTLE_DAYS일 안의 날짜는 아직 게시 전일 수 있어 기록하지 않음.
+    """
+    if not polygon_api_key:
+        return 0
+    symbol = symbol.upper()
+    known = {day for _, day, _ in read_stock_prices([symbol], start, end)} | read_price_gaps(symbol, start, end)
+    today = datetime.now().strftime("%Y-%m-%d")
+    missing = [day for day in _weekdays(start, min(end, today)) if day not in known]
+    if not missing:
+        return 0
+    try:
+        client = polygon_client()
+        bars = client.get_aggs(symbol, 1, "day", missing[0], missing[-1], adjusted=True, limit=50000)
+    except Exception as e:
+        print(f"기간 주가 조회 실패 ({symbol}, {missing[0]}~{missing[-1]}): {e}")
+        return 0
+    rows = [(symbol, datetime.fromtimestamp(bar.timestamp / 1000, tz=timezone.utc).strftime("%Y-%m-%d"), bar.close)
+            for bar in bars if bar.close is not None]
+    returned = {day for _, day, _ in rows}
+    rows = [row for row in rows if row[1] not in known]
+    write_stock_prices(rows)
+    settled = max(returned, default="")
+    settled = max(settled, (datetime.now() - timedelta(days=PRICE_SETTLE_DAYS)).strftime("%Y-%m-%d"))
+    write_price_gaps(symbol, [day for day in missing if day not in returned and day < settled])
+    return len(rows)
+
+
+def _weekdays(start: str, end: str) -> list[str]:
+    first, last = datetime.strptime(start, "%Y-%m-%d"), datetime.strptime(end, "%Y-%m-%d")
+    return [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((last - first).days + 1)
+            if (first + timedelta(days=i)).weekday() < 5]
+
+
 def get_share_price(symbol) -> float:
     """현재 주가 조회 (실시간/EOD)"""
     if polygon_api_key:
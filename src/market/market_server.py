@@ -9,19 +9,23 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
 from src.market.market import get_share_price_for_date
+from src.profiling import profiled_tool
+from src.blocking import run_blocking, run_stdio
 
 mcp = FastMCP("market_server")
 
 @mcp.tool()
+@profiled_tool("market_server")
 async def lookup_share_price(symbol: str) -> float:
     """This tool provides the current price of the given stock symbol.
 
     Args:
         symbol: the symbol of the stock
     """
-    return get_share_price(symbol)
+    return await run_blocking(get_share_price, symbol)
 
 @mcp.tool()
+@profiled_tool("market_server")
 async def lookup_historical_share_price(symbol: str, date: str) -> float:
     """This tool provides the historical price of the given stock symbol for a specific date.
     Use this for backtesting when you need stock prices from the past.
@@ -30,7 +34,7 @@ async def lookup_historical_share_price(symbol: str, date: str) -> float:
         symbol: the symbol of the stock (e.g., "NVDA", "AAPL")
         date: the date in YYYY-MM-DD format (e.g., "2024-09-13")
     """
-    return get_share_price_for_date(symbol, date)
+    return await run_blocking(get_share_price_for_date, symbol, date)
 
 if __name__ == "__main__":
-    mcp.run(transport='stdio')
\ No newline at end of file
+    run_stdio(mcp)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Memory-growth monitor for long backtests (MEMORY_MONITOR=1)
+시뮬레이션 하루가 끝날 때마다 RSS(psutil)와 tracemalloc 상위 할당 위치를 기록하고,
+며칠 연속 증가하면 경고 후 memory_report.txt 로 저장
+"""
+
+import gc
+import os
+import tracemalloc
+from datetime import datetime
+from dotenv import load_dotenv
+import psutil
+
+load_dotenv(override=True)
+
+MEMORY_MONITOR = os.getenv("MEMORY_MONITOR", "").strip().lower() in ("1", "true", "yes")
+MEMORY_REPORT_FILE = os.getenv("MEMORY_REPORT_FILE", "memory_report.txt")
+MEMORY_TOP_N = int(os.getenv("MEMORY_TOP_N", "10"))
+# 이 일수만큼 연속으로 RSS가 늘면 누수 의심으로 표시
+MEMORY_GROWTH_DAYS = int(os.getenv("MEMORY_GROWTH_DAYS", "5"))
+# tracemalloc이 저장하는 호출 스택 깊이 (깊을수록 느려짐)
+TRACEMALLOC_FRAMES = 5
+
+MB = 1024 * 1024
+
+
+def rss_bytes(include_children: bool = True) -> tuple[int, int]:
+    """(이 프로세스 RSS, 자식 프로세스(MCP 서버 등) RSS 합계)"""
+    process = psutil.Process()
+    children = 0
+    if include_children:
+        for child in process.children(recursive=True):
+            try:
+                children += child.memory_info().rss
+            except psutil.Error:
+                continue
+    return process.memory_info().rss, children
+
+
+def is_monotonic_growth(values: list, days: int = MEMORY_GROWTH_DAYS) -> bool:
+    """마지막 days+1개 샘플이 계속 증가했는지"""
+    recent = values[-(days + 1):]
+    return len(recent) == days + 1 and all(b > a for a, b in zip(recent, recent[1:]))
+
+
+class MemoryMonitor:
+    """Samples RSS and tracemalloc top allocations once per simulated day.
+
+    Usage:
+        monitor = MemoryMonitor()
+        monitor.start()
+        ...  # each day
+        monitor.sample("2024-09-12")
+        monitor.write_report()
+    """
+
+    def __init__(self, top_n: int = MEMORY_TOP_N, growth_days: int = MEMORY_GROWTH_DAYS):
+        self.top_n = top_n
+        self.growth_days = growth_days
+        self.samples = []
+        self.flagged = []
+        self._baseline = None
+        self._previous = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._baseline = self._snapshot()
+        self._previous = self._baseline
+
+    def _snapshot(self):
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def _top_growth(self, snapshot, reference) -> list[dict]:
+        return [
+            {
+                "location": str(stat.traceback[0]),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "size_kb": round(stat.size / 1024, 1),
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(reference, "lineno")[:self.top_n]
+        ]
+
+    def sample(self, day: str) -> dict:
+        """하루 종료 시점 메모리 기록; 연속 증가면 경고 출력"""
+        if self._baseline is None:
+            self.start()
+        snapshot = self._snapshot()
+        rss, children_rss = rss_bytes()
+        traced, peak = tracemalloc.get_traced_memory()
+        entry = {
+            "day": day,
+            "sampled_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "rss_mb": round(rss / MB, 1),
+            "children_rss_mb": round(children_rss / MB, 1),
+            "traced_mb": round(traced / MB, 1),
+            "peak_traced_mb": round(peak / MB, 1),
+            "gc_objects": len(gc.get_objects()),
+            "top_since_previous": self._top_growth(snapshot, self._previous),
+        }
+        self._previous = snapshot
+        self.samples.append(entry)
+        print(f"🧠 메모리 {day}: RSS {entry['rss_mb']:.1f}MB (MCP 서버 등 자식 {entry['children_rss_mb']:.1f}MB), "
+              f"추적 {entry['traced_mb']:.1f}MB, 객체 {entry['gc_objects']:,}개")
+
+        rss_series = [s["rss_mb"] for s in self.samples]
+        if is_monotonic_growth(rss_series, self.growth_days):
+            growth = rss_series[-1] - rss_series[-(self.growth_days + 1)]
+            self.flagged.append({"day": day, "days": self.growth_days, "growth_mb": round(growth, 1)})
+            print(f"⚠️ 메모리 누수 의심: {self.growth_days}일 연속 RSS 증가 (+{growth:.1f}MB)")
+            for stat in entry["top_since_previous"][:3]:
+                print(f"   · {stat['location']}: {stat['size_diff_kb']:+,.1f}KB ({stat['count_diff']:+,}개)")
+        return entry
+
+    def render_report(self) -> str:
+        lines = ["# Memory report", ""]
+        lines.append(f"{'day':<12}{'rss_mb':>10}{'children_mb':>13}{'traced_mb':>11}{'peak_mb':>10}{'gc_objects':>13}")
+        for s in self.samples:
+            lines.append(f"{s['day']:<12}{s['rss_mb']:>10.1f}{s['children_rss_mb']:>13.1f}{s['traced_mb']:>11.1f}"
+                         f"{s['peak_traced_mb']:>10.1f}{s['gc_objects']:>13,}")
+
+        lines += ["", "## Monotonic growth"]
+        if self.flagged:
+            lines += [f"- {f['day']}: RSS grew {f['days']} days in a row (+{f['growth_mb']}MB)" for f in self.flagged]
+        else:
+            lines.append("- none")
+
+        if self.samples and self._baseline is not None:
+            lines += ["", f"## Top {self.top_n} allocations since start (by size growth)"]
+            for stat in self._top_growth(self._previous, self._baseline):
+                lines.append(f"- {stat['location']}: {stat['size_diff_kb']:+,.1f}KB now {stat['size_kb']:,.1f}KB "
+                             f"({stat['count_diff']:+,} blocks)")
+        for s in self.samples:
+            lines += ["", f"## {s['day']}: top allocations since previous day"]
+            lines += [f"- {stat['location']}: {stat['size_diff_kb']:+,.1f}KB ({stat['count_diff']:+,} blocks)"
+                      for stat in s["top_since_previous"]]
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: str = MEMORY_REPORT_FILE) -> None:
+        if not self.samples:
+            return
+        with open(path, "w") as f:
+            f.write(self.render_report())
+        print(f"🧠 메모리 리포트 저장: {path}" + (f" (증가 경고 {len(self.flagged)}건)" if self.flagged else ""))
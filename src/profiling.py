@@ -0,0 +1,97 @@
+"""
+Opt-in profiling (PROFILE_STAGES=1)
+파이프라인 단계, MCP 서버 기동, MCP 서버 도구 핸들러를 cProfile로 측정해
+profiles/<날짜>/<트레이더>/<단계>.prof 와 상위 N개 함수 요약(.txt)으로 저장
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+PROFILE_STAGES = os.getenv("PROFILE_STAGES", "").strip().lower() in ("1", "true", "yes")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "30"))
+
+# cProfile은 프로세스에서 하나만 켤 수 있음 - 이미 측정 중이면 겹치는 블록은 건너뜀
+_profile_lock = threading.Lock()
+_server_profiles = {}
+
+
+def _safe(part: str) -> str:
+    return re.sub(r'[^0-9A-Za-z가-힣._-]+', '_', str(part)) or "unknown"
+
+
+def _profile_day() -> str:
+    return (os.getenv("BACKTEST_DATE") or datetime.now().strftime("%Y-%m-%d")).split(' ')[0]
+
+
+def write_profile(profiler: cProfile.Profile, path: str) -> None:
+    """Write the raw .prof file and a top-N (cumulative time) text summary next to it."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(f"{path}.prof")
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_N)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(PROFILE_TOP_N)
+    with open(f"{path}.txt", "w") as f:
+        f.write(summary.getvalue())
+
+
+@contextmanager
+def profile_block(trader_name: str, stage: str, day: str = None):
+    """Profile a block (sync or spanning awaits) into profiles/<day>/<trader>/<stage>.
+
+    The profiler sees everything the event loop runs meanwhile, so the scheduler runs traders
+    one at a time while profiling is on.
+    """
+    if not PROFILE_STAGES or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+        path = os.path.join(PROFILE_DIR, _safe(day or _profile_day()), _safe(trader_name), _safe(stage))
+        write_profile(profiler, path)
+        print(f"🔬 프로파일 저장: {path}.prof")
+    finally:
+        _profile_lock.release()
+
+
+def profiled_tool(server_name: str):
+    """Decorator for MCP server tool handlers: accumulates one profile per server process and day."""
+    def decorator(fn):
+        if not PROFILE_STAGES:
+            return fn
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if not _profile_lock.acquire(blocking=False):
+                return await fn(*args, **kwargs)
+            day = _profile_day()
+            profiler = _server_profiles.setdefault((server_name, day), cProfile.Profile())
+            try:
+                profiler.enable()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    profiler.disable()
+                    path = os.path.join(PROFILE_DIR, _safe(day), "servers", f"{_safe(server_name)}_{os.getpid()}")
+                    write_profile(profiler, path)
+            finally:
+                _profile_lock.release()
+
+        return wrapper
+    return decorator
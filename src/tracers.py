@@ -5,12 +5,24 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
-from src.accounts.database import write_log
+from src.accounts.database import write_log, write_trace_spans
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import secrets
 import string
+import threading
 
 ALPHANUM = string.ascii_lowercase + string.digits 
 
+# 스팬 소요 시간 히스토그램 구간(초)과 백분위 계산용 최근 샘플 수
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+PERCENTILE_SAMPLES = 5000
+# trace_spans 테이블에 모아서 쓰는 단위
+SPAN_FLUSH_SIZE = int(os.getenv("TRACE_SPAN_FLUSH_SIZE", "100"))
+# Prometheus 텍스트 형식 지표 파일 (빈 값이면 쓰지 않음)
+TRACE_METRICS_FILE = os.getenv("TRACE_METRICS_FILE", "trace_metrics.prom")
+
 def make_trace_id(tag: str) -> str:
     """
     Return a string of the form 'trace_<tag><random>',
@@ -31,8 +43,47 @@ def make_trace_id(tag: str) -> str:
     random_suffix = ''.join(secrets.choice(ALPHANUM) for _ in range(pad_len))
     return f"trace_{clean_tag}{random_suffix}"
 
+class DurationHistogram:
+    """Cumulative bucket counts (for Prometheus) plus a bounded sample for percentiles."""
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=PERCENTILE_SAMPLES)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
 class LogTracer(TracingProcessor):
 
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending_spans = []
+        self._trace_started = {}
+        # (type, name) → 히스토그램; name이 ""이면 유형 전체
+        self.histograms = defaultdict(DurationHistogram)
+
     def get_name(self, trace_or_span: Trace | Span) -> str | None:
         trace_id = trace_or_span.trace_id
         name = trace_id.split("_")[1]
@@ -41,15 +92,37 @@ class LogTracer(TracingProcessor):
         else:
             return None
 
+    def span_name(self, span) -> str:
+        data = span.span_data
+        if not data:
+            return ""
+        for attribute in ("name", "server", "model"):
+            value = getattr(data, attribute, None)
+            if value:
+                return str(value)
+        return ""
+
     def on_trace_start(self, trace) -> None:
+        self._trace_started[trace.trace_id] = datetime.now(timezone.utc)
         name = self.get_name(trace)
         if name:
             write_log(name, "trace", f"Started: {trace.name}")
 
     def on_trace_end(self, trace) -> None:
+        started = self._trace_started.pop(trace.trace_id, None)
+        ended = datetime.now(timezone.utc)
+        duration = (ended - started).total_seconds() if started else None
         name = self.get_name(trace)
+        if duration is not None:
+            self._observe("trace", "", duration)
+            self._buffer((trace.trace_id, trace.trace_id, None, trace.name, "trace", name,
+                          started.isoformat(), ended.isoformat(), duration, None))
         if name:
-            write_log(name, "trace", f"Ended: {trace.name}")
+            message = f"Ended: {trace.name}"
+            if duration is not None:
+                message += f" ({duration:.2f}s)"
+            write_log(name, "trace", message)
+        self.force_flush()
 
     def on_span_start(self, span) -> None:
         name = self.get_name(span)
@@ -70,6 +143,15 @@ class LogTracer(TracingProcessor):
     def on_span_end(self, span) -> None:
         name = self.get_name(span)
         type = span.span_data.type if span.span_data else "span"
+        started, ended = _parse_time(span.started_at), _parse_time(span.ended_at)
+        duration = (ended - started).total_seconds() if started and ended else None
+
+        if duration is not None:
+            self._observe(type, self.span_name(span) if type in ("function", "mcp_tools", "agent") else "", duration)
+            self._buffer((span.span_id, span.trace_id, span.parent_id or span.trace_id, self.span_name(span), type,
+                          name, span.started_at, span.ended_at, duration,
+                          span.error.get("message") if span.error else None))
+
         if name:
             message = "Ended"
             if span.span_data:
@@ -80,12 +162,110 @@ class LogTracer(TracingProcessor):
                     message += f" {span.span_data.name}"
                 if hasattr(span.span_data, "server") and span.span_data.server:
                     message += f" {span.span_data.server}"
+            if duration is not None:
+                message += f" ({duration:.2f}s)"
             if span.error:
                 message += f" {span.error}"
             write_log(name, type, message)
 
+    def _observe(self, type: str, name: str, duration: float) -> None:
+        with self._lock:
+            self.histograms[(type, "")].observe(duration)
+            if name:
+                self.histograms[(type, name)].observe(duration)
+
+    def _buffer(self, row: tuple) -> None:
+        with self._lock:
+            self._pending_spans.append(row)
+            should_flush = len(self._pending_spans) >= SPAN_FLUSH_SIZE
+        if should_flush:
+            self._flush_spans()
+
+    def _flush_spans(self) -> None:
+        with self._lock:
+            rows, self._pending_spans = self._pending_spans, []
+        if rows:
+            try:
+                write_trace_spans(rows)
+            except Exception as e:
+                print(f"스팬 기록 실패: {e}")
+
+    def percentiles(self) -> dict:
+        """{(type, name): {"count", "p50", "p95", "p99"}} - name이 ""이면 유형 전체"""
+        with self._lock:
+            return {
+                key: {"count": h.count, "p50": h.percentile(0.5), "p95": h.percentile(0.95), "p99": h.percentile(0.99)}
+                for key, h in self.histograms.items()
+            }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format: duration histogram + p50/p95/p99 gauges."""
+        lines = [
+            "# HELP agent_span_duration_seconds Duration of agent trace spans",
+            "# TYPE agent_span_duration_seconds histogram",
+        ]
+        quantile_lines = [
+            "# HELP agent_span_duration_quantile_seconds Recent span duration percentiles",
+            "# TYPE agent_span_duration_quantile_seconds gauge",
+        ]
+        with self._lock:
+            for (type, name), h in sorted(self.histograms.items()):
+                labels = f'type="{_label(type)}",name="{_label(name)}"'
+                for bound, count in zip(DURATION_BUCKETS, h.bucket_counts):
+                    lines.append(f'agent_span_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'agent_span_duration_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"agent_span_duration_seconds_sum{{{labels}}} {h.total:.6f}")
+                lines.append(f"agent_span_duration_seconds_count{{{labels}}} {h.count}")
+                for q in (0.5, 0.95, 0.99):
+                    quantile_lines.append(
+                        f'agent_span_duration_quantile_seconds{{{labels},quantile="{q}"}} {h.percentile(q):.6f}'
+                    )
+        return "\n".join(lines + quantile_lines) + "\n"
+
+    def export_prometheus(self, path: str = None) -> None:
+        path = path if path is not None else TRACE_METRICS_FILE
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def serve_metrics(self, port: int) -> ThreadingHTTPServer:
+        """Serve render_prometheus() at http://localhost:<port>/metrics from a daemon thread."""
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = tracer.render_prometheus().encode()
+                self.send_response(200 if self.path.startswith("/metrics") else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def print_summary(self) -> None:
+        """스팬 유형별/도구별 p50·p95·p99 출력"""
+        stats = self.percentiles()
+        if not stats:
+            return
+        print(f"\n⏱️ 스팬 소요 시간 (p50 / p95 / p99):")
+        for (type, name), s in sorted(stats.items(), key=lambda item: -item[1]["p95"])[:20]:
+            print(f"   - {type}{' ' + name if name else ''}: {s['count']}회, "
+                  f"{s['p50']:.2f}s / {s['p95']:.2f}s / {s['p99']:.2f}s")
+
     def force_flush(self) -> None:
-        pass
+        self._flush_spans()
+        try:
+            self.export_prometheus()
+        except Exception as e:
+            print(f"지표 파일 저장 실패: {e}")
 
     def shutdown(self) -> None:
-        pass
\ No newline at end of file
+        self.force_flush()
@@ -0,0 +1,23 @@
+from agents import Tool, function_tool
+
+
+def get_mentions_tool(channel_handle: str = "", reference_date: str = None) -> Tool:
+    """Create an in-process tool that queries the precomputed ticker-mention index."""
+    from src.youtube.database import query_ticker_mentions
+
+    @function_tool
+    def get_ticker_mentions(tickers: list[str], published_after: str, published_before: str) -> list[dict]:
+        """Return where the YouTuber mentioned the given tickers (video, timestamp, surrounding text).
+        Use this instead of asking for full transcripts.
+
+        Args:
+            tickers: US tickers to look up, e.g. ["NVDA", "TSLA"]; empty list for all tickers.
+            published_after: Inclusive start date, e.g. "2024-09-07".
+            published_before: Exclusive end date, e.g. "2024-09-12".
+        """
+        # 백테스트 중에는 기준일 이후 영상을 절대 반환하지 않음
+        if reference_date and (not published_before or published_before > reference_date):
+            published_before = reference_date
+        return query_ticker_mentions(published_after, published_before, channel_handle, tickers)
+
+    return get_ticker_mentions
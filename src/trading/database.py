@@ -1,10 +1,12 @@
+import os
 import sqlite3
+import json
 from datetime import datetime
 
-DB_PATH = "accounts.db"
+DB_PATH = os.getenv("ACCOUNTS_DB", "accounts.db")
 
-def get_analyzed_videos_for_trader(trader_name: str) -> list:
-    """특정 트레이더가 분석한 영상 목록 조회"""
+def get_analyzed_videos_for_trader(trader_name: str, limit: int = None) -> list:
+    """특정 트레이더가 분석한 영상 목록 조회 (limit 지정 시 최근 N개만)"""
     try:
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
@@ -14,7 +16,8 @@ def get_analyzed_videos_for_trader(trader_name: str) -> list:
             FROM analyzed_videos
             WHERE trader_name = ?
             ORDER BY created_at DESC
-        """, (trader_name,))
+            LIMIT ?
+        """, (trader_name, limit if limit is not None else -1))
         
         results = cursor.fetchall()
         conn.close()
@@ -33,12 +36,15 @@ def save_analyzed_videos(trader_name: str, video_info: list, analyzed_date: str)
         for video in video_info:
             video_id = video.get('id', 'unknown')
             video_title = video.get('title', 'Unknown Title')
+            published = video.get('published') or 'Unknown Date'
+            us_market_relevant = bool(video.get('us_market_relevant'))
+            transcript_analyzed = bool(video.get('transcript_analyzed'))
             
             cursor.execute("""
                 INSERT OR REPLACE INTO analyzed_videos
                 (video_id, trader_name, title, channel_name, publication_date, analysis_date, us_market_relevant, transcript_analyzed)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (video_id, trader_name, video_title, 'Unknown Channel', 'Unknown Date', analyzed_date, False, False))
+            """, (video_id, trader_name, video_title, 'Unknown Channel', published, analyzed_date, us_market_relevant, transcript_analyzed))
         
         conn.commit()
         conn.close()
@@ -62,4 +68,243 @@ def clear_analyzed_videos(trader_name: str = None):
         conn.commit()
         conn.close()
     except Exception as e:
-        print(f"영상 분석 기록 초기화 실패: {e}")
\ No newline at end of file
+        print(f"영상 분석 기록 초기화 실패: {e}")
+
+def get_cached_research(youtuber: str, window_start: str, window_end: str, prompt_version: str) -> str | None:
+    """캐시된 Researcher 결과 조회 (유튜버 + 분석 기간 + 프롬프트 버전 기준)"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT insights
+            FROM research_cache
+            WHERE youtuber = ? AND window_start = ? AND window_end = ? AND prompt_version = ?
+        """, (youtuber, window_start, window_end, prompt_version))
+
+        row = cursor.fetchone()
+        conn.close()
+
+        return row[0] if row else None
+    except Exception as e:
+        print(f"리서치 캐시 조회 실패: {e}")
+        return None
+
+def save_cached_research(youtuber: str, window_start: str, window_end: str, prompt_version: str, insights: str):
+    """Researcher 결과를 캐시에 저장"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO research_cache
+            (youtuber, window_start, window_end, prompt_version, insights, created_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (youtuber, window_start, window_end, prompt_version, insights))
+
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        print(f"리서치 캐시 저장 실패: {e}")
+
+def clear_research_cache(youtuber: str = None, prompt_version: str = None) -> int:
+    """리서치 캐시 무효화 (유튜버/프롬프트 버전 지정 가능, 미지정 시 전체)"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        conditions = []
+        params = []
+        if youtuber:
+            conditions.append("youtuber = ?")
+            params.append(youtuber)
+        if prompt_version:
+            conditions.append("prompt_version = ?")
+            params.append(prompt_version)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor.execute(f"DELETE FROM research_cache{where}", params)
+        deleted = cursor.rowcount
+
+        conn.commit()
+        conn.close()
+        print(f"✅ 리서치 캐시 {deleted}건 삭제")
+        return deleted
+    except Exception as e:
+        print(f"리서치 캐시 초기화 실패: {e}")
+        return 0
+
+
+def record_stage_run(trader_name: str, run_date: str, stage: str, status: str, reason: str = ""):
+    """파이프라인 단계 실행 결과 기록 (ran / skipped / downgraded)"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO pipeline_stage_runs (trader_name, run_date, stage, status, reason)
+            VALUES (?, ?, ?, ?, ?)
+        """, (trader_name, run_date, stage, status, reason))
+
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        print(f"단계 실행 기록 저장 실패: {e}")
+
+def get_stage_status_counts(trader_name: str = None, start_date: str = None, end_date: str = None) -> dict:
+    """단계별 실행/생략 횟수 조회: {(stage, status): count}"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        conditions = []
+        params = []
+        if trader_name:
+            conditions.append("trader_name = ?")
+            params.append(trader_name)
+        if start_date:
+            conditions.append("run_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("run_date <= ?")
+            params.append(end_date)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor.execute(f"""
+            SELECT stage, status, COUNT(*)
+            FROM pipeline_stage_runs{where}
+            GROUP BY stage, status
+            ORDER BY stage, status
+        """, params)
+
+        results = cursor.fetchall()
+        conn.close()
+
+        return {(stage, status): count for stage, status, count in results}
+    except Exception as e:
+        print(f"단계 실행 기록 조회 실패: {e}")
+        return {}
+
+def record_stage_metrics(trader_name: str, run_date: str, stage: str, metrics: dict):
+    """단계별 소요 시간/토큰/도구 호출 지표 저장"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO stage_metrics (trader_name, run_date, stage, wall_seconds, model_seconds, turns,
+                                       input_tokens, output_tokens, cached_tokens, tool_calls)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (trader_name, run_date, stage, metrics["wall_seconds"], metrics["model_seconds"], metrics["turns"],
+              metrics["input_tokens"], metrics["output_tokens"], metrics["cached_tokens"],
+              json.dumps(metrics["tool_calls"])))
+
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        print(f"단계 지표 저장 실패: {e}")
+
+def get_stage_metrics_summary(start_date: str = None, end_date: str = None) -> list:
+    """기간 내 단계별 지표 합계/평균과 도구별 호출 수·소요 시간"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        conditions = []
+        params = []
+        if start_date:
+            conditions.append("run_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("run_date <= ?")
+            params.append(end_date)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor.execute(f"""
+            SELECT stage, wall_seconds, model_seconds, turns, input_tokens, output_tokens, cached_tokens, tool_calls
+            FROM stage_metrics{where}
+            ORDER BY id
+        """, params)
+        rows = cursor.fetchall()
+        conn.close()
+    except Exception as e:
+        print(f"단계 지표 조회 실패: {e}")
+        return []
+
+    summary = {}
+    for stage, wall, model, turns, input_tokens, output_tokens, cached_tokens, tool_calls in rows:
+        entry = summary.setdefault(stage, {
+            "stage": stage, "runs": 0, "wall_seconds": 0.0, "model_seconds": 0.0, "turns": 0,
+            "input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "tool_calls": {},
+        })
+        entry["runs"] += 1
+        entry["wall_seconds"] += wall or 0
+        entry["model_seconds"] += model or 0
+        entry["turns"] += turns or 0
+        entry["input_tokens"] += input_tokens or 0
+        entry["output_tokens"] += output_tokens or 0
+        entry["cached_tokens"] += cached_tokens or 0
+        for tool, stats in json.loads(tool_calls or "{}").items():
+            tool_entry = entry["tool_calls"].setdefault(tool, {"count": 0, "seconds": 0.0})
+            tool_entry["count"] += stats["count"]
+            tool_entry["seconds"] += stats["seconds"]
+    return list(summary.values())
+
+
+def save_signals(trader_name: str, youtuber: str, run_date: str, reference_date: str, signals: list[dict],
+                 prompt_version: str = ""):
+    """Analyst가 낸 구조화 신호 저장 (같은 트레이더·날짜·종목·방향이면 덮어씀)"""
+    if not signals:
+        return
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.executemany("""
+            INSERT OR REPLACE INTO signals
+            (trader_name, youtuber, run_date, reference_date, ticker, direction, conviction, video_id,
+             video_published, price, position_pct, source, prompt_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(trader_name, youtuber, run_date, reference_date, signal["ticker"], signal["direction"],
+               signal.get("conviction"), signal.get("video_id"), signal.get("video_published"),
+               signal.get("price"), signal.get("position_pct"), signal.get("source"), prompt_version)
+              for signal in signals])
+
+        conn.commit()
+        conn.close()
+        print(f"✅ 신호 {len(signals)}건 저장")
+    except Exception as e:
+        print(f"신호 저장 실패: {e}")
+
+def get_signals(youtuber: str = None, start_date: str = None, end_date: str = None) -> list[dict]:
+    """저장된 신호 조회 (유튜버·기간 필터, 날짜순)"""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        conditions = []
+        params = []
+        if youtuber:
+            conditions.append("youtuber = ?")
+            params.append(youtuber)
+        if start_date:
+            conditions.append("run_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("run_date <= ?")
+            params.append(end_date)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor.execute(f"""
+            SELECT trader_name, youtuber, run_date, reference_date, ticker, direction, conviction, video_id,
+                   video_published, price, position_pct, source
+            FROM signals{where}
+            ORDER BY run_date, id
+        """, params)
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return rows
+    except Exception as e:
+        print(f"신호 조회 실패: {e}")
+        return []
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import time
+from pydantic import BaseModel
+from agents import Agent, Runner
+
+from config.templates import video_digest_instructions, DIGEST_PROMPT_VERSION
+from .models import get_model
+
+# 영상별 요약을 동시에 몇 개까지 돌릴지, 하루에 최대 몇 개 영상을 요약할지
+DIGEST_CONCURRENCY = int(os.getenv("DIGEST_CONCURRENCY", "4"))
+DIGEST_MAX_VIDEOS = int(os.getenv("DIGEST_MAX_VIDEOS", "10"))
+# 요약에 넘길 자막 최대 길이 (문자 수)
+DIGEST_MAX_TRANSCRIPT_CHARS = int(os.getenv("DIGEST_MAX_TRANSCRIPT_CHARS", "60000"))
+DIGEST_MAX_TURNS = 3
+
+
+class VideoDigest(BaseModel):
+    """Compact per-video summary handed to the researcher instead of the full transcript."""
+    us_market_relevant: bool
+    tickers: list[str]
+    themes: list[str]
+    key_quotes: list[str]
+    youtuber_stance: str
+    summary: str
+
+
+def get_digest_agent(model_name: str) -> Agent:
+    return Agent(
+        name="VideoDigest",
+        instructions=video_digest_instructions(),
+        model=get_model(model_name),
+        output_type=VideoDigest,
+    )
+
+
+async def digest_video(video: dict, model_name: str, semaphore: asyncio.Semaphore) -> dict | None:
+    """Summarize one video's transcript, reusing a stored digest when available."""
+    from src.youtube.database import read_video_digest, write_video_digest
+    from src.youtube.youtube_client import get_video_enhanced_transcripts
+
+    video_id = video["video_id"]
+    cached = read_video_digest(video_id, DIGEST_PROMPT_VERSION, model_name)
+    if cached:
+        return cached
+
+    async with semaphore:
+        # 업스트림 오류 메시지를 자막으로 요약하지 않도록 실패한 영상은 건너뜀
+        transcript = (await get_video_enhanced_transcripts([video_id], skip_errors=True)).get(video_id, "")
+        if not transcript.strip():
+            print(f"⚠️ 자막을 가져오지 못해 요약 건너뜀 ({video_id})")
+            return None
+        message = f"""Video ID: {video_id}
+Title: {video.get("title")}
+Published: {video.get("published_at")}
+
+TRANSCRIPT:
+{transcript[:DIGEST_MAX_TRANSCRIPT_CHARS]}"""
+        try:
+            result = await Runner.run(get_digest_agent(model_name), message, max_turns=DIGEST_MAX_TURNS)
+        except Exception as e:
+            print(f"❌ 영상 요약 실패 ({video_id}): {e}")
+            return None
+
+    digest = {
+        "video_id": video_id,
+        "title": video.get("title"),
+        "published_at": video.get("published_at"),
+        **result.final_output.model_dump(),
+    }
+    write_video_digest(video_id, DIGEST_PROMPT_VERSION, model_name, digest)
+    return digest
+
+
+async def build_video_digests(channel_handle: str, window: tuple, trader_name: str, model_name: str,
+                              run_date: str = None) -> list[dict]:
+    """Fetch the window's new uploads once and digest them in parallel (bounded by DIGEST_CONCURRENCY)."""
+    from src.accounts.database import filter_unanalyzed_videos
+    from src.youtube.youtube_client import list_channel_videos
+
+    videos = await list_channel_videos(channel_handle, *window)
+    new_ids = set(filter_unanalyzed_videos([video["video_id"] for video in videos], trader_name, analyzed_before=run_date))
+    candidates = [video for video in videos if video["video_id"] in new_ids][:DIGEST_MAX_VIDEOS]
+    if not candidates:
+        return []
+
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(DIGEST_CONCURRENCY)
+    results = await asyncio.gather(*[digest_video(video, model_name, semaphore) for video in candidates],
+                                   return_exceptions=True)
+    digests = []
+    for video, result in zip(candidates, results):
+        if isinstance(result, BaseException):
+            print(f"❌ 영상 요약 실패 ({video['video_id']}): {result}")
+        elif result:
+            digests.append(result)
+    print(f"🧾 영상 요약: {len(digests)}/{len(candidates)}개 ({time.monotonic() - started:.1f}초, 동시 {DIGEST_CONCURRENCY})")
+    return digests
@@ -0,0 +1,135 @@
+import contextvars
+import time
+from datetime import datetime
+from agents import TracingProcessor, add_trace_processor
+
+# 지금 실행 중인 파이프라인 단계 (도구 호출 태스크에도 그대로 전파됨)
+_current_stage = contextvars.ContextVar("current_stage", default=None)
+_processor_registered = False
+
+MODEL_SPAN_TYPES = ("response", "generation")
+
+
+def span_seconds(span) -> float:
+    if not span.started_at or not span.ended_at:
+        return 0.0
+    return (datetime.fromisoformat(span.ended_at) - datetime.fromisoformat(span.started_at)).total_seconds()
+
+
+class StageMetricsProcessor(TracingProcessor):
+    """Attributes finished model/tool spans to the pipeline stage running in the current context."""
+
+    def on_trace_start(self, trace) -> None:
+        pass
+
+    def on_trace_end(self, trace) -> None:
+        pass
+
+    def on_span_start(self, span) -> None:
+        pass
+
+    def on_span_end(self, span) -> None:
+        stage_run = _current_stage.get()
+        if stage_run is not None and span.span_data:
+            stage_run.add_span(span)
+
+    def force_flush(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+def usage_from_result(result) -> dict:
+    """Sum token usage over every model response of a Runner.run result."""
+    usage = {"requests": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0}
+    for response in getattr(result, "raw_responses", None) or []:
+        usage["requests"] += response.usage.requests or 0
+        usage["input_tokens"] += response.usage.input_tokens or 0
+        usage["output_tokens"] += response.usage.output_tokens or 0
+        details = response.usage.input_tokens_details
+        usage["cached_tokens"] += (details.cached_tokens if details else 0) or 0
+    return usage
+
+
+def cached_ratio(usage: dict) -> float:
+    return usage["cached_tokens"] / usage["input_tokens"] if usage["input_tokens"] else 0.0
+
+
+class StageRun:
+    """Measure one pipeline stage: wall time, model latency, tokens, turns and per-tool calls.
+
+    Usage:
+        with StageRun(trader_name, "analyst", run_date) as stage_run:
+            result = await Runner.run(...)
+        stage_run.finish(result, prompt_version)
+    """
+
+    def __init__(self, trader_name: str, stage: str, run_date: str):
+        global _processor_registered
+        if not _processor_registered:
+            add_trace_processor(StageMetricsProcessor())
+            _processor_registered = True
+        self.trader_name = trader_name
+        self.stage = stage
+        self.run_date = run_date
+        self.model_seconds = 0.0
+        self.tool_calls = {}
+        self.wall_seconds = 0.0
+
+    def __enter__(self):
+        self._token = _current_stage.set(self)
+        self._started = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall_seconds = time.monotonic() - self._started
+        _current_stage.reset(self._token)
+        return False
+
+    def add_span(self, span) -> None:
+        span_type = span.span_data.type
+        if span_type in MODEL_SPAN_TYPES:
+            self.model_seconds += span_seconds(span)
+        elif span_type == "function":
+            stats = self.tool_calls.setdefault(span.span_data.name, {"count": 0, "seconds": 0.0})
+            stats["count"] += 1
+            stats["seconds"] += span_seconds(span)
+
+    def finish(self, result, prompt_version: str = "") -> dict:
+        """Log the stage's usage and cached-token ratio and store the metrics row."""
+        from .database import record_stage_metrics
+
+        usage = usage_from_result(result)
+        metrics = {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "model_seconds": round(self.model_seconds, 3),
+            "turns": len(getattr(result, "raw_responses", None) or []),
+            "input_tokens": usage["input_tokens"],
+            "output_tokens": usage["output_tokens"],
+            "cached_tokens": usage["cached_tokens"],
+            "tool_calls": self.tool_calls,
+        }
+        print(f"💾 {self.trader_name} {self.stage} ({prompt_version}) {metrics['wall_seconds']:.1f}초 "
+              f"(모델 {metrics['model_seconds']:.1f}초, {metrics['turns']}턴, 도구 {sum(t['count'] for t in self.tool_calls.values())}회) "
+              f"토큰: 입력 {usage['input_tokens']:,} (캐시 {cached_ratio(usage):.0%}), 출력 {usage['output_tokens']:,}")
+        record_stage_metrics(self.trader_name, self.run_date, self.stage, metrics)
+        return metrics
+
+
+def print_stage_metrics_summary(start_date: str = None, end_date: str = None):
+    """기간 내 단계별 소요 시간·토큰·캐시 적중률과 느린 도구 출력"""
+    from .database import get_stage_metrics_summary
+
+    summary = get_stage_metrics_summary(start_date, end_date)
+    if not summary:
+        return
+    print(f"\n⏱️ 단계별 지표 ({start_date} ~ {end_date}):")
+    for entry in summary:
+        runs = entry["runs"]
+        print(f"   - {entry['stage']}: {runs}회, 평균 {entry['wall_seconds'] / runs:.1f}초 "
+              f"(모델 {entry['model_seconds'] / runs:.1f}초, {entry['turns'] / runs:.1f}턴), "
+              f"입력 {entry['input_tokens']:,} (캐시 {cached_ratio(entry):.0%}), 출력 {entry['output_tokens']:,}")
+        slowest = sorted(entry["tool_calls"].items(), key=lambda item: item[1]["seconds"], reverse=True)[:5]
+        for tool, stats in slowest:
+            print(f"       · {tool}: {stats['count']}회, 합계 {stats['seconds']:.1f}초")
@@ -21,11 +21,38 @@ GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
 #openrouter_client = AsyncOpenAI(base_url=OPENROUTER_BASE_URL, api_key=openrouter_api_key)
 #deepseek_client = AsyncOpenAI(base_url=DEEPSEEK_BASE_URL, api_key=deepseek_api_key)
 #grok_client = AsyncOpenAI(base_url=GROK_BASE_URL, api_key=grok_api_key)
-gemini_client = AsyncOpenAI(base_url=GEMINI_BASE_URL, api_key=google_api_key)
+# 키가 없으면 만들지 않음 (replay 모드 등 오프라인 실행에서 import 실패 방지)
+gemini_client = AsyncOpenAI(base_url=GEMINI_BASE_URL, api_key=google_api_key) if google_api_key else None
+
+# 모델 생성 함수 교체용 (벤치마크의 스크립트 모델 등); None이면 기본 프로바이더 사용
+_model_fn = None
+
+
+def set_model_fn(fn):
+    """Route every get_model(model_name) call to fn(model_name) (None restores the default)."""
+    global _model_fn
+    _model_fn = fn
 
 
 def get_model(model_name: str):
-    """Get the appropriate model based on model name."""
+    """Get the appropriate model, wrapped for record/replay when AGENT_REPLAY_MODE is set."""
+    from . import replay
+    if _model_fn is not None:
+        return _model_fn(model_name)
+    if replay.is_enabled():
+        return replay.ReplayModel(model_name, lambda: _as_model(_get_base_model(model_name)))
+    return _get_base_model(model_name)
+
+
+def _as_model(model):
+    """Resolve a plain model name to a Model instance via the default OpenAI provider."""
+    if isinstance(model, str):
+        from agents import OpenAIProvider
+        return OpenAIProvider().get_model(model)
+    return model
+
+
+def _get_base_model(model_name: str):
     if "/" in model_name:
         return OpenAIChatCompletionsModel(model=model_name, openai_client=openrouter_client)
     elif "deepseek" in model_name:
@@ -0,0 +1,240 @@
+"""
+Agent run record/replay layer.
+
+AGENT_REPLAY_MODE=record  모든 모델 응답과 MCP 도구 결과를 로컬 저장소에 기록
+AGENT_REPLAY_MODE=replay  저장소에서 응답을 재생 (LLM/원격 MCP 호출 없음)
+AGENT_REPLAY_MODE=off     기본값, 아무것도 하지 않음
+
+Entries are keyed by a content hash of the request (model name, instructions, input,
+tool names / server, tool name, arguments), so a replayed backtest is served the exact
+responses that were recorded for the same inputs.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from typing import Any, Callable
+
+from pydantic import BaseModel, TypeAdapter
+from agents.items import ModelResponse
+from agents.mcp import MCPServer
+from agents.models.interface import Model
+from agents.usage import Usage
+from mcp.types import CallToolResult, Tool as MCPTool
+from openai.types.responses import ResponseOutputItem
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+AGENT_REPLAY_MODE = os.getenv("AGENT_REPLAY_MODE", "off").strip().lower()
+AGENT_REPLAY_DB = os.getenv("AGENT_REPLAY_DB", "replay.db")
+# replay 모드에서도 실제로 실행할 로컬 MCP 서버 (계좌 상태를 실제로 갱신해야 다음 날 입력이 일치함)
+AGENT_REPLAY_LIVE_SERVERS = [
+    s.strip() for s in os.getenv("AGENT_REPLAY_LIVE_SERVERS", "accounts_server").split(",") if s.strip()
+]
+
+# 실행 시각(wall-clock)은 run마다 달라지므로 해시에서 제외
+_WALL_CLOCK_RE = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?")
+
+_output_item_adapter = TypeAdapter(ResponseOutputItem)
+
+
+class ReplayMissError(RuntimeError):
+    """Raised in replay mode when no recorded entry matches a request."""
+
+
+def is_enabled() -> bool:
+    return AGENT_REPLAY_MODE in ("record", "replay")
+
+
+def _connect():
+    conn = sqlite3.connect(AGENT_REPLAY_DB)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS replay_store (
+            key TEXT PRIMARY KEY,
+            kind TEXT,
+            label TEXT,
+            payload TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    return conn
+
+
+def _jsonable(value: Any):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_unset=True)
+    return str(value)
+
+
+def content_hash(kind: str, *parts) -> str:
+    """Stable hash of a request, ignoring wall-clock timestamps."""
+    raw = json.dumps([kind, *parts], sort_keys=True, ensure_ascii=False, default=_jsonable)
+    raw = _WALL_CLOCK_RE.sub("<ts>", raw)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def load_entry(key: str) -> Any | None:
+    with _connect() as conn:
+        row = conn.execute('SELECT payload FROM replay_store WHERE key = ?', (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_entry(key: str, kind: str, label: str, payload: Any) -> None:
+    with _connect() as conn:
+        conn.execute('''
+            INSERT OR REPLACE INTO replay_store (key, kind, label, payload)
+            VALUES (?, ?, ?, ?)
+        ''', (key, kind, label, json.dumps(payload, ensure_ascii=False)))
+        conn.commit()
+
+
+def _response_to_payload(response: ModelResponse) -> dict:
+    usage = response.usage
+    return {
+        "output": [item.model_dump(mode="json") for item in response.output],
+        "usage": {
+            "requests": usage.requests,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "total_tokens": usage.total_tokens,
+            "cached_tokens": usage.input_tokens_details.cached_tokens,
+            "reasoning_tokens": usage.output_tokens_details.reasoning_tokens,
+        },
+        "response_id": response.response_id,
+    }
+
+
+def _response_from_payload(payload: dict) -> ModelResponse:
+    usage = payload.get("usage", {})
+    return ModelResponse(
+        output=[_output_item_adapter.validate_python(item) for item in payload["output"]],
+        usage=Usage(
+            requests=usage.get("requests", 1),
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+            total_tokens=usage.get("total_tokens", 0),
+            input_tokens_details=InputTokensDetails(cached_tokens=usage.get("cached_tokens", 0)),
+            output_tokens_details=OutputTokensDetails(reasoning_tokens=usage.get("reasoning_tokens", 0)),
+        ),
+        response_id=payload.get("response_id"),
+    )
+
+
+def _prompt_kwargs(prompt) -> dict:
+    # prompt 인자는 openai-agents 0.0.19부터 - 값이 있을 때만 넘겨 이전 버전 모델과도 호환 (replay 키에는 넣지 않음)
+    return {"prompt": prompt} if prompt is not None else {}
+
+
+class ReplayModel(Model):
+    """Model wrapper that records responses or serves them from the replay store."""
+
+    def __init__(self, model_name: str, model_factory: Callable[[], Model]):
+        self.model_name = model_name
+        self._model_factory = model_factory
+        self._model: Model | None = None
+
+    def _inner(self) -> Model:
+        # replay 모드에서는 실제 모델(클라이언트/API 키)이 필요 없도록 지연 생성
+        if self._model is None:
+            self._model = self._model_factory()
+        return self._model
+
+    def _key(self, system_instructions, input, tools, output_schema, handoffs) -> str:
+        return content_hash(
+            "model",
+            self.model_name,
+            system_instructions,
+            input,
+            sorted(tool.name for tool in tools),
+            output_schema.name() if output_schema else None,
+            sorted(handoff.tool_name for handoff in handoffs),
+        )
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema,
+                           handoffs, tracing, *, previous_response_id=None, prompt=None) -> ModelResponse:
+        key = self._key(system_instructions, input, tools, output_schema, handoffs)
+        if AGENT_REPLAY_MODE == "replay":
+            payload = load_entry(key)
+            if payload is None:
+                raise ReplayMissError(f"No recorded model response for {self.model_name} ({key[:12]})")
+            return _response_from_payload(payload)
+
+        response = await self._inner().get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id, **_prompt_kwargs(prompt),
+        )
+        if AGENT_REPLAY_MODE == "record":
+            save_entry(key, "model", self.model_name, _response_to_payload(response))
+        return response
+
+    def stream_response(self, system_instructions, input, model_settings, tools, output_schema,
+                        handoffs, tracing, *, previous_response_id=None, prompt=None):
+        if AGENT_REPLAY_MODE == "replay":
+            raise ReplayMissError("Streaming responses are not recorded; use Runner.run in replay mode")
+        return self._inner().stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id, **_prompt_kwargs(prompt),
+        )
+
+
+class ReplayMCPServer(MCPServer):
+    """MCP server wrapper that records tool listings/results or serves them from the replay store."""
+
+    def __init__(self, server: MCPServer, label: str):
+        self._server = server
+        self.label = label
+        # 로컬 상태를 바꾸는 서버는 replay 중에도 실제로 실행
+        self.live = AGENT_REPLAY_MODE != "replay" or any(s in label for s in AGENT_REPLAY_LIVE_SERVERS)
+
+    @property
+    def name(self) -> str:
+        return self._server.name
+
+    async def connect(self):
+        if self.live:
+            await self._server.connect()
+
+    async def cleanup(self):
+        if self.live:
+            await self._server.cleanup()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.cleanup()
+
+    async def list_tools(self, *args, **kwargs) -> list[MCPTool]:
+        key = content_hash("mcp_list_tools", self.label)
+        if not self.live:
+            payload = load_entry(key)
+            if payload is None:
+                raise ReplayMissError(f"No recorded tool list for {self.label}")
+            return [MCPTool.model_validate(tool) for tool in payload]
+
+        tools = await self._server.list_tools(*args, **kwargs)
+        if AGENT_REPLAY_MODE == "record":
+            save_entry(key, "mcp_list_tools", self.label, [tool.model_dump(mode="json") for tool in tools])
+        return tools
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
+        key = content_hash("mcp_call_tool", self.label, tool_name, arguments or {})
+        if not self.live:
+            payload = load_entry(key)
+            if payload is None:
+                raise ReplayMissError(f"No recorded result for {self.label}:{tool_name}")
+            return CallToolResult.model_validate(payload)
+
+        result = await self._server.call_tool(tool_name, arguments)
+        if AGENT_REPLAY_MODE == "record":
+            save_entry(key, "mcp_call_tool", f"{self.label}:{tool_name}", result.model_dump(mode="json"))
+        return result
+
+
+def server_label(params) -> str:
+    """Readable, secret-free label for MCP server params (used in replay keys)."""
+    if isinstance(params, dict) and params.get("type") == "http":
+        return params["url"].split("?")[0]
+    return " ".join([params.get("command", "")] + list(params.get("args", [])))
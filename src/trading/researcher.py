@@ -1,15 +1,37 @@
-from agents import Agent, Tool
+from agents import Agent, Tool, function_tool
 from .models import get_model
 from config.templates import researcher_instructions, research_tool
 
 
-async def get_researcher(mcp_servers, model_name, current_date=None) -> Agent:
+def get_dedupe_tool(trader_name: str, run_date: str = None) -> Tool:
+    """Create an in-process tool that filters candidate videos against the trader's analyzed list.
+
+    run_date uses the same cutoff as the post-research bookkeeping: analyses recorded on the run
+    date itself do not count, so a rerun of that date sees the day's videos as new.
+    """
+    from src.accounts.database import filter_unanalyzed_videos as filter_ids
+
+    @function_tool
+    def filter_unanalyzed_videos(video_ids: list[str]) -> list[str]:
+        """Return only the video IDs that have NOT been analyzed before.
+        Call this ONCE with every candidate video ID from your search results.
+
+        Args:
+            video_ids: Candidate YouTube video IDs.
+        """
+        return filter_ids(video_ids, trader_name, analyzed_before=run_date)
+
+    return filter_unanalyzed_videos
+
+
+async def get_researcher(mcp_servers, model_name, current_date=None, trader_name=None, run_date=None) -> Agent:
     """Create a researcher agent with the specified model and MCP servers."""
     researcher = Agent(
         name="Researcher",
-        instructions=researcher_instructions(current_date=current_date),
+        instructions=researcher_instructions(),
         model=get_model(model_name),
         mcp_servers=mcp_servers,
+        tools=[get_dedupe_tool(trader_name, run_date)] if trader_name else [],
     )
     return researcher
 
@@ -0,0 +1,90 @@
+import json
+import re
+
+SIGNALS_MARKER = "SIGNALS_JSON:"
+DIRECTIONS = ("BUY", "SELL", "HOLD")
+CONVICTIONS = ("high", "medium", "low")
+
+TICKER_PATTERN = re.compile(r"^[A-Z][A-Z.]{0,5}$")
+# JSON이 없을 때(이전 프롬프트·형식 오류) 추천 문구에서 추출
+RECOMMENDATION_PATTERN = re.compile(
+    r"(BUY|SELL) RECOMMENDATION:\s*(?:Buy|Sell)\s+([A-Z][A-Z.]{0,5})\b(?:\s+at\s+\$([\d,]+(?:\.\d+)?))?(?:\s*\((\d+(?:\.\d+)?)%)?"
+)
+CONVICTION_PATTERN = re.compile(r"Conviction(?: level)?:\s*(High|Medium|Low)", re.IGNORECASE)
+
+
+def _number(value):
+    try:
+        return float(str(value).replace(",", "").replace("$", "").rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize(item: dict, source: str) -> dict | None:
+    ticker = str(item.get("ticker") or item.get("symbol") or "").strip().upper()
+    direction = str(item.get("direction") or item.get("action") or "").strip().upper()
+    if not TICKER_PATTERN.match(ticker) or direction not in DIRECTIONS:
+        return None
+    conviction = str(item.get("conviction") or "").strip().lower()
+    published = item.get("video_published") or item.get("published")
+    return {
+        "ticker": ticker,
+        "direction": direction,
+        "conviction": conviction if conviction in CONVICTIONS else None,
+        "video_id": item.get("video_id"),
+        "video_published": str(published)[:10] if published else None,
+        "price": _number(item.get("price")),
+        "position_pct": _number(item.get("position_pct")),
+        "source": source,
+    }
+
+
+def _from_json(text: str) -> list[dict] | None:
+    index = text.rfind(SIGNALS_MARKER)
+    if index < 0:
+        return None
+    start = text.find("[", index)
+    if start < 0:
+        return None
+    try:
+        items, _ = json.JSONDecoder().raw_decode(text[start:])
+    except ValueError:
+        return None
+    if not isinstance(items, list):
+        return None
+    return [signal for signal in (_normalize(item, "json") for item in items if isinstance(item, dict)) if signal]
+
+
+def _from_text(text: str) -> list[dict]:
+    matches = list(RECOMMENDATION_PATTERN.finditer(text))
+    signals = []
+    for i, match in enumerate(matches):
+        block = text[match.end():matches[i + 1].start() if i + 1 < len(matches) else len(text)]
+        conviction = CONVICTION_PATTERN.search(block)
+        signal = _normalize({
+            "direction": match.group(1),
+            "ticker": match.group(2),
+            "price": match.group(3),
+            "position_pct": match.group(4),
+            "conviction": conviction.group(1) if conviction else None,
+        }, "text")
+        if signal:
+            signals.append(signal)
+    return signals
+
+
+def parse_analyst_signals(text: str) -> list[dict]:
+    """Extract structured signals from the Analyst's answer.
+
+    Uses the trailing SIGNALS_JSON array when present and valid, otherwise falls back to the
+    "BUY/SELL RECOMMENDATION: ..." lines. Duplicate (ticker, direction) pairs keep the first entry.
+    """
+    if not text:
+        return []
+    signals = _from_json(text)
+    if signals is None:
+        signals = _from_text(text)
+    unique = {}
+    for signal in signals:
+        unique.setdefault((signal["ticker"], signal["direction"]), signal)
+    return list(unique.values())
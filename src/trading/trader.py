@@ -1,5 +1,8 @@
 from contextlib import AsyncExitStack
+from datetime import datetime, timedelta
 import json
+import os
+from pydantic import BaseModel
 from agents import Agent, Runner, trace
 from agents.mcp import MCPServerStdio, MCPServerStreamableHttp, MCPServerStreamableHttpParams
 
@@ -8,23 +11,61 @@ from src.tracers import make_trace_id
 from config.templates import (
     trader_instructions,
     analyst_message,
+    researcher_message,
     portfolio_manager_message,
+    RESEARCHER_PROMPT_VERSION,
+    DIGEST_PROMPT_VERSION,
+    ANALYST_PROMPT_VERSION,
+    PORTFOLIO_MANAGER_PROMPT_VERSION,
 )
-from config.mcp_params import trader_mcp_server_params, researcher_mcp_server_params
-from config.strategies import extract_youtuber_from_strategy
+from config.mcp_params import (
+    trader_mcp_server_params,
+    researcher_mcp_server_params,
+    use_youtube_local_store,
+    with_passthrough_env,
+)
+from config.strategies import extract_youtuber_from_strategy, get_strategy_by_youtuber
 from .models import get_model
 from .researcher import get_researcher_tool
+from .metrics import StageRun
+from src.profiling import profile_block
+from . import replay
 
 MAX_TURNS = 50
+RESEARCH_LOOKBACK_DAYS = 5
+ANALYZED_VIDEOS_PROMPT_LIMIT = 20
+
+# 새 리서치 신호가 없으면 Analyst/PM 단계를 생략하거나 축소
+SHORT_CIRCUIT_STAGES = os.getenv("SHORT_CIRCUIT_STAGES", "true").strip().lower() == "true"
+NO_ACTIONABLE_MARKER = "No actionable US market content found"
+
+# Researcher 전에 새 영상 자막을 병렬로 요약 (로컬 YouTube 저장소 필요)
+VIDEO_DIGESTS = os.getenv("VIDEO_DIGESTS", "true").strip().lower() == "true"
+
+# 리서치 캐시 모드: on(조회+저장) / refresh(조회 없이 새로 저장) / off(사용 안 함)
+RESEARCH_CACHE_MODE = os.getenv("RESEARCH_CACHE", "on").strip().lower()
+
+
+class ResearchOutcome(BaseModel):
+    """Structured result of the researcher stage used to gate the later stages."""
+    new_videos: int
+    relevant_videos: int
+    actionable: bool
+    reason: str = ""
 
 
 async def create_mcp_server(params):
     """Create MCP server based on type (HTTP or STDIO)."""
     if isinstance(params, dict) and params.get("type") == "http":
         http_params = MCPServerStreamableHttpParams(url=params["url"])
-        return MCPServerStreamableHttp(http_params, client_session_timeout_seconds=600)
+        server = MCPServerStreamableHttp(http_params, client_session_timeout_seconds=600)
     else:
-        return MCPServerStdio(params, client_session_timeout_seconds=600)
+        server = MCPServerStdio(with_passthrough_env(params), client_session_timeout_seconds=600)
+
+    # 기록/재생 모드면 도구 호출을 저장소 경유로 감싸기
+    if replay.is_enabled():
+        return replay.ReplayMCPServer(server, replay.server_label(params))
+    return server
 
 
 class Trader:
@@ -34,19 +75,23 @@ class Trader:
         self.agent = None
         self.model_name = model_name
         self.do_trade = True
+        self.shared_research = None
 
     async def create_researcher_agent(self, researcher_mcp_servers, current_date=None) -> Agent:
         """Create the researcher agent for YouTube analysis."""
         from .researcher import get_researcher
-        return await get_researcher(researcher_mcp_servers, self.model_name, current_date=current_date)
+        return await get_researcher(researcher_mcp_servers, self.model_name, current_date=current_date,
+                                    trader_name=self.name, run_date=self.run_date())
     
-    async def create_analyst_agent(self, trader_mcp_servers, current_date=None) -> Agent:
+    async def create_analyst_agent(self, trader_mcp_servers, current_date=None, channel_handle="", reference_date=None) -> Agent:
         """Create the analyst agent for stock recommendations."""
+        from .analyst import get_mentions_tool
         return Agent(
             name="Analyst",
             instructions="You are an Investment Analyst. Analyze market data and provide stock recommendations.",
             model=get_model(self.model_name),
             mcp_servers=trader_mcp_servers,
+            tools=[get_mentions_tool(channel_handle, reference_date)],
         )
     
     async def create_portfolio_agent(self, trader_mcp_servers, current_date=None) -> Agent:
@@ -65,11 +110,11 @@ class Trader:
         account_json.pop("portfolio_value_time_series", None)
         return json.dumps(account_json)
     
-    async def get_analyzed_videos(self) -> list:
-        """Get list of previously analyzed video IDs/titles."""
+    async def get_analyzed_videos(self, limit: int = None) -> list:
+        """Get list of previously analyzed video IDs/titles (most recent first)."""
         try:
             from .database import get_analyzed_videos_for_trader
-            return get_analyzed_videos_for_trader(self.name)
+            return get_analyzed_videos_for_trader(self.name, limit)
         except:
             return []
     
@@ -77,30 +122,41 @@ class Trader:
         """Save analyzed video information."""
         try:
             from .database import save_analyzed_videos
-            save_analyzed_videos(self.name, video_info, self.current_date)
+            save_analyzed_videos(self.name, video_info, self.run_date())
         except Exception as e:
             print(f"영상 분석 기록 저장 실패: {e}")
 
-    async def parse_and_save_analyzed_videos(self, researcher_insights: str):
-        """Parse researcher insights and save analyzed video information."""
+    async def parse_and_save_analyzed_videos(self, researcher_insights: str) -> list:
+        """Parse researcher insights, save analyzed video information and return the parsed videos."""
+        video_info = []
         try:
             import re
-            video_info = []
+            from src.accounts.database import filter_unanalyzed_videos
 
             # "ANALYZED VIDEOS SUMMARY:" 섹션 찾기
             if "ANALYZED VIDEOS SUMMARY:" in researcher_insights:
                 summary_section = researcher_insights.split("ANALYZED VIDEOS SUMMARY:")[1]
 
                 # 각 비디오 항목 파싱
-                video_blocks = re.findall(r'- Video ID: (.+?)\n.*?Title: (.+?)\n.*?Published: (.+?)\n', summary_section, re.DOTALL)
+                video_blocks = re.findall(r'- Video ID: (.+?)\n.*?Title: (.+?)\n.*?Published: (.+?)\n((?:[ \t]+[^\n]*\n?)*)', summary_section, re.DOTALL)
 
-                for video_id, title, published in video_blocks:
+                for video_id, title, published, details in video_blocks:
+                    relevant = re.search(r'US Market Relevant:\s*(Yes|No)', details, re.IGNORECASE)
+                    transcript = re.search(r'Transcript Analyzed:\s*(Yes|No)', details, re.IGNORECASE)
                     video_info.append({
                         'id': video_id.strip(),
                         'title': title.strip(),
-                        'published': published.strip()
+                        'published': published.strip(),
+                        'us_market_relevant': relevant.group(1).lower() == 'yes' if relevant else None,
+                        'transcript_analyzed': transcript.group(1).lower() == 'yes' if transcript else None,
                     })
 
+                # 저장 전에 한 번에 신규 여부 확인 - 같은 실행일의 기록은 신규로 (캐시 재사용·재실행 시 Analyst/PM이 생략되지 않도록)
+                new_ids = set(filter_unanalyzed_videos([video['id'] for video in video_info], self.name,
+                                                       analyzed_before=self.run_date()))
+                for video in video_info:
+                    video['new'] = video['id'] in new_ids
+
             if video_info:
                 await self.save_analyzed_videos(video_info)
                 print(f"✅ {len(video_info)}개 영상 분석 정보 저장 완료")
@@ -109,84 +165,242 @@ class Trader:
 
         except Exception as e:
             print(f"영상 정보 파싱 실패: {e}")
+        return video_info
 
-    async def run_three_stage_pipeline(self, trader_mcp_servers, researcher_mcp_servers, reference_date=None, current_date=None):
-        """Run the three-stage pipeline: Researcher → Analyst → Portfolio Manager."""
-        
-        # 백테스팅 날짜 설정 (주가 조회용)
-        if current_date:
-            import os
-            from src.accounts.accounts import set_backtest_date
-            # current_date에서 날짜 부분만 추출 (시간 제거)
-            date_only = current_date.split(' ')[0] if ' ' in current_date else current_date
-            set_backtest_date(date_only)
-            # MCP 서버에도 환경변수로 전달
-            os.environ["BACKTEST_DATE"] = date_only
-            print(f"🔄 백테스팅 주가 날짜 설정: {date_only} (환경변수 포함)")
-        
-        account = await self.get_account_report()
-        strategy = await read_strategy_resource(self.name)
+    def assess_research(self, researcher_insights: str, video_info: list) -> ResearchOutcome:
+        """Decide whether the research contains new, actionable signals for the later stages."""
+        new_videos = [video for video in video_info if video.get('new', True)]
+        # 관련성 표시가 없으면 보수적으로 관련 있다고 간주 ("Transcript Analyzed: Yes"는 관련성과 무관 - 요약된 영상은 모두 Yes)
+        relevant_videos = [video for video in new_videos if video.get('us_market_relevant') is not False]
+
+        if not new_videos:
+            reason = "no new videos"
+        elif not relevant_videos:
+            reason = "no US-market-relevant videos"
+        elif NO_ACTIONABLE_MARKER.lower() in researcher_insights.lower():
+            reason = "researcher reported no actionable US market content"
+        else:
+            reason = ""
+
+        return ResearchOutcome(
+            new_videos=len(new_videos),
+            relevant_videos=len(relevant_videos),
+            actionable=not reason,
+            reason=reason,
+        )
+
+    def save_analyst_signals(self, analyst_recommendations: str, target_youtuber: str, reference_date=None) -> list:
+        """Persist the Analyst's structured signals so rule-based replays don't need the LLMs again."""
+        try:
+            from .signals import parse_analyst_signals
+            from .database import save_signals
+            signals = parse_analyst_signals(analyst_recommendations)
+            save_signals(self.name, target_youtuber, self.run_date(), (reference_date or "").split(' ')[0],
+                         signals, ANALYST_PROMPT_VERSION)
+            return signals
+        except Exception as e:
+            print(f"신호 저장 실패: {e}")
+            return []
+
+    def get_ticker_mentions(self, channel_handle, reference_date=None) -> str:
+        """Ingest mentions from newly stored transcripts and summarize the research window."""
+        window = self.research_window(reference_date)
+        if not window:
+            return ""
+        try:
+            from src.youtube.mentions import ingest_ticker_mentions, format_mention_summary
+            ingest_ticker_mentions()
+            return format_mention_summary(*window, channel_handle)
+        except Exception as e:
+            print(f"종목 언급 색인 실패: {e}")
+            return ""
+
+    def run_date(self) -> str:
+        """Simulated trading date (or today outside backtests) used to key stage records."""
+        return (self.current_date or datetime.now().strftime("%Y-%m-%d")).split(' ')[0]
+
+    def record_stage(self, stage: str, status: str, reason: str = ""):
+        """Record whether a pipeline stage ran, was skipped or was downgraded."""
+        from .database import record_stage_run
+        record_stage_run(self.name, self.run_date(), stage, status, reason)
+
+    def research_window(self, reference_date):
+        """Return the (start, end) date window the researcher covers, or None outside backtests."""
+        if not reference_date:
+            return None
+        end = datetime.strptime(reference_date.split(' ')[0], "%Y-%m-%d")
+        start = end - timedelta(days=RESEARCH_LOOKBACK_DAYS)
+        return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+    async def run_researcher(self, researcher_mcp_servers, target_youtuber, reference_date=None, current_date=None) -> str:
+        """Run the researcher stage, reusing cached insights for the same YouTuber and window."""
+        from .database import get_cached_research, save_cached_research
+
+        window = self.research_window(reference_date)
+        channel_handle = get_strategy_by_youtuber(target_youtuber).get("channel_handle")
+        use_digests = VIDEO_DIGESTS and use_youtube_local_store and channel_handle and window
+        # 요약 사용 여부에 따라 프롬프트가 달라지므로 캐시 키도 구분
+        prompt_version = f"{RESEARCHER_PROMPT_VERSION}+digest-{DIGEST_PROMPT_VERSION}" if use_digests else RESEARCHER_PROMPT_VERSION
+        if window and RESEARCH_CACHE_MODE == "on":
+            cached = get_cached_research(target_youtuber, *window, prompt_version)
+            if cached:
+                print(f"♻️ 리서치 캐시 사용: {target_youtuber} {window[0]}~{window[1]} ({prompt_version})")
+                return cached
+
+        # 최근 분석 영상만 프롬프트에 포함 (전체 중복 검사는 filter_unanalyzed_videos 도구로)
+        analyzed_videos = await self.get_analyzed_videos(ANALYZED_VIDEOS_PROMPT_LIMIT)
+        analyzed_video_list = "\n".join([f"- {vid}" for vid in analyzed_videos]) if analyzed_videos else "None"
         
-        # 직접 설정된 유튜버 이름 사용 (fallback으로 추출 로직)
+        # 로컬 업로드 인덱스가 있으면 매일 5일치를 다시 검색하지 않고 구간 조회로 대체
+        if use_youtube_local_store and channel_handle and window:
+            video_source = f"""
+📺 CHANNEL UPLOADS:
+- MANDATORY: Call list_channel_videos(channel_handle="{channel_handle}", published_after="{window[0]}", published_before="{window[1]}") FIRST
+- It returns every upload in the window from the local index - do NOT call search_videos for the same window
+- Only use search_videos if list_channel_videos fails
+- For transcripts, use search_transcripts(query=..., video_ids=[...]) to pull only the relevant passages
+"""
+        else:
+            video_source = ""
+
+        # 새 영상을 미리 병렬로 요약해 두면 Researcher는 요약만 보고 판단
+        digest_section = ""
+        if use_digests:
+            from .digest import build_video_digests
+            try:
+                digests = await build_video_digests(channel_handle, window, self.name, self.model_name, self.run_date())
+            except Exception as e:
+                print(f"영상 요약 단계 실패, 기존 방식으로 진행: {e}")
+                digests = []
+            if digests:
+                digest_section = f"""
+🧾 PRE-COMPUTED VIDEO DIGESTS (new, not yet analyzed uploads in the window, summarized from full transcripts):
+{json.dumps(digests, ensure_ascii=False, indent=1)}
+- Work from these digests first - they already cover the transcripts of these videos
+- Only pull transcript passages (search_transcripts) for a digested video if you need more quotes
+- List every digested video in ANALYZED VIDEOS SUMMARY (Transcript Analyzed: Yes)
+"""
+
+        researcher_agent = await self.create_researcher_agent(researcher_mcp_servers, current_date)
+        researcher_msg = researcher_message(
+            target_youtuber, reference_date, current_date, self.name, analyzed_video_list,
+            video_source, digest_section,
+        )
+        with profile_block(self.name, "researcher", self.run_date()), \
+                StageRun(self.name, "researcher", self.run_date()) as stage_run:
+            researcher_result = await Runner.run(researcher_agent, researcher_msg, max_turns=MAX_TURNS)
+        stage_run.finish(researcher_result, prompt_version)
+        researcher_insights = str(researcher_result) if researcher_result else "No insights provided"
+
+        if window and researcher_result and RESEARCH_CACHE_MODE != "off":
+            save_cached_research(target_youtuber, *window, prompt_version, researcher_insights)
+        return researcher_insights
+
+    def apply_backtest_date(self, current_date):
+        """Point share-price lookups (in-process and MCP servers) at the simulated trading date."""
+        if not current_date:
+            return
+        from src.accounts.accounts import set_backtest_date
+        # current_date에서 날짜 부분만 추출 (시간 제거)
+        date_only = current_date.split(' ')[0] if ' ' in current_date else current_date
+        set_backtest_date(date_only)
+        # MCP 서버에도 환경변수로 전달
+        os.environ["BACKTEST_DATE"] = date_only
+        print(f"🔄 백테스팅 주가 날짜 설정: {date_only} (환경변수 포함)")
+
+    async def get_target_youtuber(self, strategy=None) -> str:
+        """직접 설정된 유튜버 이름 사용 (fallback으로 전략 문자열에서 추출)"""
         target_youtuber = getattr(self, 'target_youtuber', None)
         if not target_youtuber:
+            strategy = strategy or await read_strategy_resource(self.name)
             target_youtuber = extract_youtuber_from_strategy(strategy)
+        return target_youtuber
+
+    async def run_research_only(self, reference_date=None, current_date=None) -> str | None:
+        """Run only the researcher stage so its result can be shared by traders on the same YouTuber."""
+        self.reference_date = reference_date
+        self.current_date = current_date
+        self.apply_backtest_date(current_date)
+        try:
+            target_youtuber = await self.get_target_youtuber()
+            with trace(f"{self.name}-research", trace_id=make_trace_id(f"{self.name.lower()}")):
+                async with AsyncExitStack() as researcher_stack:
+                    with profile_block(self.name, "researcher_mcp_startup", self.run_date()):
+                        researcher_mcp_servers = await self.connect_researcher_servers(researcher_stack)
+                    return await self.run_researcher(researcher_mcp_servers, target_youtuber, reference_date, current_date)
+        except Exception as e:
+            print(f"Error running shared research for {self.name}: {e}")
+            return None
+
+    async def connect_researcher_servers(self, researcher_stack) -> list:
+        """리서쳐 MCP 서버들 초기화 (일부 실패해도 계속 진행)"""
+        researcher_mcp_servers = []
+        for i, params in enumerate(researcher_mcp_server_params(self.name)):
+            try:
+                server = await create_mcp_server(params)
+                researcher_mcp_servers.append(
+                    await researcher_stack.enter_async_context(server)
+                )
+                print(f"✅ 리서쳐 MCP 서버 {i+1} 연결 성공")
+            except Exception as e:
+                print(f"❌ 리서쳐 MCP 서버 {i+1} 연결 실패: {e}")
+                continue
+        return researcher_mcp_servers
+
+    async def run_three_stage_pipeline(self, trader_mcp_servers, researcher_mcp_servers, reference_date=None, current_date=None):
+        """Run the three-stage pipeline: Researcher → Analyst → Portfolio Manager."""
+        account = await self.get_account_report()
+        strategy = await read_strategy_resource(self.name)
+        target_youtuber = await self.get_target_youtuber(strategy)
         
         # 디버깅: 유튜버 및 백테스팅 정보 확인
         print(f"🔍 {self.name} → 타겟: {target_youtuber}, 분석기준: {reference_date}, 거래일: {current_date}")
         
-        # 1단계: Researcher Agent
-        print(f"📰 1단계: Researcher 실행 중...")
-        
-        # 이미 분석한 영상 목록 조회
-        analyzed_videos = await self.get_analyzed_videos()
-        analyzed_video_list = "\n".join([f"- {vid}" for vid in analyzed_videos]) if analyzed_videos else "None"
-        
-        researcher_agent = await self.create_researcher_agent(researcher_mcp_servers, current_date)
-        researcher_msg = f"""You are a YouTube Research Specialist focusing on {target_youtuber}.
-        
-MISSION: Analyze YouTube videos from {target_youtuber} for investment insights.
-
-⚠️ CRITICAL BACKTESTING CONSTRAINTS:
-- Reference date: {reference_date} 
-- ONLY analyze videos published BEFORE {reference_date} (not on or after)
-- MANDATORY: Use "published_before": "{reference_date}T00:00:00Z" in ALL search_videos calls
-- Search period: 5 DAYS before {reference_date} (use published_after parameter)
-- If you find videos published on {reference_date} or later, you are using FUTURE INFORMATION
-- Example: Reference date {reference_date} means NO videos from {reference_date} onwards
-
-RESEARCH FOCUS:
-- Extract investment themes, stock mentions, market outlook, and trading opportunities
-- Focus on US stock market relevant content only
-- Today's simulated date: {current_date} (only use info available up to this date)
-
-SEARCH REQUIREMENTS:
-- Always include published_before parameter: "{reference_date}T00:00:00Z"
-- Never search without date constraints
-- Verify all video publication dates before analysis
-
-🚫 DUPLICATE VIDEO PREVENTION:
-- Previously analyzed videos for {self.name}:
-{analyzed_video_list}
-- DO NOT analyze these videos again
-- Focus on NEW videos not in the above list
-- If you find a video that matches the above list, skip it and find different videos
-- Prioritize fresh content that hasn't been analyzed before
-
-Provide detailed investment insights based on your YouTube research for the Investment Analyst."""
-        researcher_result = await Runner.run(researcher_agent, researcher_msg, max_turns=MAX_TURNS)
-        researcher_insights = str(researcher_result) if researcher_result else "No insights provided"
+        # 1단계: Researcher Agent (같은 유튜버를 따르는 트레이더끼리 공유된 결과가 있으면 재사용)
+        if self.shared_research is not None:
+            print(f"📰 1단계: 공유된 Researcher 결과 사용")
+            researcher_insights = self.shared_research
+            self.record_stage("researcher", "shared")
+        else:
+            print(f"📰 1단계: Researcher 실행 중...")
+            researcher_insights = await self.run_researcher(
+                researcher_mcp_servers, target_youtuber, reference_date, current_date
+            )
 
         # 분석된 영상 정보 저장
-        await self.parse_and_save_analyzed_videos(researcher_insights)
-
-        # 2단계: Analyst Agent  
-        print(f"🔍 2단계: Analyst 실행 중...")
-        analyst_agent = await self.create_analyst_agent(trader_mcp_servers, current_date)
-        analyst_msg = analyst_message(self.name, strategy, account, reference_date, current_date, target_youtuber, researcher_insights)
-        analyst_result = await Runner.run(analyst_agent, analyst_msg, max_turns=MAX_TURNS)
-        analyst_recommendations = str(analyst_result) if analyst_result else "No recommendations provided"
-        
+        video_info = await self.parse_and_save_analyzed_videos(researcher_insights)
+        outcome = self.assess_research(researcher_insights, video_info)
+
+        if outcome.actionable or not SHORT_CIRCUIT_STAGES:
+            # 2단계: Analyst Agent
+            print(f"🔍 2단계: Analyst 실행 중...")
+            channel_handle = get_strategy_by_youtuber(target_youtuber).get("channel_handle", "")
+            ticker_mentions = self.get_ticker_mentions(channel_handle, reference_date)
+            analyst_agent = await self.create_analyst_agent(trader_mcp_servers, current_date, channel_handle, reference_date)
+            analyst_msg = analyst_message(self.name, strategy, account, reference_date, current_date, target_youtuber,
+                                          researcher_insights, ticker_mentions)
+            with profile_block(self.name, "analyst", self.run_date()), \
+                    StageRun(self.name, "analyst", self.run_date()) as stage_run:
+                analyst_result = await Runner.run(analyst_agent, analyst_msg, max_turns=MAX_TURNS)
+            stage_run.finish(analyst_result, ANALYST_PROMPT_VERSION)
+            analyst_recommendations = str(analyst_result) if analyst_result else "No recommendations provided"
+            self.record_stage("analyst", "ran")
+            self.save_analyst_signals(analyst_recommendations, target_youtuber, reference_date)
+            pm_status = "ran"
+        else:
+            # 새 신호가 없으면 Analyst 생략, 보유 종목이 있을 때만 PM이 모니터링
+            print(f"⏭️ 2단계: Analyst 생략 ({outcome.reason})")
+            self.record_stage("analyst", "skipped", outcome.reason)
+            if not json.loads(account).get("holdings"):
+                print(f"⏭️ 3단계: Portfolio Manager 생략 (보유 종목 없음)")
+                self.record_stage("portfolio_manager", "skipped", f"{outcome.reason}; no open positions")
+                return
+            analyst_recommendations = (
+                f"NO NEW RESEARCH SIGNALS TODAY ({outcome.reason}). The Analyst stage was skipped. "
+                "Only monitor existing positions; do not open new positions."
+            )
+            pm_status = "downgraded"
+
         # 3단계: Portfolio Manager Agent
         print(f"🎯 3단계: Portfolio Manager 실행 중...")
         portfolio_agent = await self.create_portfolio_agent(trader_mcp_servers, current_date)
@@ -194,40 +408,37 @@ Provide detailed investment insights based on your YouTube research for the Inve
             self.name, strategy, account, reference_date, current_date, 
             target_youtuber, analyst_recommendations
         )
-        await Runner.run(portfolio_agent, portfolio_msg, max_turns=MAX_TURNS)
+        with profile_block(self.name, "portfolio_manager", self.run_date()), \
+                StageRun(self.name, "portfolio_manager", self.run_date()) as stage_run:
+            portfolio_result = await Runner.run(portfolio_agent, portfolio_msg, max_turns=MAX_TURNS)
+        stage_run.finish(portfolio_result, PORTFOLIO_MANAGER_PROMPT_VERSION)
+        self.record_stage("portfolio_manager", pm_status, outcome.reason)
 
     async def run_with_mcp_servers(self):
         """Set up and run the trader with MCP servers."""
         async with AsyncExitStack() as trader_stack:
             # 트레이더 MCP 서버들 초기화
             trader_mcp_servers = []
-            for i, params in enumerate(trader_mcp_server_params):
-                try:
-                    server = await create_mcp_server(params)
-                    trader_mcp_servers.append(
-                        await trader_stack.enter_async_context(server)
-                    )
-                    print(f"✅ 트레이더 MCP 서버 {i+1} 연결 성공")
-                except Exception as e:
-                    print(f"❌ 트레이더 MCP 서버 {i+1} 연결 실패: {e}")
-                    # 필수 서버 실패 시에만 중단 (예: accounts_server)
-                    if "accounts" in str(params).lower():
-                        raise Exception(f"필수 서버 연결 실패: {e}")
-            
-            async with AsyncExitStack() as researcher_stack:
-                # 리서쳐 MCP 서버들 초기화
-                researcher_mcp_servers = []
-                for i, params in enumerate(researcher_mcp_server_params(self.name)):
+            with profile_block(self.name, "trader_mcp_startup", self.run_date()):
+                for i, params in enumerate(trader_mcp_server_params):
                     try:
                         server = await create_mcp_server(params)
-                        researcher_mcp_servers.append(
-                            await researcher_stack.enter_async_context(server)
+                        trader_mcp_servers.append(
+                            await trader_stack.enter_async_context(server)
                         )
-                        print(f"✅ 리서쳐 MCP 서버 {i+1} 연결 성공")
+                        print(f"✅ 트레이더 MCP 서버 {i+1} 연결 성공")
                     except Exception as e:
-                        print(f"❌ 리서쳐 MCP 서버 {i+1} 연결 실패: {e}")
-                        # 리서쳐 서버는 일부 실패해도 계속 진행
-                        continue
+                        print(f"❌ 트레이더 MCP 서버 {i+1} 연결 실패: {e}")
+                        # 필수 서버 실패 시에만 중단 (예: accounts_server)
+                        if "accounts" in str(params).lower():
+                            raise Exception(f"필수 서버 연결 실패: {e}")
+            
+            async with AsyncExitStack() as researcher_stack:
+                # 공유된 리서치 결과가 있으면 리서쳐 서버를 띄우지 않음
+                researcher_mcp_servers = []
+                if self.shared_research is None:
+                    with profile_block(self.name, "researcher_mcp_startup", self.run_date()):
+                        researcher_mcp_servers = await self.connect_researcher_servers(researcher_stack)
                 
                 await self.run_three_stage_pipeline(trader_mcp_servers, researcher_mcp_servers, 
                                                    self.reference_date, self.current_date)
@@ -239,10 +450,13 @@ Provide detailed investment insights based on your YouTube research for the Inve
         with trace(trace_name, trace_id=trace_id):
             await self.run_with_mcp_servers()
 
-    async def run(self, reference_date=None, current_date=None):
-        """Main run method with error handling."""
+    async def run(self, reference_date=None, current_date=None, research_insights=None):
+        """Main run method with error handling; research_insights skips the researcher stage."""
         self.reference_date = reference_date
         self.current_date = current_date
+        self.shared_research = research_insights
+        # MCP 서버를 띄우기 전에 날짜를 설정해야 서버 프로세스도 같은 날짜를 받음
+        self.apply_backtest_date(current_date)
         
         try:
             await self.run_with_trace()
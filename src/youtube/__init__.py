@@ -0,0 +1,7 @@
+from .database import (
+    read_video_metadata,
+    read_transcript,
+    get_store_stats,
+    evict_transcripts,
+    rebuild_transcript_index,
+)
\ No newline at end of file
@@ -0,0 +1,558 @@
+import sqlite3
+import hashlib
+import json
+import os
+from dotenv import load_dotenv
+from src.youtube.transcripts import parse_segments, find_tickers
+
+load_dotenv(override=True)
+
+# 자막/메타데이터는 용량이 커서 accounts.db와 분리된 로컬 저장소 사용
+DB = os.getenv("YOUTUBE_STORE_DB", "youtube.db")
+MAX_STORE_BYTES = int(float(os.getenv("YOUTUBE_STORE_MAX_MB", "512")) * 1024 * 1024)
+# 색인 용량 추정: FTS5 테이블은 원문 대비 약 2.2배 (dbstat으로 측정), 종목 언급은 행당 고정 비용 + 문맥
+FTS_SIZE_FACTOR = 2.2
+MENTION_ROW_BYTES = 64
+
+
+with sqlite3.connect(DB) as conn:
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS video_metadata (
+            video_id TEXT PRIMARY KEY,
+            title TEXT,
+            channel_id TEXT,
+            channel_title TEXT,
+            published_at TEXT,
+            raw TEXT,
+            fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transcript_blobs (
+            content_hash TEXT PRIMARY KEY,
+            content TEXT,
+            size_bytes INTEGER
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS video_transcripts (
+            video_id TEXT,
+            variant TEXT,
+            content_hash TEXT,
+            fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_accessed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            hits INTEGER DEFAULT 0,
+            PRIMARY KEY (video_id, variant)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_transcripts_accessed ON video_transcripts (last_accessed_at)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS channel_uploads (
+            channel_handle TEXT,
+            video_id TEXT,
+            title TEXT,
+            channel_title TEXT,
+            published_at TEXT,
+            PRIMARY KEY (channel_handle, video_id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_channel_uploads_published ON channel_uploads (channel_handle, published_at)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS channel_index_coverage (
+            channel_handle TEXT,
+            day TEXT,
+            video_count INTEGER,
+            indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (channel_handle, day)
+        )
+    ''')
+    # 자막 구간 전문 검색 색인 (영상당 한 가지 variant만 유지, 타임스탬프 자막 우선)
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+            text,
+            tickers,
+            video_id UNINDEXED,
+            variant UNINDEXED,
+            start_seconds UNINDEXED,
+            published_at UNINDEXED,
+            tokenize='unicode61'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ticker_mentions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT,
+            ticker TEXT,
+            char_offset INTEGER,
+            timestamp_seconds REAL,
+            published_at TEXT,
+            context TEXT
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticker_mentions_ticker ON ticker_mentions (ticker, published_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticker_mentions_published ON ticker_mentions (published_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticker_mentions_video ON ticker_mentions (video_id)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS video_digests (
+            video_id TEXT,
+            digest_version TEXT,
+            model_name TEXT,
+            digest TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (video_id, digest_version, model_name)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ticker_mention_videos (
+            video_id TEXT PRIMARY KEY,
+            variant TEXT,
+            mention_count INTEGER,
+            ingested_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # 영상별 색인(FTS·종목 언급) 추정 용량 - 용량 한도 계산 때 색인 전체를 훑지 않도록
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transcript_index_sizes (
+            video_id TEXT PRIMARY KEY,
+            variant TEXT,
+            fts_bytes INTEGER DEFAULT 0,
+            mention_bytes INTEGER DEFAULT 0
+        )
+    ''')
+    cursor.execute('SELECT 1 FROM transcript_index_sizes LIMIT 1')
+    if cursor.fetchone() is None:
+        # 기존 저장소는 한 번 채워 넣음
+        cursor.execute(f'''
+            INSERT INTO transcript_index_sizes (video_id, variant, fts_bytes)
+            SELECT video_id, MIN(variant),
+                   CAST(SUM(length(CAST(text AS BLOB)) + length(CAST(tickers AS BLOB))) * {FTS_SIZE_FACTOR} AS INTEGER)
+            FROM transcript_fts GROUP BY video_id
+        ''')
+        cursor.execute(f'''
+            UPDATE transcript_index_sizes SET mention_bytes = (
+                SELECT COALESCE(SUM(length(CAST(COALESCE(context, '') AS BLOB)) + {MENTION_ROW_BYTES}), 0)
+                FROM ticker_mentions m WHERE m.video_id = transcript_index_sizes.video_id
+            )
+        ''')
+    conn.commit()
+
+
+def _find_value(data, keys: tuple):
+    """중첩된 JSON에서 첫 번째로 일치하는 키의 값을 찾기"""
+    if isinstance(data, dict):
+        for key in keys:
+            if data.get(key):
+                return data[key]
+        for value in data.values():
+            found = _find_value(value, keys)
+            if found:
+                return found
+    elif isinstance(data, list):
+        for item in data:
+            found = _find_value(item, keys)
+            if found:
+                return found
+    return None
+
+def parse_video_metadata(raw: str) -> dict:
+    """Extract the common fields from a get_video_details payload (best effort)."""
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return {
+        "title": _find_value(data, ("title",)),
+        "channel_id": _find_value(data, ("channelId", "channel_id")),
+        "channel_title": _find_value(data, ("channelTitle", "channel_title", "channel_name")),
+        "published_at": _find_value(data, ("publishedAt", "published_at", "publication_date")),
+    }
+
+def write_video_metadata(video_id: str, raw: str) -> None:
+    """영상 메타데이터 저장 (원본 + 주요 필드)"""
+    fields = parse_video_metadata(raw)
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO video_metadata (video_id, title, channel_id, channel_title, published_at, raw)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(video_id) DO UPDATE SET
+                title=excluded.title, channel_id=excluded.channel_id, channel_title=excluded.channel_title,
+                published_at=excluded.published_at, raw=excluded.raw, fetched_at=CURRENT_TIMESTAMP
+        ''', (video_id, fields.get("title"), fields.get("channel_id"), fields.get("channel_title"),
+              fields.get("published_at"), raw))
+        if fields.get("published_at"):
+            cursor.execute('''
+                UPDATE transcript_fts SET published_at = ? WHERE video_id = ? AND published_at IS NULL
+            ''', (fields["published_at"], video_id))
+            cursor.execute('''
+                UPDATE ticker_mentions SET published_at = ? WHERE video_id = ? AND published_at IS NULL
+            ''', (fields["published_at"], video_id))
+        conn.commit()
+
+def read_video_metadata(video_id: str) -> str | None:
+    """저장된 영상 메타데이터 원본 조회"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT raw FROM video_metadata WHERE video_id = ?', (video_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+def write_transcript(video_id: str, variant: str, content: str) -> str:
+    """자막 저장 (내용 해시 기준으로 중복 제거) 후 용량 초과 시 오래된 항목 정리"""
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR IGNORE INTO transcript_blobs (content_hash, content, size_bytes)
+            VALUES (?, ?, ?)
+        ''', (content_hash, content, len(content.encode("utf-8"))))
+        cursor.execute('''
+            INSERT INTO video_transcripts (video_id, variant, content_hash)
+            VALUES (?, ?, ?)
+            ON CONFLICT(video_id, variant) DO UPDATE SET
+                content_hash=excluded.content_hash, fetched_at=CURRENT_TIMESTAMP, last_accessed_at=CURRENT_TIMESTAMP
+        ''', (video_id, variant, content_hash))
+        conn.commit()
+    index_transcript(video_id, variant, content)
+    evict_transcripts()
+    return content_hash
+
+def read_transcript(video_id: str, variant: str) -> str | None:
+    """저장된 자막 조회 (접근 시각/히트 수 갱신)"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT b.content FROM video_transcripts t
+            JOIN transcript_blobs b ON b.content_hash = t.content_hash
+            WHERE t.video_id = ? AND t.variant = ?
+        ''', (video_id, variant))
+        row = cursor.fetchone()
+        if row:
+            cursor.execute('''
+                UPDATE video_transcripts SET last_accessed_at = CURRENT_TIMESTAMP, hits = hits + 1
+                WHERE video_id = ? AND variant = ?
+            ''', (video_id, variant))
+            conn.commit()
+        return row[0] if row else None
+
+def _index_bytes(cursor) -> int:
+    cursor.execute('SELECT COALESCE(SUM(fts_bytes + mention_bytes), 0) FROM transcript_index_sizes')
+    return cursor.fetchone()[0]
+
+def get_store_size() -> int:
+    """자막 저장소 전체 크기 (bytes) - 자막 원문 + 검색 색인·종목 언급 추정치"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM transcript_blobs')
+        return cursor.fetchone()[0] + _index_bytes(cursor)
+
+def get_store_stats() -> dict:
+    """저장소 현황: 영상/자막 개수, 용량, 누적 히트 수"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM video_metadata')
+        videos = cursor.fetchone()[0]
+        cursor.execute('SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM video_transcripts')
+        transcripts, hits = cursor.fetchone()
+        cursor.execute('SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM transcript_blobs')
+        blobs, blob_bytes = cursor.fetchone()
+        index_bytes = _index_bytes(cursor)
+    return {
+        "videos": videos,
+        "transcripts": transcripts,
+        "unique_blobs": blobs,
+        "blob_bytes": blob_bytes,
+        "index_bytes": index_bytes,
+        "size_bytes": blob_bytes + index_bytes,
+        "max_bytes": MAX_STORE_BYTES,
+        "hits": hits,
+    }
+
+def evict_transcripts(max_bytes: int = None) -> int:
+    """가장 오래 사용되지 않은 자막부터 삭제해 용량(원문 + 색인)을 max_bytes 이하로 유지
+
+    색인된 variant의 자막을 지우면 그 영상의 검색 색인과 종목 언급도 같은 트랜잭션에서 삭제.
+    """
+    max_bytes = MAX_STORE_BYTES if max_bytes is None else max_bytes
+    evicted = 0
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM transcript_blobs')
+        total = cursor.fetchone()[0] + _index_bytes(cursor)
+        if total <= max_bytes:
+            return 0
+
+        cursor.execute('SELECT video_id, variant FROM video_transcripts ORDER BY last_accessed_at ASC')
+        for video_id, variant in cursor.fetchall():
+            if total <= max_bytes:
+                break
+            cursor.execute('DELETE FROM video_transcripts WHERE video_id = ? AND variant = ?', (video_id, variant))
+            evicted += 1
+            cursor.execute('SELECT fts_bytes + mention_bytes FROM transcript_index_sizes WHERE video_id = ? AND variant = ?',
+                           (video_id, variant))
+            indexed = cursor.fetchone()
+            if indexed:
+                cursor.execute('DELETE FROM transcript_fts WHERE video_id = ?', (video_id,))
+                cursor.execute('DELETE FROM ticker_mentions WHERE video_id = ?', (video_id,))
+                cursor.execute('DELETE FROM ticker_mention_videos WHERE video_id = ?', (video_id,))
+                cursor.execute('DELETE FROM transcript_index_sizes WHERE video_id = ?', (video_id,))
+                total -= indexed[0]
+            # 더 이상 참조되지 않는 blob 정리
+            cursor.execute('''
+                SELECT content_hash, size_bytes FROM transcript_blobs
+                WHERE content_hash NOT IN (SELECT content_hash FROM video_transcripts)
+            ''')
+            for content_hash, size_bytes in cursor.fetchall():
+                cursor.execute('DELETE FROM transcript_blobs WHERE content_hash = ?', (content_hash,))
+                total -= size_bytes
+        conn.commit()
+    if evicted:
+        print(f"🧹 자막 저장소 정리: {evicted}건 삭제 (현재 {total / (1024 * 1024):.1f}MB)")
+    return evicted
+
+def write_channel_uploads(channel_handle: str, day: str, videos: list[dict], complete: bool = True) -> None:
+    """채널 업로드 목록 저장 후 (complete면) 해당 날짜를 인덱싱 완료로 표시"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO channel_uploads (channel_handle, video_id, title, channel_title, published_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(channel_handle, video_id) DO UPDATE SET
+                title=excluded.title, channel_title=excluded.channel_title, published_at=excluded.published_at
+        ''', [(channel_handle, v["video_id"], v.get("title"), v.get("channel_title"), v.get("published_at"))
+              for v in videos])
+        if complete:
+            cursor.execute('''
+                INSERT OR REPLACE INTO channel_index_coverage (channel_handle, day, video_count)
+                VALUES (?, ?, ?)
+            ''', (channel_handle, day, len(videos)))
+        conn.commit()
+
+def get_indexed_days(channel_handle: str, start_day: str, end_day: str) -> set[str]:
+    """[start_day, end_day) 구간에서 이미 인덱싱된 날짜 조회"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT day FROM channel_index_coverage
+            WHERE channel_handle = ? AND day >= ? AND day < ?
+        ''', (channel_handle, start_day, end_day))
+        return {row[0] for row in cursor.fetchall()}
+
+def query_channel_uploads(channel_handle: str, published_after: str, published_before: str) -> list[dict]:
+    """published_after <= 게시일 < published_before 인 채널 영상 목록 (최신순)"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT video_id, title, channel_title, published_at FROM channel_uploads
+            WHERE channel_handle = ? AND published_at >= ? AND published_at < ?
+            ORDER BY published_at DESC
+        ''', (channel_handle, published_after, published_before))
+        return [
+            {"video_id": video_id, "title": title, "channel_title": channel_title, "published_at": published_at}
+            for video_id, title, channel_title, published_at in cursor.fetchall()
+        ]
+
+def _published_at(cursor, video_id: str) -> str | None:
+    cursor.execute('''
+        SELECT published_at FROM video_metadata WHERE video_id = ? AND published_at IS NOT NULL
+        UNION ALL
+        SELECT published_at FROM channel_uploads WHERE video_id = ? AND published_at IS NOT NULL
+        LIMIT 1
+    ''', (video_id, video_id))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def index_transcript(video_id: str, variant: str, content: str) -> int:
+    """자막을 구간 단위로 전문 검색 색인에 추가 (기존 plain 색인은 enhanced 자막으로 교체)"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT variant FROM transcript_fts WHERE video_id = ? LIMIT 1', (video_id,))
+        row = cursor.fetchone()
+        if row and not (variant.startswith("enhanced") or row[0] == variant):
+            return 0
+
+        segments = parse_segments(content)
+        published_at = _published_at(cursor, video_id)
+        rows = [(text, " ".join(sorted(find_tickers(text))), video_id, variant, start, published_at)
+                for start, text in segments if text.strip()]
+        cursor.execute('DELETE FROM transcript_fts WHERE video_id = ?', (video_id,))
+        cursor.executemany('''
+            INSERT INTO transcript_fts (text, tickers, video_id, variant, start_seconds, published_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        fts_bytes = int(sum(len(text.encode("utf-8")) + len(tickers) for text, tickers, *_ in rows) * FTS_SIZE_FACTOR)
+        cursor.execute('''
+            INSERT INTO transcript_index_sizes (video_id, variant, fts_bytes)
+            VALUES (?, ?, ?)
+            ON CONFLICT(video_id) DO UPDATE SET variant=excluded.variant, fts_bytes=excluded.fts_bytes
+        ''', (video_id, variant, fts_bytes))
+        conn.commit()
+        return len(segments)
+
+def rebuild_transcript_index() -> int:
+    """저장된 모든 자막으로 전문 검색 색인 재구성"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM transcript_fts')
+        cursor.execute('UPDATE transcript_index_sizes SET fts_bytes = 0')
+        conn.commit()
+        # plain 먼저 색인해야 enhanced가 덮어씀
+        cursor.execute('''
+            SELECT t.video_id, t.variant, b.content FROM video_transcripts t
+            JOIN transcript_blobs b ON b.content_hash = t.content_hash
+            ORDER BY t.variant LIKE 'enhanced%', t.video_id
+        ''')
+        rows = cursor.fetchall()
+    for video_id, variant, content in rows:
+        index_transcript(video_id, variant, content)
+    return len(rows)
+
+def search_transcript_segments(match_query: str, published_after: str = "", published_before: str = "",
+                               channel_handle: str = "", video_ids: list[str] = None, limit: int = 10) -> list[dict]:
+    """FTS5 MATCH 쿼리로 자막 구간 검색 (bm25 순, 하이라이트된 snippet 포함)"""
+    conditions, params = ["transcript_fts MATCH ?"], [match_query]
+    # 날짜 조건이 있으면 게시일을 모르는 영상은 제외 (백테스트 미래 정보 방지)
+    if published_after:
+        conditions.append("published_at >= ?")
+        params.append(published_after)
+    if published_before:
+        conditions.append("published_at < ?")
+        params.append(published_before)
+    if channel_handle:
+        conditions.append("video_id IN (SELECT video_id FROM channel_uploads WHERE channel_handle = ?)")
+        params.append(channel_handle)
+    if video_ids:
+        conditions.append(f"video_id IN ({','.join('?' * len(video_ids))})")
+        params.extend(video_ids)
+
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT video_id, start_seconds, published_at, tickers,
+                   snippet(transcript_fts, 0, '[', ']', '…', 32), bm25(transcript_fts)
+            FROM transcript_fts
+            WHERE {" AND ".join(conditions)}
+            ORDER BY bm25(transcript_fts)
+            LIMIT ?
+        ''', (*params, limit))
+        return [
+            {"video_id": video_id, "start_seconds": start_seconds, "published_at": published_at,
+             "tickers": tickers.split() if tickers else [], "snippet": snippet, "score": round(-score, 3)}
+            for video_id, start_seconds, published_at, tickers, snippet, score in cursor.fetchall()
+        ]
+
+def get_videos_pending_mentions() -> list[str]:
+    """색인된 자막 중 종목 언급 추출이 안 됐거나 자막 variant가 바뀐 영상"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT DISTINCT f.video_id FROM transcript_fts f
+            LEFT JOIN ticker_mention_videos m ON m.video_id = f.video_id
+            WHERE m.video_id IS NULL OR m.variant != f.variant
+        ''')
+        return [row[0] for row in cursor.fetchall()]
+
+def read_transcript_segments(video_id: str) -> list[tuple]:
+    """색인된 자막 구간 (text, start_seconds, published_at, variant) - 원래 순서대로"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT text, start_seconds, published_at, variant FROM transcript_fts
+            WHERE video_id = ? ORDER BY rowid
+        ''', (video_id,))
+        return cursor.fetchall()
+
+def write_ticker_mentions(video_id: str, variant: str, mentions: list[dict]) -> None:
+    """영상의 종목 언급 목록 교체 저장"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM ticker_mentions WHERE video_id = ?', (video_id,))
+        cursor.executemany('''
+            INSERT INTO ticker_mentions (video_id, ticker, char_offset, timestamp_seconds, published_at, context)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(video_id, m["ticker"], m["char_offset"], m.get("timestamp_seconds"), m.get("published_at"),
+               m.get("context")) for m in mentions])
+        cursor.execute('''
+            INSERT OR REPLACE INTO ticker_mention_videos (video_id, variant, mention_count)
+            VALUES (?, ?, ?)
+        ''', (video_id, variant, len(mentions)))
+        mention_bytes = sum(len((m.get("context") or "").encode("utf-8")) + MENTION_ROW_BYTES for m in mentions)
+        cursor.execute('''
+            INSERT INTO transcript_index_sizes (video_id, variant, mention_bytes)
+            VALUES (?, ?, ?)
+            ON CONFLICT(video_id) DO UPDATE SET mention_bytes=excluded.mention_bytes
+        ''', (video_id, variant, mention_bytes))
+        conn.commit()
+
+def _mention_filters(published_after: str, published_before: str, channel_handle: str, tickers: list[str]):
+    conditions, params = [], []
+    if published_after:
+        conditions.append("published_at >= ?")
+        params.append(published_after)
+    if published_before:
+        conditions.append("published_at < ?")
+        params.append(published_before)
+    if channel_handle:
+        conditions.append("video_id IN (SELECT video_id FROM channel_uploads WHERE channel_handle = ?)")
+        params.append(channel_handle)
+    if tickers:
+        conditions.append(f"ticker IN ({','.join('?' * len(tickers))})")
+        params.extend(t.upper() for t in tickers)
+    return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+def query_ticker_mentions(published_after: str = "", published_before: str = "", channel_handle: str = "",
+                          tickers: list[str] = None, limit: int = 50) -> list[dict]:
+    """기간/채널/티커 조건의 종목 언급 목록 (최신순)"""
+    where, params = _mention_filters(published_after, published_before, channel_handle, tickers)
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT video_id, ticker, char_offset, timestamp_seconds, published_at, context
+            FROM ticker_mentions{where}
+            ORDER BY published_at DESC, video_id, char_offset
+            LIMIT ?
+        ''', (*params, limit))
+        return [
+            {"video_id": video_id, "ticker": ticker, "char_offset": char_offset,
+             "timestamp_seconds": timestamp_seconds, "published_at": published_at, "context": context}
+            for video_id, ticker, char_offset, timestamp_seconds, published_at, context in cursor.fetchall()
+        ]
+
+def summarize_ticker_mentions(published_after: str = "", published_before: str = "",
+                              channel_handle: str = "", limit: int = 20) -> list[dict]:
+    """기간 내 티커별 언급 횟수/영상 수 (많이 언급된 순)"""
+    where, params = _mention_filters(published_after, published_before, channel_handle, None)
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT ticker, COUNT(*), COUNT(DISTINCT video_id), MAX(published_at)
+            FROM ticker_mentions{where}
+            GROUP BY ticker
+            ORDER BY COUNT(*) DESC, ticker
+            LIMIT ?
+        ''', (*params, limit))
+        return [
+            {"ticker": ticker, "mentions": mentions, "videos": videos, "last_published_at": last_published_at}
+            for ticker, mentions, videos, last_published_at in cursor.fetchall()
+        ]
+
+def read_video_digest(video_id: str, digest_version: str, model_name: str) -> dict | None:
+    """캐시된 영상 요약 조회"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT digest FROM video_digests WHERE video_id = ? AND digest_version = ? AND model_name = ?
+        ''', (video_id, digest_version, model_name))
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+def write_video_digest(video_id: str, digest_version: str, model_name: str, digest: dict) -> None:
+    """영상 요약 저장"""
+    with sqlite3.connect(DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO video_digests (video_id, digest_version, model_name, digest)
+            VALUES (?, ?, ?, ?)
+        ''', (video_id, digest_version, model_name, json.dumps(digest, ensure_ascii=False)))
+        conn.commit()
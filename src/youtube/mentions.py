@@ -0,0 +1,85 @@
+from functools import lru_cache
+
+from config.symbols import COMPANY_ALIASES, find_alias_matches
+from src.youtube.database import (
+    get_videos_pending_mentions,
+    read_transcript_segments,
+    write_ticker_mentions,
+    summarize_ticker_mentions,
+)
+from src.youtube.transcripts import TICKER_TOKEN
+
+# 자막에 흔히 나오지만 종목으로 보면 안 되는 대문자 약어 (실제 티커와 겹치는 것 포함)
+STOP_TICKERS = {
+    "A", "I", "AI", "IT", "US", "USA", "UK", "EU", "ETF", "CEO", "CFO", "CPI", "PPI", "GDP", "FED", "FOMC",
+    "IPO", "TV", "PC", "OK", "GPU", "CPU", "IMF", "AM", "PM", "VS", "PD", "SNS", "EV", "DR", "ON", "ALL",
+    "ARE", "FOR", "NOW", "SO", "BE", "GO", "AN", "BIG", "ONE", "NEW", "HAS", "CAN", "OR", "MS", "KB", "SK",
+}
+
+CONTEXT_CHARS = 80
+
+
+@lru_cache(maxsize=1)
+def load_symbol_universe() -> frozenset:
+    """종목 언급 인식용 티커 집합: 저장된 grouped-daily 시세(없으면 Polygon 조회) + 별칭 사전"""
+    from src.accounts.database import read_latest_market
+
+    tickers = set(read_latest_market() or {})
+    if not tickers:
+        try:
+            from src.market.market import get_all_share_prices_polygon_eod
+            tickers = set(get_all_share_prices_polygon_eod())
+        except Exception as e:
+            print(f"티커 목록 조회 실패, 별칭 사전만 사용: {e}")
+    return frozenset((tickers - STOP_TICKERS) | set(COMPANY_ALIASES))
+
+
+def extract_mentions(text: str, universe=None) -> list[tuple[str, int]]:
+    """텍스트에서 (티커, 문자 위치) 목록 추출 - 대문자 심볼과 회사명 별칭 모두"""
+    universe = universe if universe is not None else load_symbol_universe()
+    mentions = [(match.group(1), match.start(1)) for match in TICKER_TOKEN.finditer(text)
+                if match.group(1) in universe]
+    mentions.extend(find_alias_matches(text))
+    # 같은 위치의 중복(예: "NVIDIA"와 "nvidia") 제거
+    return sorted(set(mentions), key=lambda mention: mention[1])
+
+
+def ingest_video_mentions(video_id: str, universe=None) -> int:
+    segments = read_transcript_segments(video_id)
+    if not segments:
+        return 0
+    mentions, offset = [], 0
+    for text, start_seconds, published_at, _ in segments:
+        for ticker, position in extract_mentions(text, universe):
+            mentions.append({
+                "ticker": ticker,
+                "char_offset": offset + position,
+                "timestamp_seconds": start_seconds,
+                "published_at": published_at,
+                "context": text[max(0, position - CONTEXT_CHARS):position + CONTEXT_CHARS],
+            })
+        offset += len(text) + 1
+    write_ticker_mentions(video_id, segments[0][3], mentions)
+    return len(mentions)
+
+
+def ingest_ticker_mentions(video_ids: list[str] = None) -> int:
+    """아직 처리하지 않은 자막에서 종목 언급을 한 번만 추출해 저장; 추가된 언급 수 반환"""
+    video_ids = video_ids if video_ids is not None else get_videos_pending_mentions()
+    if not video_ids:
+        return 0
+    universe = load_symbol_universe()
+    total = sum(ingest_video_mentions(video_id, universe) for video_id in video_ids)
+    print(f"🏷️ 종목 언급 추출: 영상 {len(video_ids)}개, 언급 {total}건")
+    return total
+
+
+def format_mention_summary(published_after: str, published_before: str, channel_handle: str = "") -> str:
+    """Analyst 프롬프트용 기간 내 종목 언급 요약"""
+    summary = summarize_ticker_mentions(published_after, published_before, channel_handle)
+    if not summary:
+        return "No ticker mentions indexed for this window"
+    return "\n".join(
+        f"- {row['ticker']}: {row['mentions']} mentions in {row['videos']} video(s), last {row['last_published_at']}"
+        for row in summary
+    )
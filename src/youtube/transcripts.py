@@ -0,0 +1,92 @@
+import json
+import re
+
+from config.symbols import COMPANY_ALIASES, find_alias_tickers
+
+# "[00:01:23] ..." / "(1:23) ..." / "01:23 - ..." 형식의 타임스탬프 자막 줄
+TIMESTAMP_LINE = re.compile(r'^\s*[\[(]?(?:(\d{1,2}):)?(\d{1,2}):(\d{2})(?:\.\d+)?[\])]?\s*[-:]?\s*(.+)$')
+TICKER_TOKEN = re.compile(r'(?<![A-Za-z])\$?([A-Z]{1,5}(?:\.[AB])?)(?![A-Za-z])')
+
+# 타임스탬프 없는 자막은 이 길이 정도로 잘라 색인
+PLAIN_SEGMENT_CHARS = 400
+
+
+def _json_segments(data) -> list[tuple[float | None, str]]:
+    """JSON 자막에서 {text, start/offset} 형태의 구간을 재귀적으로 수집"""
+    if isinstance(data, list):
+        if data and all(isinstance(item, dict) and "text" in item for item in data):
+            segments = []
+            for item in data:
+                start = item.get("start", item.get("offset", item.get("timestamp")))
+                segments.append((_to_seconds(start), str(item["text"])))
+            return segments
+        return [segment for item in data for segment in _json_segments(item)]
+    if isinstance(data, dict):
+        return [segment for value in data.values() for segment in _json_segments(value)]
+    if isinstance(data, str) and data.strip():
+        return _text_segments(data)
+    return []
+
+
+def _to_seconds(value) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = TIMESTAMP_LINE.match(f"{value} x")
+    if match:
+        hours, minutes, seconds = match.group(1), match.group(2), match.group(3)
+        return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text_segments(text: str) -> list[tuple[float | None, str]]:
+    segments = []
+    for line in text.splitlines():
+        match = TIMESTAMP_LINE.match(line)
+        if match:
+            hours, minutes, seconds, body = match.groups()
+            segments.append((int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds), body.strip()))
+        elif line.strip() and segments:
+            # 타임스탬프 없는 줄은 직전 구간에 이어 붙임
+            start, body = segments[-1]
+            segments[-1] = (start, f"{body} {line.strip()}")
+    if segments:
+        return segments
+
+    # 타임스탬프가 전혀 없으면 문장 단위로 묶어서 나눔
+    chunks, current = [], ""
+    for sentence in re.split(r'(?<=[.!?다요])\s+', text.strip()):
+        if current and len(current) + len(sentence) > PLAIN_SEGMENT_CHARS:
+            chunks.append((None, current))
+            current = ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        chunks.append((None, current))
+    return chunks
+
+
+def parse_segments(content: str) -> list[tuple[float | None, str]]:
+    """자막 원문(JSON 또는 텍스트)을 (시작 초, 문장) 구간 목록으로 변환"""
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return _text_segments(content)
+    return _json_segments(data)
+
+
+def find_tickers(text: str, known_tickers=None) -> set[str]:
+    """구간 텍스트에서 티커(대문자 심볼 + 회사명 별칭) 추출"""
+    known = known_tickers if known_tickers is not None else COMPANY_ALIASES.keys()
+    tickers = {token for token in TICKER_TOKEN.findall(text) if token in known}
+    return tickers | find_alias_tickers(text)
+
+
+def format_timestamp(seconds: float | None) -> str:
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import re
+from datetime import datetime, timedelta, timezone
+import mcp
+from mcp.client.streamable_http import streamablehttp_client
+
+from src.youtube.database import (
+    read_video_metadata,
+    write_video_metadata,
+    read_transcript,
+    write_transcript,
+    write_channel_uploads,
+    get_indexed_days,
+    query_channel_uploads,
+    search_transcript_segments,
+)
+from src.youtube.transcripts import find_tickers, format_timestamp
+
+CHANNEL_SEARCH_MAX_RESULTS = 50
+
+
+def _upstream_url() -> str:
+    from config.mcp_params import get_youtube_mcp_url
+    return get_youtube_mcp_url()
+
+
+def _result_text(result) -> str:
+    return "\n".join(item.text for item in result.content if getattr(item, "text", None))
+
+
+async def call_upstream_tool(tool_name: str, tool_args: dict) -> tuple[str, bool]:
+    """Call a tool on the remote YouTube MCP server; returns (text, is_error)."""
+    async with streamablehttp_client(_upstream_url()) as (read_stream, write_stream, _):
+        async with mcp.ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            result = await session.call_tool(tool_name, tool_args)
+            return _result_text(result), bool(result.isError)
+
+
+async def get_video_details(video_id: str) -> str:
+    """Video metadata, served from the local store after the first fetch."""
+    cached = read_video_metadata(video_id)
+    if cached is not None:
+        return cached
+    text, is_error = await call_upstream_tool("get_video_details", {"video_id": video_id})
+    if not is_error:
+        write_video_metadata(video_id, text)
+    return text
+
+
+async def _fetch_transcript(video_id: str, variant: str, tool_name: str, tool_args: dict) -> tuple[str, bool]:
+    """(text, ok): ok is False when upstream returned an error or an empty transcript (not stored)."""
+    cached = read_transcript(video_id, variant)
+    if cached is not None:
+        return cached, True
+    text, is_error = await call_upstream_tool(tool_name, tool_args)
+    ok = not is_error and bool(text.strip())
+    if ok:
+        write_transcript(video_id, variant, text)
+    return text, ok
+
+
+async def get_transcript(video_id: str, variant: str, tool_name: str, tool_args: dict) -> str:
+    """A single video's transcript, fetched at most once per (video_id, variant)."""
+    text, _ = await _fetch_transcript(video_id, variant, tool_name, tool_args)
+    return text
+
+
+async def get_video_transcript(video_id: str, language: str = "ko") -> str:
+    return await get_transcript(
+        video_id, f"plain:{language}", "get_video_transcript",
+        {"video_id": video_id, "language": language},
+    )
+
+
+async def get_video_enhanced_transcripts(video_ids: list[str], language: str = "ko",
+                                         format: str = "timestamped", skip_errors: bool = False) -> dict[str, str]:
+    """Enhanced transcripts for several videos; only the missing ones go upstream, in parallel.
+
+    With skip_errors, videos whose fetch failed upstream (error text or empty) are left out.
+    """
+    variant = f"enhanced:{language}:{format}"
+    results = await asyncio.gather(*[
+        _fetch_transcript(
+            video_id, variant, "get_video_enhanced_transcript",
+            {"video_ids": [video_id], "language": language, "format": format},
+        )
+        for video_id in video_ids
+    ])
+    return {video_id: text for video_id, (text, ok) in zip(video_ids, results) if ok or not skip_errors}
+
+
+def format_transcripts(transcripts: dict[str, str]) -> str:
+    if len(transcripts) == 1:
+        return next(iter(transcripts.values()))
+    return json.dumps(transcripts, ensure_ascii=False)
+
+
+def _video_id_of(item: dict) -> str | None:
+    video_id = item.get("videoId") or item.get("video_id")
+    if not video_id and isinstance(item.get("id"), dict):
+        video_id = item["id"].get("videoId")
+    elif not video_id and isinstance(item.get("id"), str) and ("snippet" in item or "publishedAt" in item):
+        video_id = item["id"]
+    return video_id
+
+
+def extract_search_results(text: str) -> list[dict]:
+    """Pull (video_id, title, channel_title, published_at) out of a search_videos payload."""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return []
+
+    videos = []
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+        elif isinstance(node, dict):
+            video_id = _video_id_of(node)
+            if video_id:
+                snippet = node.get("snippet", node)
+                videos.append({
+                    "video_id": video_id,
+                    "title": snippet.get("title"),
+                    "channel_title": snippet.get("channelTitle") or snippet.get("channel_title"),
+                    "published_at": snippet.get("publishedAt") or snippet.get("published_at"),
+                })
+            else:
+                for value in node.values():
+                    walk(value)
+
+    walk(data)
+    return videos
+
+
+def _channel_config(channel_handle: str) -> dict:
+    from config.strategies import YOUTUBER_STRATEGIES
+    for config in YOUTUBER_STRATEGIES.values():
+        if config.get("channel_handle") == channel_handle:
+            return config
+    return {"channel_name": channel_handle.lstrip("@"), "channel_keywords": [channel_handle.lstrip("@")]}
+
+
+async def _index_channel_day(channel_handle: str, day: str) -> None:
+    """Fetch one day of uploads for a channel from the remote search and store it."""
+    config = _channel_config(channel_handle)
+    next_day = (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    text, is_error = await call_upstream_tool("search_videos", {
+        "query": config["channel_name"],
+        "max_results": CHANNEL_SEARCH_MAX_RESULTS,
+        "published_after": f"{day}T00:00:00Z",
+        "published_before": f"{next_day}T00:00:00Z",
+        "order": "date",
+    })
+    if is_error:
+        print(f"❌ 채널 업로드 조회 실패 ({channel_handle}, {day}): {text[:200]}")
+        return
+
+    # 이름이 비슷한 다른 채널 영상 제외
+    keywords = [k.lower() for k in config.get("channel_keywords", [])] + [config["channel_name"].lower()]
+    videos = [
+        video for video in extract_search_results(text)
+        if not video.get("channel_title") or any(k in video["channel_title"].lower() for k in keywords)
+    ]
+
+    # 아직 끝나지 않은 날짜는 커버리지로 표시하지 않음 (다음 호출 때 다시 조회)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    write_channel_uploads(channel_handle, day, videos, complete=day < today)
+
+
+async def list_channel_videos(channel_handle: str, published_after: str, published_before: str) -> list[dict]:
+    """Uploads of a channel published in [published_after, published_before), from the local index.
+
+    Only days that were never indexed are fetched from the remote search, one day at a time.
+    """
+    start = datetime.strptime(published_after[:10], "%Y-%m-%d")
+    end = datetime.strptime(published_before[:10], "%Y-%m-%d")
+    days = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days)]
+
+    indexed = get_indexed_days(channel_handle, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+    missing = [day for day in days if day not in indexed]
+    if missing:
+        print(f"🔎 {channel_handle} 업로드 인덱스 갱신: {', '.join(missing)}")
+        await asyncio.gather(*[_index_channel_day(channel_handle, day) for day in missing])
+
+    return query_channel_uploads(channel_handle, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+
+
+def build_match_query(query: str) -> str:
+    """자유 검색어를 FTS5 MATCH 식으로 변환: 각 단어는 접두어 검색, 회사명/티커는 tickers 컬럼도 검색"""
+    terms = []
+    for word in query.split():
+        token = re.sub(r'[^\w.&]', '', word)
+        if not token:
+            continue
+        terms.append(f'"{token}"*')
+        terms.extend(f'tickers:"{ticker}"' for ticker in sorted(find_tickers(token.upper()) | find_tickers(token)))
+    return " OR ".join(dict.fromkeys(terms))
+
+
+async def search_transcripts(query: str, published_after: str = "", published_before: str = "",
+                             channel_handle: str = "", video_ids: list[str] = None, limit: int = 10,
+                             language: str = "ko") -> list[dict]:
+    """Ranked transcript passages matching a query; given video IDs are fetched and indexed first."""
+    match_query = build_match_query(query)
+    if not match_query:
+        return []
+    if video_ids:
+        # 아직 저장되지 않은 자막은 가져오면서 색인됨
+        await get_video_enhanced_transcripts(video_ids, language)
+
+    results = search_transcript_segments(
+        match_query, published_after, published_before, channel_handle, video_ids, limit,
+    )
+    for result in results:
+        result["timestamp"] = format_timestamp(result.pop("start_seconds"))
+    return results
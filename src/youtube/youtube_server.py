@@ -0,0 +1,116 @@
+from mcp.server.fastmcp import FastMCP
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from src.youtube.youtube_client import (
+    call_upstream_tool,
+    get_video_details as fetch_video_details,
+    get_video_transcript as fetch_video_transcript,
+    get_video_enhanced_transcripts,
+    format_transcripts,
+    list_channel_videos as fetch_channel_videos,
+    search_transcripts as search_transcript_passages,
+)
+from src.youtube.database import get_store_stats
+
+# 원격 YouTube MCP 앞단의 캐싱 프록시: 영상 메타데이터/자막은 로컬 저장소에서 먼저 찾음
+mcp = FastMCP("youtube_server")
+
+@mcp.tool()
+async def search_videos(query: str, max_results: int = 10, published_after: str = "",
+                        published_before: str = "", channel_id: str = "", order: str = "") -> str:
+    """Search YouTube videos (forwarded to the remote YouTube MCP).
+
+    Args:
+        query: Search terms, e.g. the exact channel name
+        max_results: Maximum number of results
+        published_after: Only videos published after this time (e.g. "2024-09-07T00:00:00Z")
+        published_before: Only videos published before this time (e.g. "2024-09-12T00:00:00Z")
+        channel_id: Optional channel ID to restrict the search to
+        order: Optional sort order (e.g. "date", "relevance")
+    """
+    args = {"query": query, "max_results": max_results, "published_after": published_after,
+            "published_before": published_before, "channel_id": channel_id, "order": order}
+    text, _ = await call_upstream_tool("search_videos", {k: v for k, v in args.items() if v})
+    return text
+
+@mcp.tool()
+async def list_channel_videos(channel_handle: str, published_after: str, published_before: str) -> list[dict]:
+    """List a channel's uploads published in [published_after, published_before), newest first.
+
+    Served from a local per-channel upload index; only days not indexed yet are searched remotely.
+
+    Args:
+        channel_handle: The channel handle, e.g. "@syukaworld"
+        published_after: Inclusive start date (e.g. "2024-09-07")
+        published_before: Exclusive end date, i.e. the reference date (e.g. "2024-09-12")
+    """
+    return await fetch_channel_videos(channel_handle, published_after, published_before)
+
+@mcp.tool()
+async def get_video_details(video_id: str) -> str:
+    """Get the details (title, description, channel, publication date) of a video.
+
+    Args:
+        video_id: The YouTube video ID
+    """
+    return await fetch_video_details(video_id)
+
+@mcp.tool()
+async def get_video_transcript(video_id: str, language: str = "ko") -> str:
+    """Get the plain transcript of a video.
+
+    Args:
+        video_id: The YouTube video ID
+        language: Transcript language code
+    """
+    return await fetch_video_transcript(video_id, language)
+
+@mcp.tool()
+async def get_video_enhanced_transcript(video_ids: list[str], language: str = "ko", format: str = "timestamped") -> str:
+    """Get timestamped transcripts for one or more videos.
+
+    Args:
+        video_ids: The YouTube video IDs
+        language: Transcript language code
+        format: Transcript format (e.g. "timestamped")
+    """
+    return format_transcripts(await get_video_enhanced_transcripts(video_ids, language, format))
+
+@mcp.tool()
+async def search_transcripts(query: str, published_after: str = "", published_before: str = "",
+                             channel_handle: str = "", video_ids: list[str] = None, limit: int = 10) -> list[dict]:
+    """Full-text search over stored transcripts; returns ranked passages with timestamps.
+
+    Use this instead of reading whole transcripts: it returns only the matching passages.
+    Company names (e.g. "엔비디아") also match their ticker (NVDA).
+
+    Args:
+        query: Search words, e.g. "엔비디아 반도체 NVDA 금리"
+        published_after: Only videos published on/after this date (e.g. "2024-09-07")
+        published_before: Only videos published before this date, i.e. the reference date
+            (never later than the backtest date)
+        channel_handle: Optional channel handle, e.g. "@syukaworld"
+        video_ids: Optional video IDs to search; their transcripts are fetched and indexed if missing
+        limit: Maximum number of passages
+    """
+    # 백테스팅 중에는 기준일 이후 영상이 검색되지 않도록 상한을 백테스팅 날짜로 제한
+    backtest_date = (os.getenv("BACKTEST_DATE") or "").split(" ")[0]
+    if backtest_date:
+        published_before = min(published_before or backtest_date, backtest_date)
+    return await search_transcript_passages(query, published_after, published_before,
+                                            channel_handle, video_ids, limit)
+
+@mcp.tool()
+async def youtube_store_stats() -> dict:
+    """Report the local YouTube store size and cache hit counts."""
+    return get_store_stats()
+
+if __name__ == "__main__":
+    mcp.run(transport='stdio')